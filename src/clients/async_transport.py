@@ -0,0 +1,454 @@
+import asyncio
+import json
+import ssl
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from queue import Queue
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.utils.log_manager import LogManager
+
+# Methods that may be sent twice without changing the result, see RFC 9110 9.2.2
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+class TransportError(Exception):
+    """Raised when an HTTP exchange fails below the application protocol."""
+
+
+class HTTPStatusError(TransportError):
+    """Raised when the server answers with a non-success status code."""
+
+    def __init__(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        super().__init__(f"HTTP {status}: {body[:300].decode('utf-8', 'replace')}")
+
+    @property
+    def retry_after(self) -> Optional[float]:
+        """Seconds from the Retry-After header, None if absent or not a number."""
+        try:
+            return float(self.headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return None
+
+
+class EventLoopThread:
+    """Singleton owning the asyncio event loop shared by all API clients."""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = EventLoopThread()
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, "_initialized"):
+            return
+
+        self._initialized = True
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="PromptlyEventLoop", daemon=True
+        )
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def in_loop_thread(self) -> bool:
+        """
+        Returns True if called from the event loop thread
+        """
+        return threading.current_thread() is self._thread
+
+    def submit(self, coro) -> Future:
+        """
+        Schedule a coroutine on the shared loop from any thread.
+
+        Args:
+            coro: The coroutine to schedule.
+
+        Returns:
+            Future: A concurrent future resolving to the coroutine result.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the shared loop and block until it finishes.
+
+        Args:
+            coro: The coroutine to run.
+            timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+            Any: The coroutine result.
+        """
+        if self.in_loop_thread():
+            raise RuntimeError("EventLoopThread.run() must not be called from the loop thread.")
+        return self.submit(coro).result(timeout)
+
+    def iterate(self, agen: AsyncIterator) -> Iterator:
+        """
+        Drive an async generator on the shared loop and yield its items synchronously.
+        Closing the returned generator cancels the async side.
+
+        Args:
+            agen (AsyncIterator): The async generator to consume.
+
+        Yields:
+            Any: Items produced by the async generator.
+        """
+        items = Queue()
+
+        async def pump():
+            error = None
+            try:
+                async for item in agen:
+                    items.put((False, item))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = e
+            finally:
+                items.put((True, error))
+
+        future = self.submit(pump())
+        try:
+            while True:
+                finished, value = items.get()
+                if finished:
+                    if value is not None:
+                        raise value
+                    return
+                yield value
+        finally:
+            if not future.done():
+                future.cancel()
+
+
+class _Connection:
+    """A single keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, key: Tuple[str, str, int], reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.key = key
+        self.reader = reader
+        self.writer = writer
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.requests = 0
+
+    def is_usable(self, idle_timeout: float) -> bool:
+        if self.writer.is_closing() or self.reader.at_eof():
+            return False
+        return time.monotonic() - self.last_used < idle_timeout
+
+    def close(self, abort: bool = False):
+        try:
+            if abort:
+                self.writer.transport.abort()
+            else:
+                self.writer.close()
+        except Exception:
+            pass
+
+
+class HTTPResponse:
+    """Response whose body is read lazily from its pooled connection."""
+
+    def __init__(self, connection: _Connection, status: int, reason: str,
+                 headers: Dict[str, str], version: str, method: str):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.content: Optional[bytes] = None
+        self._connection = connection
+        self._chunked = headers.get("transfer-encoding", "").lower() == "chunked"
+        self._remaining = None
+        if not self._chunked and "content-length" in headers:
+            self._remaining = int(headers["content-length"])
+
+        connection_header = headers.get("connection", "").lower()
+        self.reusable = version == "HTTP/1.1" and connection_header != "close"
+        if self._chunked or self._remaining is not None:
+            self.complete = self._remaining == 0
+        else:
+            # Body is delimited by connection close, so the connection cannot be reused
+            self.complete = False
+            self.reusable = False
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            self.complete = True
+
+    async def iter_bytes(self) -> AsyncIterator[bytes]:
+        """
+        Yield raw body fragments as they arrive.
+        """
+        reader = self._connection.reader
+        if self.complete:
+            return
+        if self._chunked:
+            while True:
+                size_line = await reader.readline()
+                if not size_line:
+                    raise TransportError("Connection closed inside chunked body.")
+                size = int(size_line.split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    # Consume optional trailers up to the terminating blank line
+                    while True:
+                        line = await reader.readline()
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                    self.complete = True
+                    return
+                data = await reader.readexactly(size)
+                await reader.readexactly(2)
+                yield data
+        elif self._remaining is not None:
+            while self._remaining > 0:
+                data = await reader.read(min(65536, self._remaining))
+                if not data:
+                    raise TransportError("Connection closed before the full body was received.")
+                self._remaining -= len(data)
+                yield data
+            self.complete = True
+        else:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                yield data
+            self.complete = True
+
+    async def read(self) -> bytes:
+        """
+        Read the complete body.
+
+        Returns:
+            bytes: The response body.
+        """
+        if self.content is None:
+            self.content = b"".join([data async for data in self.iter_bytes()])
+        return self.content
+
+    def json(self) -> Any:
+        """
+        Decode a previously read body as JSON.
+        """
+        return json.loads(self.content or b"null")
+
+    async def iter_lines(self) -> AsyncIterator[str]:
+        """
+        Yield decoded body lines without their line terminators.
+        """
+        buffer = b""
+        async for data in self.iter_bytes():
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                yield line.rstrip(b"\r").decode("utf-8")
+        if buffer:
+            yield buffer.rstrip(b"\r").decode("utf-8")
+
+    async def iter_sse(self) -> AsyncIterator[str]:
+        """
+        Yield the data payload of each server-sent event.
+        """
+        data_lines: List[str] = []
+        async for line in self.iter_lines():
+            if not line:
+                if data_lines:
+                    yield "\n".join(data_lines)
+                    data_lines = []
+                continue
+            if line.startswith(":"):
+                continue
+            field, _, value = line.partition(":")
+            if field == "data":
+                data_lines.append(value[1:] if value.startswith(" ") else value)
+        if data_lines:
+            yield "\n".join(data_lines)
+
+
+class AsyncHTTPTransport:
+    """
+    Pooled keep-alive HTTP/1.1 client running on the shared event loop.
+    Many streams can be in flight at once without a thread per request.
+    """
+
+    def __init__(self, max_connections_per_host: int = 16, connect_timeout: float = 10.0,
+                 idle_timeout: float = 60.0):
+        self._log_manager = LogManager.get_instance()
+        self._max_connections_per_host = max_connections_per_host
+        self._connect_timeout = connect_timeout
+        self._idle_timeout = idle_timeout
+        self._idle: Dict[Tuple[str, str, int], List[_Connection]] = {}
+        self._semaphores: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+        self._ssl_context = ssl.create_default_context()
+
+    @staticmethod
+    def _split_url(url: str) -> Tuple[Tuple[str, str, int], str, str]:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise TransportError(f"Unsupported URL scheme: {parts.scheme}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        host_header = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        return (scheme, parts.hostname, port), path, host_header
+
+    def _semaphore(self, key: Tuple[str, str, int]) -> asyncio.Semaphore:
+        if key not in self._semaphores:
+            self._semaphores[key] = asyncio.Semaphore(self._max_connections_per_host)
+        return self._semaphores[key]
+
+    async def _open(self, key: Tuple[str, str, int]) -> _Connection:
+        scheme, host, port = key
+        ssl_context = self._ssl_context if scheme == "https" else None
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=ssl_context,
+                                        server_hostname=host if ssl_context else None),
+                self._connect_timeout,
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            raise TransportError(f"Failed to connect to {host}:{port}") from e
+        return _Connection(key, reader, writer)
+
+    async def _acquire(self, key: Tuple[str, str, int]) -> Tuple[_Connection, bool]:
+        idle = self._idle.get(key, [])
+        while idle:
+            connection = idle.pop()
+            if connection.is_usable(self._idle_timeout):
+                return connection, True
+            connection.close()
+        return await self._open(key), False
+
+    def _release(self, connection: _Connection, response: HTTPResponse):
+        if response.complete and response.reusable and connection.is_usable(self._idle_timeout):
+            connection.last_used = time.monotonic()
+            self._idle.setdefault(connection.key, []).append(connection)
+        else:
+            connection.close()
+
+    @staticmethod
+    async def _read_head(connection: _Connection, method: str) -> HTTPResponse:
+        status_line = await connection.reader.readline()
+        if not status_line:
+            raise TransportError("Connection closed before a response was received.")
+        version, status, *reason = status_line.decode("latin-1").strip().split(" ", 2)
+        headers: Dict[str, str] = {}
+        while True:
+            line = await connection.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return HTTPResponse(connection, int(status), reason[0] if reason else "",
+                            headers, version, method)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                     json_body: Any = None):
+        """
+        Send a request and yield the response with its body still unread.
+        Leaving the context early or with an error drops the connection instead
+        of returning it to the pool.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Absolute http(s) URL.
+            headers (Optional[Dict[str, str]]): Extra request headers.
+            json_body (Any): Optional JSON-serialisable request body.
+
+        Yields:
+            HTTPResponse: The response.
+        """
+        key, path, host_header = self._split_url(url)
+        payload = json.dumps(json_body).encode("utf-8") if json_body is not None else b""
+        request_headers = {
+            "Host": host_header,
+            "Connection": "keep-alive",
+            "Accept": "*/*",
+            "Content-Length": str(len(payload)),
+        }
+        if json_body is not None:
+            request_headers["Content-Type"] = "application/json"
+        request_headers.update(headers or {})
+        head = f"{method} {path} HTTP/1.1\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in request_headers.items()
+        ) + "\r\n"
+        request_bytes = head.encode("latin-1") + payload
+
+        async with self._semaphore(key):
+            for attempt in range(2):
+                connection, reused = await self._acquire(key)
+                written = False
+                try:
+                    if connection.writer.is_closing():
+                        raise TransportError("Connection closed while idle.")
+                    written = True
+                    connection.writer.write(request_bytes)
+                    await connection.writer.drain()
+                    response = await self._read_head(connection, method)
+                except (OSError, asyncio.IncompleteReadError, TransportError) as e:
+                    connection.close(abort=True)
+                    # A pooled connection may have been closed by the server while idle. Once the
+                    # request was written the server may have processed it, so only idempotent
+                    # requests are sent again; a repeated POST could run a generation twice.
+                    if reused and attempt == 0 and (not written or method.upper() in IDEMPOTENT_METHODS):
+                        continue
+                    raise TransportError(f"{method} {url} failed") from e
+                except BaseException:
+                    connection.close(abort=True)
+                    raise
+                break
+
+            connection.requests += 1
+            try:
+                yield response
+            except BaseException:
+                connection.close(abort=True)
+                raise
+            else:
+                self._release(connection, response)
+
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      json_body: Any = None) -> HTTPResponse:
+        """
+        Send a request and read the complete response body.
+
+        Returns:
+            HTTPResponse: The response with `content` populated.
+        """
+        async with self.stream(method, url, headers=headers, json_body=json_body) as response:
+            await response.read()
+            return response
+
+    def close_idle(self):
+        """
+        Close all idle pooled connections
+        """
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+        self._idle.clear()
@@ -1,6 +1,11 @@
+import asyncio
+import hashlib
+import json
+import time
 from abc import ABC, abstractmethod
-from typing import List
-from time import sleep
+from contextlib import aclosing, asynccontextmanager
+from dataclasses import replace
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 import sys
 from pathlib import Path
@@ -10,6 +15,17 @@ from src.utils.credential_manager import CredentialManager
 from src.utils.config_manager import ConfigManager
 from src.utils.log_manager import LogManager
 from src.utils.chat_history import ChatHistory
+from src.clients.async_transport import AsyncHTTPTransport, EventLoopThread, HTTPStatusError
+from src.clients.request_options import LANE_NAMES, RequestOptions, RequestPriority
+from src.clients.rate_limiter import RETRYABLE_STATUSES, RateLimiter, estimate_tokens
+from src.clients.cancellation import (
+    CancellationToken, DeadlineExceededError, RequestCancelledError, cancel_scope
+)
+from src.utils.dataclasses import GenerationSettings, LaneConfig
+from src.utils.telemetry_store import RequestRecord, TelemetryStore
+from src.clients.model_router import ModelRouter
+from src.clients.single_flight import SingleFlight
+from src.clients.circuit_breaker import CircuitBreaker, CircuitOpenError
 
 class BaseAPIClient(ABC):
     """
@@ -22,7 +38,15 @@ class BaseAPIClient(ABC):
         self._config_manager = ConfigManager.get_instance()
         self._chat_history = ChatHistory.get_instance()
         self._client = None
-        self._cancel_flag = False
+        self._request_stats = {"requests": 0, "cancelled": 0, "deadline_exceeded": 0}
+        self._event_loop = EventLoopThread.get_instance()
+        self._transport = AsyncHTTPTransport()
+        self._rate_limiter = RateLimiter.get_instance()
+        self._telemetry = TelemetryStore.get_instance()
+        self._router = ModelRouter(self)
+        self._single_flight = SingleFlight()
+        self._breaker = CircuitBreaker.get_instance()
+        self._active_records: Dict[CancellationToken, RequestRecord] = {}
         self.name = None
 
     @abstractmethod
@@ -33,36 +57,644 @@ class BaseAPIClient(ABC):
         """
         pass
 
+    def reinitialize(self):
+        """
+        Re-run client initialization, e.g. after the API key changed.
+        """
+        self._initialize_client()
+
+    def send_request(self, prompt: str, retry_count: int = 0,
+                     options: Optional[RequestOptions] = None) -> Iterator[str]:
+        """
+        Send a streaming request from a synchronous caller.
+        Runs send_request_async() on the shared event loop; cancelling the request's token or
+        closing the returned generator aborts the connection.
+
+        Args:
+            prompt (str): The prompt to send.
+            retry_count (int): Current retry attempt number.
+            options (Optional[RequestOptions]): Per-request settings.
+
+        Yields:
+            str: Chunks of the response as they are generated.
+        """
+        stream = self.iterate_async(self.send_request_async(prompt, retry_count, options))
+        try:
+            yield from stream
+        finally:
+            stream.close()
+
+    def send_request_non_stream(self, prompt: str, retry_count: int = 0,
+                                options: Optional[RequestOptions] = None) -> Optional[str]:
+        """
+        Send a request from a synchronous caller and wait for the complete response.
+
+        Args:
+            prompt (str): The prompt to send.
+            retry_count (int): Current retry attempt number.
+            options (Optional[RequestOptions]): Per-request settings.
+
+        Returns:
+            Optional[str]: Response text or None if failed.
+        """
+        return self.run_async(self.send_request_non_stream_async(prompt, retry_count, options))
+
+    async def send_request_async(
+        self, prompt: str, retry_count: int = 0, options: Optional[RequestOptions] = None
+    ) -> AsyncIterator[str]:
+        """
+        Send a streaming request on the shared event loop.
+        An identical streaming request already in flight is joined instead of sending a new one.
+        While the circuit of the model is open, the request is sent to the fallback instead.
+
+        Args:
+            prompt (str): The prompt to send.
+            retry_count (int): Current retry attempt number.
+            options (Optional[RequestOptions]): Per-request settings.
+
+        Yields:
+            str: Chunks of the response as they are generated.
+
+        Raises:
+            RequestCancelledError: If the request's token was cancelled or its deadline passed.
+            CircuitOpenError: If the circuit of the model is open and no fallback is available.
+        """
+        options = self._prepare_options(options, prompt)
+        key = self._flight_key("stream", prompt, options) if retry_count == 0 else None
+        if key is None or not self._single_flight.in_flight(key):
+            fallback = self._failover_target(options)
+            if fallback is not None:
+                client, fallback_options = fallback
+                async for text_chunk in client.send_request_async(prompt, 0, fallback_options):
+                    yield text_chunk
+                return
+        if key is None:
+            async for text_chunk in self._send_request_async(prompt, retry_count, options):
+                yield text_chunk
+            return
+        async for text_chunk in self._join_flight(
+            key, prompt, options,
+            lambda token: self._send_request_async(prompt, 0, replace(options, cancellation=token)),
+        ):
+            yield text_chunk
+
+    async def send_request_non_stream_async(
+        self, prompt: str, retry_count: int = 0, options: Optional[RequestOptions] = None
+    ) -> Optional[str]:
+        """
+        Send a request on the shared event loop and return the complete response.
+        An identical request already in flight is joined instead of sending a new one.
+        While the circuit of the model is open, the request is sent to the fallback instead.
+
+        Args:
+            prompt (str): The prompt to send.
+            retry_count (int): Current retry attempt number.
+            options (Optional[RequestOptions]): Per-request settings.
+
+        Returns:
+            Optional[str]: Response text or None if failed.
+
+        Raises:
+            RequestCancelledError: If the request's token was cancelled or its deadline passed.
+        """
+        options = self._prepare_options(options, prompt)
+        key = self._flight_key("complete", prompt, options) if retry_count == 0 else None
+        if key is None or not self._single_flight.in_flight(key):
+            try:
+                fallback = self._failover_target(options)
+            except CircuitOpenError as e:
+                self._log_manager.log_error("Failed to send request.", error=e)
+                return None
+            if fallback is not None:
+                client, fallback_options = fallback
+                return await client.send_request_non_stream_async(prompt, 0, fallback_options)
+        if key is None:
+            return await self._send_request_non_stream_async(prompt, retry_count, options)
+
+        async def upstream(token: CancellationToken) -> AsyncIterator[Optional[str]]:
+            yield await self._send_request_non_stream_async(prompt, 0, replace(options, cancellation=token))
+
+        async with aclosing(self._join_flight(key, prompt, options, upstream)) as responses:
+            async for response_text in responses:
+                return response_text
+        return None
+
+    async def _send_request_async(
+        self, prompt: str, retry_count: int, options: RequestOptions
+    ) -> AsyncIterator[str]:
+        """
+        Send a streaming request on the shared event loop, retrying throttled requests until
+        their first chunk arrived.
+
+        Args:
+            prompt (str): The prompt to send.
+            retry_count (int): Current retry attempt number.
+            options (RequestOptions): Per-request settings prepared by _prepare_options().
+
+        Yields:
+            str: Chunks of the response as they are generated.
+
+        Raises:
+            RequestCancelledError: If the request's token was cancelled or its deadline passed.
+        """
+        model = self._get_model_name(options)
+        async with self._track_request(prompt, model, options) as record:
+            chunks = []
+            try:
+                await self.acquire_rate_limit_async(model, prompt, options.priority)
+                async for text_chunk in self._stream_response_async(prompt, model, options, record):
+                    chunks.append(text_chunk)
+                    record.add_output(text_chunk)
+                    yield text_chunk
+                self._record_exchange(prompt, "".join(chunks), options)
+                return
+            except RequestCancelledError:
+                self._log_manager.log_info("Streaming request cancelled.")
+                raise
+            except HTTPStatusError as e:
+                # Chunks already yielded cannot be taken back, so only a request without output is retried
+                retry_options = None if chunks else \
+                    await self._retry_options_async(e, retry_count, model, options, record)
+                if retry_options is None:
+                    self._log_manager.log_error("Failed to send streaming request.", error=e)
+                    raise
+            except Exception as e:
+                self._log_manager.log_error("Failed to send streaming request.", error=e)
+                raise
+
+            async for text_chunk in self._send_request_async(prompt, retry_count + 1, retry_options):
+                yield text_chunk
+
+    async def _send_request_non_stream_async(
+        self, prompt: str, retry_count: int, options: RequestOptions
+    ) -> Optional[str]:
+        """
+        Send a request on the shared event loop and return the complete response, retrying throttled requests.
+
+        Args:
+            prompt (str): The prompt to send.
+            retry_count (int): Current retry attempt number.
+            options (RequestOptions): Per-request settings prepared by _prepare_options().
+
+        Returns:
+            Optional[str]: Response text or None if failed.
+
+        Raises:
+            RequestCancelledError: If the request's token was cancelled or its deadline passed.
+        """
+        model = self._get_model_name(options)
+        async with self._track_request(prompt, model, options) as record:
+            try:
+                await self.acquire_rate_limit_async(model, prompt, options.priority)
+                response_text = await self._generate_async(prompt, model, options, record)
+                record.add_output(response_text)
+                self._record_exchange(prompt, response_text, options)
+                return response_text
+            except RequestCancelledError:
+                self._log_manager.log_info("Request cancelled.")
+                raise
+            except HTTPStatusError as e:
+                retry_options = await self._retry_options_async(e, retry_count, model, options, record)
+                if retry_options is not None:
+                    return await self._send_request_non_stream_async(prompt, retry_count + 1, retry_options)
+                record.outcome = "error"
+                self._log_manager.log_error("Failed to send request.", error=e)
+            except Exception as e:
+                record.outcome = "error"
+                self._log_manager.log_error("Failed to send request.", error=e)
+
     @abstractmethod
-    def send_request(self, prompt: str, retry_count: int = 0):
+    def _stream_response_async(
+        self, prompt: str, model: str, options: RequestOptions, record: RequestRecord
+    ) -> AsyncIterator[str]:
         """
-        Abstract method for sending a prompt to the API client.
-        Must be implemented by subclasses.
+        Abstract async generator sending one streaming request to the provider and yielding its text chunks.
+        Called once per attempt after the rate limiter admitted the request. Must be implemented by subclasses.
+
+        Raises:
+            HTTPStatusError: If the provider answered with an error status.
+        """
+        pass
+
+    @abstractmethod
+    async def _generate_async(self, prompt: str, model: str, options: RequestOptions, record: RequestRecord) -> str:
+        """
+        Abstract coroutine sending one request to the provider and returning the complete response text.
+        Called once per attempt after the rate limiter admitted the request. Must be implemented by subclasses.
+
+        Raises:
+            HTTPStatusError: If the provider answered with an error status.
+        """
+        pass
+
+    async def _retry_options_async(self, error: HTTPStatusError, retry_count: int, model: str,
+                                   options: RequestOptions, record: RequestRecord) -> Optional[RequestOptions]:
+        """
+        Decide whether a failed attempt is sent again, waiting the backoff delay of throttled requests.
+        Subclasses may override this to recover from provider specific errors.
+
+        Returns:
+            Optional[RequestOptions]: The options of the next attempt, None if the request failed.
+        """
+        if error.status in RETRYABLE_STATUSES \
+                and await self.handle_rate_limit_async(retry_count, model, error.retry_after):
+            return options
+        return None
+
+    def _get_model_name(self, options: RequestOptions) -> str:
+        """
+        Resolve the model used for a request.
+        """
+        if options.model:
+            return options.model
+        return self._config_manager.get_value("api_clients")[self.name].model
+
+    def _record_exchange(self, prompt: str, response_text: str, options: RequestOptions):
+        """
+        Append a completed exchange to the request's chat session.
+        Subclasses should override this as necessary.
         """
         pass
 
+    def _failover_target(self, options: RequestOptions) -> Optional[Tuple["BaseAPIClient", RequestOptions]]:
+        """
+        Admit a request through the circuit breaker of its model.
+
+        Returns:
+            Optional[Tuple[BaseAPIClient, RequestOptions]]: None if this client sends the request,
+            otherwise the fallback client and the options to send it with.
+
+        Raises:
+            CircuitOpenError: If the circuit is open and no fallback is configured or available.
+        """
+        key = self._rate_limit_key(options.model)
+        if self._breaker.allow(key):
+            return None
+        settings = self._config_manager.get_value("circuit_breaker")
+        provider = settings.fallback_provider or self.name
+        if not options.failover or (provider == self.name and settings.fallback_model in (None, options.model)):
+            raise CircuitOpenError(key)
+        try:
+            client = self if provider == self.name else self._config_manager.get_api_client(provider)
+        except Exception as e:
+            self._log_manager.log_error(f"Fallback provider {provider} is not available.", error=e)
+            raise CircuitOpenError(key) from e
+        if client is None:
+            raise CircuitOpenError(key)
+        self._log_manager.log_warning(
+            f"Circuit of {key} is open, failing over to {provider}:{settings.fallback_model or 'default model'}."
+        )
+        # The fallback does not fail over again, so two circuits pointing at each other cannot loop
+        return client, replace(options, model=settings.fallback_model, static_prefix=None, failover=False)
+
+    def route_model(self, prompt: str, options: Optional[RequestOptions] = None) -> str:
+        """
+        Pick the model a request will be sent to. Callers that pin the result in options.model
+        get the same model when the request is sent.
+
+        Args:
+            prompt (str): The prompt text.
+            options (Optional[RequestOptions]): Per-request settings; an explicit options.model is kept.
+
+        Returns:
+            str: The routed model.
+        """
+        default_model = self._config_manager.get_value("api_clients")[self.name].model
+        return self._router.route(prompt, options or RequestOptions(), default_model)
+
+    def get_cache_scope(self, options: RequestOptions) -> Tuple[str, str]:
+        """
+        Identify what besides the prompt text determines the response of a request, so cached
+        responses are only served to requests that would have produced them.
+
+        Args:
+            options (RequestOptions): Per-request settings with the routed model in options.model.
+
+        Returns:
+            Tuple[str, str]: The '<provider>:<model>' answering the request, the fallback while the
+            model's circuit is open, and a digest of the generation settings and the chat context.
+        """
+        model = options.model or self._config_manager.get_value("api_clients")[self.name].model
+        target = self._rate_limit_key(model)
+        if options.failover and self._breaker.is_open(target):
+            settings = self._config_manager.get_value("circuit_breaker")
+            provider = settings.fallback_provider or self.name
+            fallback_model = settings.fallback_model or self._config_manager.get_value("api_clients")[provider].model
+            target = f"{provider}:{fallback_model}"
+        settings = self.get_generation_settings(options)
+        scope = [
+            settings.max_output_tokens, settings.stop_sequences, settings.temperature,
+            "" if options.stateless else self.get_context_digest(options.session),
+        ]
+        return target, hashlib.sha256(json.dumps(scope, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def _flight_key(self, kind: str, prompt: str, options: RequestOptions) -> Optional[str]:
+        """
+        Identity of a request for single-flight coalescing: model, rendered prompt, chat session
+        with the digest of its context, and generation settings.
+
+        Returns:
+            Optional[str]: The key, None if single-flight is disabled.
+        """
+        if not self._config_manager.get_value("single_flight").enabled:
+            return None
+        settings = self.get_generation_settings(options)
+        identity = [
+            kind, options.model, options.stateless, options.session,
+            "" if options.stateless else self.get_context_digest(options.session),
+            settings.max_output_tokens, settings.stop_sequences, settings.temperature, prompt,
+            [image.digest for image in options.images],
+        ]
+        return hashlib.sha256(json.dumps(identity, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    async def _join_flight(self, key: str, prompt: str, options: RequestOptions,
+                           upstream) -> AsyncIterator:
+        """
+        Subscribe to the flight of a key. The request starting the flight is recorded by the
+        upstream request itself; requests joining it are recorded as answered by single-flight.
+        """
+        if not self._single_flight.in_flight(key):
+            async with aclosing(self._single_flight.stream(key, upstream, options.cancellation)) as items:
+                async for item in items:
+                    yield item
+            return
+
+        self._log_manager.log_info("Identical request in flight, attaching to it.")
+        record = RequestRecord(
+            provider=self.name, model=options.model, prompt_id=options.prompt_id,
+            input_chars=len(prompt), outcome="cached", cache="single-flight",
+        )
+        try:
+            async with aclosing(self._single_flight.stream(key, upstream, options.cancellation)) as items:
+                async for item in items:
+                    record.add_output(item or "")
+                    yield item
+        except DeadlineExceededError:
+            record.outcome = "deadline"
+            raise
+        except RequestCancelledError:
+            record.outcome = "cancelled"
+            raise
+        except (GeneratorExit, asyncio.CancelledError):
+            record.outcome = "cancelled"
+            raise
+        except Exception:
+            record.outcome = "error"
+            raise
+        finally:
+            self._telemetry.record(record)
+
+    def get_single_flight_stats(self) -> Dict[str, int]:
+        """
+        Returns the number of requests in flight, started and joined by identical requests.
+        """
+        return self._single_flight.get_stats()
+
+    def run_async(self, coro, timeout: Optional[float] = None):
+        """
+        Run a coroutine on the shared event loop and wait for its result.
+        """
+        return self._event_loop.run(coro, timeout)
+
+    def submit_async(self, coro):
+        """
+        Schedule a coroutine on the shared event loop without waiting for it.
+        """
+        return self._event_loop.submit(coro)
+
+    def iterate_async(self, agen: AsyncIterator[str]):
+        """
+        Consume an async generator on the shared event loop from a synchronous caller.
+        """
+        return self._event_loop.iterate(agen)
+
+    def get_context_digest(self, session: Optional[str] = None) -> str:
+        """
+        Digest of the conversation context sent along with the next prompt.
+        Subclasses should override this as necessary.
+
+        Args:
+            session (Optional[str]): Key of the chat session, the chat window's session if None.
+
+        Returns:
+            str: Hex digest of the current history.
+        """
+        return ""
+
+    def clear_history(self, session: Optional[str] = None):
+        """
+        Clear the history of a chat session, the chat window's session if None.
+        Subclasses should override this as necessary.
+        """
+        pass
+
+    def add_to_history(self, prompt: str, response_text: str, session: Optional[str] = None):
+        """
+        Record an exchange that was answered without calling the API, e.g. from a cache.
+        Subclasses should override this as necessary.
+        """
+        pass
+
+    def rewarm(self, reason: str = "idle"):
+        """
+        Re-establish pooled connections before the next request, e.g. after idle or resume.
+        Subclasses should override this as necessary.
+        """
+        pass
+
+    def get_generation_settings(self, options: Optional[RequestOptions] = None) -> GenerationSettings:
+        """
+        Resolve the generation settings of a request.
+        Per-request settings, e.g. from the prompt, override the provider settings field by field.
+
+        Args:
+            options (Optional[RequestOptions]): Per-request settings.
+
+        Returns:
+            GenerationSettings: The effective settings.
+        """
+        provider = self._config_manager.get_value("api_clients")[self.name]
+        override = (options.generation if options else None) or GenerationSettings()
+        return GenerationSettings(
+            max_output_tokens=override.max_output_tokens or provider.max_tokens,
+            stop_sequences=override.stop_sequences or provider.stop_sequences,
+            temperature=override.temperature if override.temperature is not None else provider.temperature,
+            deadline_seconds=override.deadline_seconds or provider.timeout,
+        )
+
+    def _prepare_options(self, options: Optional[RequestOptions], prompt: str = "") -> RequestOptions:
+        """
+        Returns a copy of the request options that carries the routed model and a
+        cancellation token with the request's deadline applied.
+        """
+        options = options or RequestOptions()
+        default_model = self._config_manager.get_value("api_clients")[self.name].model
+        options = replace(options, model=self._router.route(prompt, options, default_model))
+        if options.cancellation is None:
+            options = replace(options, cancellation=CancellationToken())
+        deadline = self.get_generation_settings(options).deadline_seconds
+        if deadline:
+            options.cancellation.set_timeout(deadline)
+        return options
+
+    @asynccontextmanager
+    async def _track_request(self, prompt: str, model: str, options: RequestOptions):
+        """
+        Run a request body so that its token and cancel_request() abort it, and record its telemetry.
+        Retries of a request share the record of the first attempt.
+
+        Yields:
+            RequestRecord: The record to report received output and errors on.
+        """
+        token = options.cancellation
+        record = self._active_records.get(token)
+        if record is not None:  # Retry of a request that is already tracked
+            record.retries += 1
+            async with cancel_scope(token):
+                yield record
+            return
+        record = RequestRecord(
+            provider=self.name, model=model, prompt_id=options.prompt_id,
+            input_chars=len(prompt), cache=options.cache,
+        )
+        self._active_records[token] = record
+        self._request_stats["requests"] += 1
+        lane = self._lane_settings(options.priority)
+        try:
+            async with cancel_scope(token):
+                # The lane slot is held across retries, so a retried request does not queue again
+                await self._rate_limiter.enter_lane_async(options.priority, lane.max_concurrent)
+                try:
+                    yield record
+                finally:
+                    self._rate_limiter.leave_lane(options.priority)
+        except DeadlineExceededError:
+            record.outcome = "deadline"
+            self._request_stats["deadline_exceeded"] += 1
+            self._log_manager.log_warning("Request exceeded its deadline and was aborted.")
+            raise
+        except RequestCancelledError:
+            record.outcome = "cancelled"
+            self._request_stats["cancelled"] += 1
+            raise
+        except (GeneratorExit, asyncio.CancelledError):
+            record.outcome = "cancelled"
+            raise
+        except Exception:
+            record.outcome = "error"
+            raise
+        finally:
+            del self._active_records[token]
+            self._router.observe(record)
+            self._breaker.record(
+                self._rate_limit_key(model), record.outcome,
+                ((record.first_chunk or time.monotonic()) - record.started) * 1000,
+            )
+            self._telemetry.record(record)
+
+    def record_cache_hit(self, prompt: str, response_text: str, options: RequestOptions, started: float):
+        """
+        Record the telemetry of a request that was answered from a cache without calling the API.
+
+        Args:
+            prompt (str): The prompt text.
+            response_text (str): The cached response.
+            options (RequestOptions): Per-request settings; options.cache names the cache that answered
+                and options.model the model the request was routed to.
+            started (float): Monotonic time the lookup started.
+        """
+        record = RequestRecord(
+            provider=self.name, model=options.model or self._config_manager.get_value("api_clients")[self.name].model,
+            prompt_id=options.prompt_id, input_chars=len(prompt), outcome="cached",
+            cache=options.cache, started=started,
+        )
+        record.add_output(response_text)
+        self._telemetry.record(record)
+
+    def get_circuit_states(self) -> Dict[str, Dict]:
+        """
+        Returns state, error rate and latency of the circuit of every provider and model.
+        """
+        return self._breaker.get_states()
+
+    def get_routing_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the number of requests routed to each model and the learned latency per model.
+        """
+        return self._router.get_stats()
+
+    def get_request_stats(self) -> Dict[str, int]:
+        """
+        Returns the number of requests and how many of them were cancelled or exceeded their deadline.
+        """
+        return dict(self._request_stats)
+
     def cancel_request(self):
         """
-        Set the cancellation flag for stopping an ongoing request.
+        Cancel all requests in flight, aborting their connections.
+        """
+        for token in list(self._active_records):
+            token.cancel()
+
+    def _lane_settings(self, priority: int) -> LaneConfig:
+        """
+        Returns the settings of the lane of a priority.
+        """
+        name = LANE_NAMES.get(priority)
+        return getattr(self._config_manager.get_value("lanes"), name) if name else LaneConfig()
+
+    def get_lane_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns requests in flight, queued and the wait times per lane.
+        """
+        return self._rate_limiter.get_lane_stats()
+
+    def _rate_limit_key(self, model: str) -> str:
+        return f"{self.name}:{model}"
+
+    def _get_rate_limit(self, model: str):
+        """
+        Returns the configured RateLimit of a model, None if the model is unlimited.
         """
-        self._cancel_flag = True
+        return self._config_manager.get_value("api_clients")[self.name].rate_limits.get(model)
 
-    def handle_rate_limit(self, retry_count: int, max_retries: int, retry_delay: int) -> bool:
+    async def acquire_rate_limit_async(self, model: str, prompt: str,
+                                       priority: int = RequestPriority.INTERACTIVE):
+        """
+        Wait on the event loop until the rate limiter admits a request for the model.
+        """
+        limit = self._get_rate_limit(model)
+        await self._rate_limiter.acquire_async(
+            self._rate_limit_key(model), limit and limit.rpm, limit and limit.tpm,
+            estimate_tokens(prompt), priority, self._lane_settings(priority).rate_share,
+        )
+
+    def _rate_limit_delay(self, retry_count: int, model: str, retry_after: Optional[float]) -> Optional[float]:
+        max_retries = self._config_manager.get_value("api_clients")[self.name].max_retries
+        if retry_count >= max_retries:
+            self._log_manager.log_error("Maximum retries reached.")
+            return None
+        return self._rate_limiter.report_throttled(self._rate_limit_key(model), retry_count, retry_after)
+
+    async def handle_rate_limit_async(self, retry_count: int, model: str,
+                                      retry_after: Optional[float] = None) -> bool:
         """
         Shared rate-limit handling across APIs.
+        Pauses the model's rate limiter and waits an exponential backoff delay with jitter on the event loop.
+
         Args:
             retry_count (int): Current retry attempt.
-            max_retries (int): Maximum number of retries.
-            retry_delay (int): Time delay between retries.
+            model (str): The model that returned the 429/503 response.
+            retry_after (Optional[float]): Server supplied Retry-After value in seconds.
 
         Returns:
             bool: True if retry should proceed, False otherwise.
         """
-        if retry_count < max_retries:
-            sleep(retry_delay)
-            return True
-        self._log_manager.log_error("Maximum retries reached.")
-        return False
+        delay = self._rate_limit_delay(retry_count, model, retry_after)
+        if delay is None:
+            return False
+        await asyncio.sleep(delay)
+        return True
 
     def validate_api_key(self, api_key: str) -> bool:
         """
@@ -83,4 +715,14 @@ class BaseAPIClient(ABC):
         Shared mechanism for getting available models.
         To be implemented by subclasses.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def get_model_details(self) -> List[Dict]:
+        """
+        Get available models together with their metadata.
+        Subclasses should override this to provide token limits and supported methods.
+
+        Returns:
+            List[Dict]: One dictionary per model with at least a 'name' key.
+        """
+        return [{"name": name} for name in self.get_available_models()]
\ No newline at end of file
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from threading import Lock
+from typing import Callable, List, Optional
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.clients.async_transport import EventLoopThread
+
+CANCELLED = "cancelled"
+DEADLINE_EXCEEDED = "deadline"
+
+
+class RequestCancelledError(Exception):
+    """Raised by a request whose cancellation token was cancelled."""
+
+
+class DeadlineExceededError(RequestCancelledError):
+    """Raised by a request that did not finish before its deadline."""
+
+
+class CancellationToken:
+    """
+    Thread-safe handle for cancelling a request from any thread.
+    Cancelling the token cancels the asyncio task running the request, which aborts its
+    HTTP connection immediately instead of waiting for the generation to finish.
+    An optional timeout cancels the token automatically once the deadline has passed.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Args:
+            timeout (Optional[float]): Seconds until the request is cancelled with DeadlineExceededError.
+        """
+        self._lock = Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self._tasks = set()
+        self.reason: Optional[str] = None
+        self.deadline: Optional[float] = None
+        if timeout:
+            self.set_timeout(timeout)
+
+    def set_timeout(self, timeout: float):
+        """
+        Cancel the token with DeadlineExceededError after `timeout` seconds,
+        unless it already has an earlier deadline.
+        """
+        deadline = time.monotonic() + timeout
+        if self.deadline is not None and self.deadline <= deadline:
+            return
+        self.deadline = deadline
+        loop = EventLoopThread.get_instance().loop
+        loop.call_soon_threadsafe(loop.call_later, timeout, self._on_deadline, deadline)
+
+    def _on_deadline(self, deadline: float):
+        if deadline == self.deadline:
+            self.cancel(DEADLINE_EXCEEDED)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None
+
+    def remaining(self) -> Optional[float]:
+        """
+        Seconds left until the deadline, None if the token has no deadline.
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cancel(self, reason: str = CANCELLED):
+        """
+        Cancel the token and run its callbacks. Later calls have no effect.
+
+        Args:
+            reason (str): CANCELLED or DEADLINE_EXCEEDED.
+        """
+        with self._lock:
+            if self.reason is not None:
+                return
+            self.reason = reason
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Register a callback run on cancellation, immediately if the token is already cancelled.
+
+        Returns:
+            Callable[[], None]: Function removing the callback again.
+        """
+        with self._lock:
+            if self.reason is None:
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def error(self) -> RequestCancelledError:
+        """
+        Returns the exception describing why the token was cancelled.
+        """
+        if self.reason == DEADLINE_EXCEEDED:
+            return DeadlineExceededError("Request deadline exceeded.")
+        return RequestCancelledError("Request cancelled.")
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise self.error()
+
+
+@asynccontextmanager
+async def cancel_scope(token: Optional[CancellationToken]):
+    """
+    Cancel the current task when the token is cancelled and raise the token's error instead
+    of asyncio.CancelledError. Nested scopes of the same task and token are no-ops.
+
+    Args:
+        token (Optional[CancellationToken]): The request's token, None for an uncancellable scope.
+    """
+    task = asyncio.current_task()
+    if token is None or task in token._tasks:
+        yield
+        return
+    token.raise_if_cancelled()
+    loop = asyncio.get_running_loop()
+    token._tasks.add(task)
+    remove_callback = token.add_callback(lambda: loop.call_soon_threadsafe(task.cancel))
+    try:
+        yield
+    except asyncio.CancelledError:
+        if not token.cancelled:
+            raise
+        if hasattr(task, "uncancel"):
+            task.uncancel()
+        raise token.error() from None
+    finally:
+        remove_callback()
+        token._tasks.discard(task)
@@ -0,0 +1,141 @@
+from threading import Lock
+from typing import Any, Callable, List
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.utils.config_manager import ConfigManager
+from src.utils.log_manager import LogManager
+from src.clients.rate_limiter import estimate_tokens
+from src.clients.request_options import RequestOptions, RequestPriority
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+SUMMARY_ACKNOWLEDGEMENT = "Understood, I will take this earlier conversation into account."
+SUMMARY_PROMPT = (
+    "Summarize the following conversation in at most {words} words. Keep facts, decisions, names "
+    "and open questions that later messages may refer to. Reply only with the summary.\n\n{transcript}"
+)
+
+
+class ChatContextManager:
+    """
+    Keeps the chat session history sent with each request within a token budget.
+    The oldest turns are dropped from the session as a sliding window; optionally they are
+    compacted into a running summary that is generated in the background and kept as the
+    first turn of the session. The local ChatHistory transcript is not affected.
+    """
+
+    def __init__(self, api_client, make_content: Callable[[str, str], Any]):
+        """
+        Args:
+            api_client: The BaseAPIClient used to generate summaries.
+            make_content: Builds a history entry from a role ('user' or 'model') and a text.
+        """
+        self._log_manager = LogManager.get_instance()
+        self._config_manager = ConfigManager.get_instance()
+        self._api_client = api_client
+        self._make_content = make_content
+        self._lock = Lock()
+        self._summary = ""
+        self._summary_entries: List[Any] = []
+        self._pending: List[str] = []
+        self._summarizing = False
+        # Incremented on reset so summaries of a discarded session are ignored
+        self._generation = 0
+
+    @staticmethod
+    def _text_of(entry) -> str:
+        return "".join(part.text for part in entry.parts if part.text)
+
+    def _has_summary(self, history: List) -> bool:
+        count = len(self._summary_entries)
+        return count > 0 and len(history) >= count \
+            and all(entry is summary for entry, summary in zip(history, self._summary_entries))
+
+    def reset(self):
+        """
+        Forget the running summary, e.g. when the chat session is cleared or restarted.
+        """
+        with self._lock:
+            self._generation += 1
+            self._summary = ""
+            self._summary_entries = []
+            self._pending = []
+            self._summarizing = False
+
+    def fit(self, history: List):
+        """
+        Trim the history in place to the configured token budget.
+
+        Args:
+            history (List): The chat session history, oldest entry first.
+        """
+        settings = self._config_manager.get_value("chat_context")
+        if not settings.max_context_tokens:
+            return
+        with self._lock:
+            start = len(self._summary_entries) if self._has_summary(history) else 0
+            costs = [estimate_tokens(self._text_of(entry)) for entry in history]
+            total = sum(costs)
+            end = start
+            # Drop whole user/model turns, but always keep the latest one
+            while total > settings.max_context_tokens and end + 2 < len(history):
+                total -= costs[end] + costs[end + 1]
+                end += 2
+            if end == start:
+                return
+            dropped = history[start:end]
+            del history[start:end]
+            self._log_manager.log_info(f"Dropped {len(dropped) // 2} old turns from the chat context.")
+
+            if not settings.summarize:
+                return
+            self._pending.extend(
+                f"{entry.role}: {self._text_of(entry)}" for entry in dropped
+            )
+            if not self._summarizing:
+                self._summarizing = True
+                self._api_client.submit_async(self._summarize(history, self._generation))
+
+    async def _summarize(self, history: List, generation: int):
+        """
+        Fold the dropped turns into the running summary until nothing is pending.
+        """
+        settings = self._config_manager.get_value("chat_context")
+        try:
+            while True:
+                with self._lock:
+                    if generation != self._generation or not self._pending:
+                        return
+                    transcript = "\n".join(
+                        ([f"Earlier summary: {self._summary}"] if self._summary else []) + self._pending
+                    )
+                    self._pending = []
+                summary = await self._api_client.send_request_non_stream_async(
+                    SUMMARY_PROMPT.format(words=settings.summary_max_words, transcript=transcript),
+                    options=RequestOptions(stateless=True, priority=RequestPriority.BULK),
+                )
+                if not summary:
+                    self._log_manager.log_warning("Chat context summary could not be generated.")
+                    return
+                with self._lock:
+                    if generation != self._generation:
+                        return
+                    entries = [
+                        self._make_content("user", SUMMARY_PREFIX + summary.strip()),
+                        self._make_content("model", SUMMARY_ACKNOWLEDGEMENT),
+                    ]
+                    if self._has_summary(history):
+                        history[:len(self._summary_entries)] = entries
+                    else:
+                        history[:0] = entries
+                    self._summary = summary.strip()
+                    self._summary_entries = entries
+                self._log_manager.log_info("Chat context summary updated.")
+        except Exception as e:
+            self._log_manager.log_error("Failed to summarize chat context.", error=e)
+        finally:
+            with self._lock:
+                if generation == self._generation:
+                    self._summarizing = False
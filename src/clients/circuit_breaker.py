@@ -0,0 +1,224 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Callable, Deque, Dict, List, Tuple
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.utils.config_manager import ConfigManager
+from src.utils.log_manager import LogManager
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+# Outcomes of RequestRecord that count as failures; cancelled requests count neither way
+FAILED_OUTCOMES = ("error", "deadline")
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a request is refused because the circuit of its provider and model is open
+    and no fallback is available.
+    """
+
+    def __init__(self, key: str):
+        super().__init__(f"Circuit of {key} is open.")
+        self.key = key
+
+
+@dataclass(slots=True)
+class _Circuit:
+    state: str = CLOSED
+    # (monotonic time, failed) of the calls within the window
+    calls: Deque[Tuple[float, bool]] = field(default_factory=deque)
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    probes: int = 0
+    latency_ms: float = 0.0
+
+
+class CircuitBreaker:
+    """
+    Singleton circuit breaker shared by all API clients, with one circuit per provider and model.
+    A circuit opens after circuit_breaker.failure_threshold consecutive failures or once the error
+    rate within the window reaches error_rate_threshold; calls whose first response takes longer
+    than slow_call_ms count as failures. While open, requests are refused so callers can fail
+    over at once instead of waiting for a timeout. After open_seconds the circuit half-opens and
+    lets half_open_probes requests through; a successful probe closes it, a failed one opens it again.
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = CircuitBreaker()
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self._log_manager = LogManager.get_instance()
+        self._config_manager = ConfigManager.get_instance()
+        self._lock = Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+        self._listeners: List[Callable[[], None]] = []
+        self._stats = {"opened": 0, "refused": 0, "probes": 0}
+
+    def add_listener(self, listener: Callable[[], None]):
+        """
+        Register a callback invoked after any circuit changed its state.
+        Called on the thread that reported the outcome, so GUI listeners must hand over to their own thread.
+        """
+        self._listeners.append(listener)
+
+    def _transition(self, key: str, circuit: _Circuit, state: str, now: float) -> bool:
+        if circuit.state == state:
+            return False
+        circuit.state = state
+        circuit.probes = 0
+        if state == OPEN:
+            circuit.opened_at = now
+            self._stats["opened"] += 1
+            self._log_manager.log_warning(f"Circuit of {key} opened.")
+        elif state == HALF_OPEN:
+            self._log_manager.log_info(f"Circuit of {key} half-open, probing.")
+        else:
+            circuit.calls.clear()
+            circuit.consecutive_failures = 0
+            self._log_manager.log_info(f"Circuit of {key} closed.")
+        return True
+
+    def _notify(self):
+        for listener in self._listeners:
+            try:
+                listener()
+            except Exception as e:
+                self._log_manager.log_error("Circuit breaker listener failed.", error=e)
+
+    def allow(self, key: str) -> bool:
+        """
+        Check whether a request may be sent to a provider and model.
+        A half-open circuit admits its probe requests only; each admitted request must be
+        followed by record().
+
+        Args:
+            key (str): Circuit key, '<provider>:<model>'.
+
+        Returns:
+            bool: True if the request may be sent, False if it should fail over.
+        """
+        settings = self._config_manager.get_value("circuit_breaker")
+        if not settings.enabled:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            changed = circuit.state == OPEN and now - circuit.opened_at >= settings.open_seconds \
+                and self._transition(key, circuit, HALF_OPEN, now)
+            if circuit.state == CLOSED:
+                allowed = True
+            elif circuit.state == HALF_OPEN and circuit.probes < max(1, settings.half_open_probes):
+                circuit.probes += 1
+                self._stats["probes"] += 1
+                allowed = True
+            else:
+                self._stats["refused"] += 1
+                allowed = False
+        if changed:
+            self._notify()
+        return allowed
+
+    def is_open(self, key: str) -> bool:
+        """
+        Check whether requests to a provider and model are currently refused, without admitting one.
+
+        Args:
+            key (str): Circuit key, '<provider>:<model>'.
+
+        Returns:
+            bool: True if the circuit is open and not yet due for a probe.
+        """
+        settings = self._config_manager.get_value("circuit_breaker")
+        if not settings.enabled:
+            return False
+        with self._lock:
+            circuit = self._circuits.get(key)
+            return circuit is not None and circuit.state == OPEN \
+                and time.monotonic() - circuit.opened_at < settings.open_seconds
+
+    def record(self, key: str, outcome: str, latency_ms: float):
+        """
+        Report the outcome of a request admitted by allow().
+
+        Args:
+            key (str): Circuit key, '<provider>:<model>'.
+            outcome (str): The RequestRecord outcome, e.g. 'ok' or 'error'.
+            latency_ms (float): Time until the first response of the request.
+        """
+        settings = self._config_manager.get_value("circuit_breaker")
+        if not settings.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            if outcome not in FAILED_OUTCOMES and outcome != "ok":
+                # Neither success nor failure, only release the probe slot
+                circuit.probes = max(0, circuit.probes - 1)
+                return
+            failed = outcome in FAILED_OUTCOMES or \
+                (settings.slow_call_ms is not None and latency_ms > settings.slow_call_ms)
+            circuit.latency_ms = latency_ms
+            circuit.calls.append((now, failed))
+            while circuit.calls and now - circuit.calls[0][0] > settings.window_seconds:
+                circuit.calls.popleft()
+            circuit.consecutive_failures = circuit.consecutive_failures + 1 if failed else 0
+
+            if circuit.state == HALF_OPEN:
+                changed = self._transition(key, circuit, OPEN if failed else CLOSED, now)
+            elif circuit.state == CLOSED and failed:
+                failures = sum(1 for _, call_failed in circuit.calls if call_failed)
+                tripped = circuit.consecutive_failures >= settings.failure_threshold or (
+                    len(circuit.calls) >= settings.min_requests
+                    and failures / len(circuit.calls) >= settings.error_rate_threshold
+                )
+                changed = tripped and self._transition(key, circuit, OPEN, now)
+            else:
+                changed = False
+        if changed:
+            self._notify()
+
+    def get_states(self) -> Dict[str, Dict]:
+        """
+        Returns state, error rate within the window and last latency in ms of every circuit.
+        """
+        with self._lock:
+            states = {}
+            for key, circuit in self._circuits.items():
+                failures = sum(1 for _, failed in circuit.calls if failed)
+                states[key] = {
+                    "state": circuit.state,
+                    "error_rate": failures / len(circuit.calls) if circuit.calls else 0.0,
+                    "latency_ms": circuit.latency_ms,
+                }
+            return states
+
+    def describe(self) -> str:
+        """
+        Returns a one-line-per-circuit summary of the circuits that are not closed, empty if all are.
+        """
+        return "\n".join(
+            f"{key}: {state['state']} ({state['error_rate']:.0%} errors)"
+            for key, state in self.get_states().items() if state["state"] != CLOSED
+        )
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Returns how often circuits opened, how many requests were refused and how many probes were sent.
+        """
+        with self._lock:
+            return dict(self._stats)
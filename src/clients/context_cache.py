@@ -0,0 +1,176 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Optional, Set
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.utils.config_manager import ConfigManager
+from src.utils.log_manager import LogManager
+from src.clients.rate_limiter import estimate_tokens
+
+# Cached contents this close to their expiry are not used anymore
+EXPIRY_SAFETY_SECONDS = 10
+# Status codes with which the API rejects an expired or unknown cached content
+REJECTED_STATUSES = (400, 403, 404)
+
+
+@dataclass(slots=True)
+class _CachedPrefix:
+    name: str
+    tokens: int
+    expires: float
+
+
+class ContextCacheManager:
+    """
+    Keeps long static prompt prefixes in provider-side cached contents, so only the dynamic
+    part of a prompt is uploaded and processed per request.
+    A cached content is created in the background on the first request that misses, is
+    refreshed when it is used shortly before its expiry and otherwise expires on its own.
+    The least recently used entries are deleted once more than max_entries are cached.
+    """
+
+    def __init__(self, api_client):
+        """
+        Args:
+            api_client: Client implementing create_cached_content_async, refresh_cached_content_async
+                and delete_cached_content_async.
+        """
+        self._log_manager = LogManager.get_instance()
+        self._config_manager = ConfigManager.get_instance()
+        self._api_client = api_client
+        self._lock = Lock()
+        self._entries: "OrderedDict[str, _CachedPrefix]" = OrderedDict()
+        self._busy: Set[str] = set()  # Keys being created or refreshed
+        self._failed_until: Dict[str, float] = {}
+        self._stats = {
+            "hits": 0, "misses": 0, "created": 0, "refreshed": 0,
+            "expired": 0, "evicted": 0, "failures": 0, "cached_tokens": 0,
+        }
+
+    @staticmethod
+    def _key(model: str, prefix: str) -> str:
+        return hashlib.sha256(f"{model}\0{prefix}".encode("utf-8")).hexdigest()
+
+    def is_eligible(self, prefix: Optional[str]) -> bool:
+        """
+        Whether a prompt prefix is long enough to be worth caching.
+        """
+        settings = self._config_manager.get_value("context_cache")
+        return settings.enabled and bool(prefix) and estimate_tokens(prefix) >= settings.min_prefix_tokens
+
+    def lookup(self, model: str, prefix: str) -> Optional[str]:
+        """
+        Get the cached content holding a prefix, starting its creation or refresh in the background if needed.
+
+        Args:
+            model (str): The model the request is sent to; cached contents are bound to a model.
+            prefix (str): The static prompt prefix.
+
+        Returns:
+            Optional[str]: Resource name of the cached content, None if the prefix has to be sent in full.
+        """
+        settings = self._config_manager.get_value("context_cache")
+        key = self._key(model, prefix)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires - now > EXPIRY_SAFETY_SECONDS:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["cached_tokens"] += entry.tokens
+                if entry.expires - now < settings.refresh_margin_seconds and key not in self._busy:
+                    self._busy.add(key)
+                    self._api_client.submit_async(self._refresh(key, entry))
+                return entry.name
+
+            self._stats["misses"] += 1
+            if entry is not None:
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._log_manager.log_info(f"Cached context {entry.name} expired.")
+            if key not in self._busy and self._failed_until.get(key, 0.0) <= now:
+                self._busy.add(key)
+                self._api_client.submit_async(self._create(key, model, prefix))
+        return None
+
+    def invalidate(self, model: str, prefix: str):
+        """
+        Forget the cached content of a prefix after the API rejected it.
+        """
+        with self._lock:
+            entry = self._entries.pop(self._key(model, prefix), None)
+            if entry is not None:
+                self._stats["expired"] += 1
+        if entry is not None:
+            self._log_manager.log_warning(f"Cached context {entry.name} was rejected, sending the full prompt.")
+
+    async def _create(self, key: str, model: str, prefix: str):
+        settings = self._config_manager.get_value("context_cache")
+        tokens = estimate_tokens(prefix)
+        try:
+            name = await self._api_client.create_cached_content_async(model, prefix, settings.ttl_seconds)
+        except Exception as e:
+            with self._lock:
+                self._stats["failures"] += 1
+                # Do not retry on every request, e.g. if the model does not support caching
+                self._failed_until[key] = time.monotonic() + settings.ttl_seconds
+            self._log_manager.log_error("Failed to create cached context.", error=e)
+            return
+        finally:
+            with self._lock:
+                self._busy.discard(key)
+
+        evicted = []
+        with self._lock:
+            self._entries[key] = _CachedPrefix(name, tokens, time.monotonic() + settings.ttl_seconds)
+            self._stats["created"] += 1
+            while len(self._entries) > max(1, settings.max_entries):
+                evicted.append(self._entries.popitem(last=False)[1])
+                self._stats["evicted"] += 1
+        self._log_manager.log_info(
+            f"Created cached context {name} for {model} (~{tokens} tokens, ttl {settings.ttl_seconds} s)."
+        )
+        for entry in evicted:
+            await self._delete(entry)
+
+    async def _refresh(self, key: str, entry: _CachedPrefix):
+        settings = self._config_manager.get_value("context_cache")
+        try:
+            await self._api_client.refresh_cached_content_async(entry.name, settings.ttl_seconds)
+            with self._lock:
+                entry.expires = time.monotonic() + settings.ttl_seconds
+                self._stats["refreshed"] += 1
+            self._log_manager.log_info(f"Refreshed cached context {entry.name}.")
+        except Exception as e:
+            with self._lock:
+                self._stats["failures"] += 1
+            self._log_manager.log_error(f"Failed to refresh cached context {entry.name}.", error=e)
+        finally:
+            with self._lock:
+                self._busy.discard(key)
+
+    async def _delete(self, entry: _CachedPrefix):
+        try:
+            await self._api_client.delete_cached_content_async(entry.name)
+            self._log_manager.log_info(f"Deleted least recently used cached context {entry.name}.")
+        except Exception as e:
+            self._log_manager.log_error(f"Failed to delete cached context {entry.name}.", error=e)
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Returns the number of cached contents, the lifecycle counters, the hit rate and the
+        estimated number of input tokens served from cached contents.
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "entries": len(self._entries),
+                **self._stats,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+            }
@@ -1,12 +1,30 @@
+import asyncio
+import hashlib
+import json
 import sys
+import time
+from dataclasses import replace
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional
+from urllib.parse import urlsplit
 
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 
 root_dir = Path(__file__).parent.parent.parent
 sys.path.append(str(root_dir))
 from src.clients.base_api_client import BaseAPIClient
+from src.clients.async_transport import HTTPStatusError
+from src.clients.cancellation import CancellationToken
+from src.clients.circuit_breaker import CircuitOpenError
+from src.clients.request_options import RequestOptions
+from src.clients.hedging import RequestHedger
+from src.clients.session_pool import CHAT_SESSION, ChatSessionPool, PooledSession
+from src.clients.context_cache import ContextCacheManager, REJECTED_STATUSES
+from src.utils.telemetry_store import RequestRecord
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com"
+API_VERSION = "v1beta"
 
 
 class GeminiClient(BaseAPIClient):
@@ -21,32 +39,62 @@ class GeminiClient(BaseAPIClient):
         return cls._instance
 
     @staticmethod
-    def validate_api_key(api_key: str) -> bool:
+    def check_api_key(api_key: str) -> Optional[bool]:
         """
-        Validate the Gemini API key by making a test request.
+        Check the Gemini API key with a metadata call that does not consume generation quota.
 
         Args:
-            api_key (str): The API key to validate.
+            api_key (str): The API key to check.
 
         Returns:
-            bool: True if valid, False otherwise.
+            Optional[bool]: True if valid, False if rejected, None if the check could not complete.
         """
+        if not api_key:
+            return False
         try:
-            if api_key == "":
-                return False
             genai.configure(api_key=api_key)
-
-            test_model = genai.GenerativeModel("gemini-2.0-flash")
-            test_model.generate_content(["Test"])
+            genai.get_model("models/gemini-2.0-flash", request_options={"timeout": 10})
             return True
-        except Exception:
+        except (
+            google_exceptions.InvalidArgument,
+            google_exceptions.PermissionDenied,
+            google_exceptions.Unauthenticated,
+        ):
             return False
+        except Exception:
+            return None
+
+    @staticmethod
+    def validate_api_key(api_key: str) -> bool:
+        """
+        Validate the Gemini API key.
+
+        Args:
+            api_key (str): The API key to validate.
+
+        Returns:
+            bool: True if valid, False otherwise.
+        """
+        return GeminiClient.check_api_key(api_key) is True
 
     def __init__(self):
         if hasattr(self, "_initialized"):
             return
         super().__init__()
         self._initialized = True
+        self._warming = False
+        self._keepalive_future = None
+        self._last_connection_use = 0.0
+        self._last_activity = time.monotonic()
+        # Time to first response in ms, split by whether the connection was warm
+        self._latency_stats = {"cold": [0, 0.0], "warm": [0, 0.0]}
+        self._hedger = RequestHedger()
+        self._sessions = ChatSessionPool(
+            self,
+            lambda model, history: genai.GenerativeModel(model).start_chat(history=history),
+            lambda role, text: genai.protos.Content(role=role, parts=[genai.protos.Part(text=text)]),
+        )
+        self._context_cache = ContextCacheManager(self)
         self._initialize_client()
 
     def _initialize_client(self):
@@ -54,10 +102,12 @@ class GeminiClient(BaseAPIClient):
         try:
             self.name = "gemini"
             api_key = self._credential_manager.get_api_key("gemini")
+            self._api_key = api_key
             if not api_key:
                 return
             genai.configure(api_key=api_key)
             self._start_chat_session()
+            self._start_warmup()
             self._log_manager.log_info("Gemini client configured successfully.")
         except Exception as e:
             self._log_manager.log_error("Failed to initialize Gemini client.", error=e)
@@ -65,97 +115,462 @@ class GeminiClient(BaseAPIClient):
 
     def _start_chat_session(self):
         """
-        Start a new chat session with a specified model.
-
-        Args:
-            model_name (str): The name of the Gemini model to use.
-
-        Returns:
-            genai.ChatSession: The initialized chat session.
+        Start a new pool of chat sessions, each created on its first request.
         """
         try:
             api_clients = self._config_manager.get_value("api_clients")
             stored_model = api_clients["gemini"].model
-            model = genai.GenerativeModel(stored_model)
-            self._chat_session = model.start_chat()
+            self._sessions.reset()
             self._log_manager.log_info(
-                f"Chat session started with model: {stored_model}"
+                f"Chat sessions started with model: {stored_model}"
             )
         except Exception as e:
             self._log_manager.log_error("Failed to start chat session.", error=e)
             raise
 
-    def send_request_non_stream(
-        self, prompt: str, retry_count: int = 0
-    ) -> Optional[str]:
+    def _start_warmup(self):
+        """
+        Warm the connection in the background and keep it alive while the user is active.
         """
-        Send a request to the Gemini API.
+        if not self._config_manager.get_value("warmup").enabled:
+            return
+        self.rewarm("startup")
+        if self._keepalive_future is None:
+            self._keepalive_future = self._event_loop.submit(self._keepalive_loop())
 
-        Args:
-            prompt (str): The prompt to send.
-            retry_count (int): Current retry attempt number.
+    def rewarm(self, reason: str = "idle"):
+        """
+        Re-establish the pooled connection in the background.
 
-        Returns:
-            Optional[str]: Response text or None if failed.
+        Args:
+            reason (str): Why the warm-up was triggered, used for logging.
         """
-        if not genai:
-            self._log_manager.log_error("Gemini client not initialized.")
-            return None
+        if not self._api_key or not self._config_manager.get_value("warmup").enabled:
+            return
+        self._last_activity = time.monotonic()
+        self._event_loop.submit(self._warm_async(reason))
 
+    async def _warm_async(self, reason: str):
+        """
+        Open a pooled TLS connection with a cheap metadata request. Requests are sent over REST
+        through the same transport, so no SDK client is initialised here.
+        """
+        if self._warming:
+            return
+        self._warming = True
+        started = time.monotonic()
         try:
-            response = self._chat_session.send_message(prompt)
-            response_text = response.text
+            if reason == "resume":
+                # Pooled sockets rarely survive a sleep or lock, drop them instead of failing on first use
+                self._transport.close_idle()
+            model = self._get_model_name(RequestOptions())
+            await self._transport.request("GET", self._model_url(model), headers=self._rest_headers())
+            self._last_connection_use = time.monotonic()
+            self._log_manager.log_info(
+                f"Gemini client warmed ({reason}) in {(self._last_connection_use - started) * 1000:.0f} ms."
+            )
+        except Exception as e:
+            self._log_manager.log_error("Failed to warm up Gemini client.", error=e)
+        finally:
+            self._warming = False
+
+    async def _keepalive_loop(self):
+        """
+        Periodically refresh the connection until the user has been idle for a while.
+        """
+        while True:
+            settings = self._config_manager.get_value("warmup")
+            await asyncio.sleep(settings.keepalive_interval_seconds)
+            now = time.monotonic()
+            if now - self._last_activity > settings.idle_after_seconds:
+                continue
+            if now - self._last_connection_use >= settings.keepalive_interval_seconds:
+                await self._warm_async("keep-alive")
+
+    def _is_warm(self) -> bool:
+        interval = self._config_manager.get_value("warmup").keepalive_interval_seconds
+        return time.monotonic() - self._last_connection_use < 2 * interval
+
+    def _record_first_response(self, started: float, was_warm: bool):
+        """
+        Record the time to first response for the cold-vs-warm latency metric.
+        """
+        now = time.monotonic()
+        elapsed_ms = (now - started) * 1000
+        stats = self._latency_stats["warm" if was_warm else "cold"]
+        stats[0] += 1
+        stats[1] += elapsed_ms
+        self._last_connection_use = now
+        self._last_activity = now
+        self._log_manager.log_info(
+            f"First response after {elapsed_ms:.0f} ms ({'warm' if was_warm else 'cold'} connection)."
+        )
+
+    def get_warmup_metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the request count and average time to first response for cold and warm connections.
+        """
+        return {
+            state: {"count": count, "avg_ms": total / count if count else 0.0}
+            for state, (count, total) in self._latency_stats.items()
+        }
+
+    def clear_history(self, session: Optional[str] = None):
+        """
+        Clear the history of a chat session.
+
+        Args:
+            session (Optional[str]): Key of the session, the chat window's session if None.
+        """
+        self._sessions.clear(session or CHAT_SESSION)
+
+    def get_session_pool_stats(self) -> Dict[str, int]:
+        """
+        Returns the number of pooled chat sessions and how often sessions were created, reused and evicted.
+        """
+        return self._sessions.get_stats()
 
+    def _session(self, options: RequestOptions) -> PooledSession:
+        """
+        Get the pooled chat session of a request.
+        """
+        return self._sessions.get(options.session or CHAT_SESSION, self._get_model_name(options))
+
+    def _save_to_chat_history(self, prompt: str, response_text: str, session: PooledSession):
+        """
+        Record a completed exchange of the chat window's session in the local chat history
+        and keep the session context within its token budget.
+        """
+        if session.key == CHAT_SESSION:
             self._chat_history.add_message("user", prompt)
-            self._chat_history.add_message("assistant", response.text)
+            self._chat_history.add_message("assistant", response_text)
             self._chat_history.save_history()
+        session.context.fit(session.history)
 
-            if response_text:
-                self._chat_history.save_history()
+    def _api_url(self, resource: str, base_url: Optional[str] = None) -> str:
+        """
+        Build the REST URL of an API resource, e.g. 'models/gemini-2.0-flash'.
+        """
+        base_url = base_url or self._config_manager.get_value("api_clients")["gemini"].base_url
+        base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        return f"{base_url}/{API_VERSION}/{resource}"
 
-            return response_text
-        except Exception as e:
-            self._log_manager.log_error("Failed to send request.", error=e)
+    def _model_url(self, model: str, base_url: Optional[str] = None) -> str:
+        """
+        Build the REST resource URL of a model.
+        """
+        return self._api_url(f"models/{model}", base_url)
+
+    def _endpoint(self, model: str, method: str, base_url: Optional[str] = None) -> str:
+        """
+        Build the REST endpoint URL for a model method.
+
+        Args:
+            model (str): The model name.
+            method (str): The API method, e.g. 'generateContent'.
+            base_url (Optional[str]): Override of the configured base URL.
+
+        Returns:
+            str: The endpoint URL.
+        """
+        return f"{self._model_url(model, base_url)}:{method}"
+
+    def _rest_headers(self, base_url: Optional[str] = None) -> Dict[str, str]:
+        """
+        Build the REST request headers. The API key is only sent to the configured Gemini endpoint,
+        never to another host, e.g. a hedging endpoint.
+        """
+        if not self._api_key:
+            return {}
+        if base_url and urlsplit(self._api_url("", base_url))[:2] != urlsplit(self._api_url(""))[:2]:
+            return {}
+        return {"x-goog-api-key": self._api_key}
+
+    def _history_contents(self, session: PooledSession) -> List[Dict]:
+        """
+        Convert the chat session history into the REST 'contents' format.
+        """
+        contents = []
+        for content in session.history:
+            parts = [{"text": part.text} for part in content.parts if part.text]
+            if parts:
+                contents.append({"role": content.role, "parts": parts})
+        return contents
+
+    def _build_contents(self, prompt: str, options: RequestOptions) -> List[Dict]:
+        """
+        Build the REST 'contents' payload from the chat session history and the new prompt.
+        """
+        contents = [] if options.stateless else self._history_contents(self._session(options))
+        parts = [{"text": prompt}]
+        parts += [{"inlineData": {"mimeType": image.mime_type, "data": image.data}} for image in options.images]
+        contents.append({"role": "user", "parts": parts})
+        return contents
 
-    def clear_history(self):
-        self._chat_session.history.clear()
+    def _request_body(self, prompt: str, options: RequestOptions) -> Dict:
+        """
+        Build the REST request body with the contents and the effective generation config.
+        """
+        settings = self.get_generation_settings(options)
+        generation_config = {
+            key: value for key, value in (
+                ("maxOutputTokens", settings.max_output_tokens),
+                ("stopSequences", settings.stop_sequences),
+                ("temperature", settings.temperature),
+            ) if value is not None
+        }
+        body = {"contents": self._build_contents(prompt, options)}
+        if generation_config:
+            body["generationConfig"] = generation_config
+        return body
+
+    def _apply_context_cache(self, body: Dict, prompt: str, model: str, options: RequestOptions,
+                             record: RequestRecord) -> Dict:
+        """
+        Replace the static prompt prefix with a cached context if one is available.
+        Only requests without chat history qualify, as the cached context always precedes the contents.
 
-    def send_request(self, prompt: str, retry_count: int = 0):
+        Returns:
+            Dict: The request body to send, the given body if no cached context is used.
+        """
+        prefix = options.static_prefix
+        if len(body["contents"]) != 1 or not self._context_cache.is_eligible(prefix) \
+                or not prompt.startswith(prefix) or len(prompt) == len(prefix):
+            return body
+        name = self._context_cache.lookup(model, prefix)
+        record.context_cache = "hit" if name else "miss"
+        if not name:
+            return body
+        # Images attached to the prompt follow its text part
+        parts = [{"text": prompt[len(prefix):]}] + body["contents"][0]["parts"][1:]
+        return {
+            **body,
+            "cachedContent": name,
+            "contents": [{"role": "user", "parts": parts}],
+        }
+
+    async def create_cached_content_async(self, model: str, text: str, ttl_seconds: int) -> str:
         """
-        Send a streaming request to the Gemini API.
+        Create a cached content holding a prompt prefix.
 
         Args:
-            prompt (str): The prompt to send.
+            model (str): The model the cached content is used with.
+            text (str): The text to cache.
+            ttl_seconds (int): Lifetime of the cached content.
+
+        Returns:
+            str: Resource name of the cached content, e.g. 'cachedContents/abc'.
+        """
+        response = await self._transport.request(
+            "POST", self._api_url("cachedContents"), headers=self._rest_headers(),
+            json_body={
+                "model": f"models/{model}",
+                "contents": [{"role": "user", "parts": [{"text": text}]}],
+                "ttl": f"{ttl_seconds}s",
+            },
+        )
+        if response.status != 200:
+            raise HTTPStatusError(response.status, response.content, response.headers)
+        return response.json()["name"]
+
+    async def refresh_cached_content_async(self, name: str, ttl_seconds: int):
+        """
+        Extend the lifetime of a cached content to ttl_seconds from now.
+        """
+        response = await self._transport.request(
+            "PATCH", self._api_url(name) + "?updateMask=ttl", headers=self._rest_headers(),
+            json_body={"ttl": f"{ttl_seconds}s"},
+        )
+        if response.status != 200:
+            raise HTTPStatusError(response.status, response.content, response.headers)
+
+    async def delete_cached_content_async(self, name: str):
+        response = await self._transport.request("DELETE", self._api_url(name), headers=self._rest_headers())
+        if response.status not in (200, 404):
+            raise HTTPStatusError(response.status, response.content, response.headers)
+
+    def get_context_cache_stats(self) -> Dict[str, float]:
+        """
+        Returns the cached context lifecycle counters and hit rate.
+        """
+        return self._context_cache.get_stats()
+
+    def get_context_digest(self, session: Optional[str] = None) -> str:
+        """
+        Digest of the chat session history sent along with the next prompt.
+
+        Args:
+            session (Optional[str]): Key of the chat session, the chat window's session if None.
+
+        Returns:
+            str: Hex digest of the current history.
+        """
+        history = self._history_contents(self._session(RequestOptions(session=session)))
+        serialized = json.dumps(history, ensure_ascii=False)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def add_to_history(self, prompt: str, response_text: str, session: Optional[str] = None):
+        """
+        Record an exchange that was answered without calling the API.
+        """
+        self._record_exchange(prompt, response_text, RequestOptions(session=session))
+
+    def _record_exchange(self, prompt: str, response_text: str, options: RequestOptions):
+        """
+        Append a completed async exchange to the chat session and the local chat history.
+        """
+        if options.stateless:
+            return
+        session = self._session(options)
+        session.history.extend([
+            genai.protos.Content(role="user", parts=[genai.protos.Part(text=prompt)]),
+            genai.protos.Content(role="model", parts=[genai.protos.Part(text=response_text)]),
+        ])
+        self._save_to_chat_history(prompt, response_text, session)
+
+    @staticmethod
+    def _extract_text(payload: Dict) -> str:
+        """
+        Extract the text of the first candidate from a GenerateContentResponse.
+        """
+        candidates = payload.get("candidates") or []
+        if not candidates:
+            return ""
+        parts = (candidates[0].get("content") or {}).get("parts") or []
+        return "".join(part.get("text", "") for part in parts)
+
+    async def _stream_contents_async(
+        self, model: str, body: Dict, base_url: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a generation over the pooled transport using the server-sent event protocol.
+
+        Args:
+            model (str): The model name.
+            body (Dict): The REST request body.
+            base_url (Optional[str]): Override of the configured base URL.
 
         Yields:
-            str: Chunks of the response as they are generated.
+            str: Text chunks as they arrive.
         """
-        if not genai:
-            self._log_manager.log_error("Gemini client not initialized.")
-            return None
-        try:
-            response = self._chat_session.send_message(prompt, stream=True)
-            self._cancel_flag = False
-
-            # Process and yield each chunk
-            result = ""
-            for chunk in response:
-                if self._cancel_flag:  # Stop processing if canceled
-                    response.resolve()
-                    break
-                text_chunk = chunk.text  # Extract text from the chunk
+        url = self._endpoint(model, "streamGenerateContent", base_url) + "?alt=sse"
+        async with self._transport.stream(
+            "POST", url, headers=self._rest_headers(base_url), json_body=body
+        ) as response:
+            if response.status != 200:
+                raise HTTPStatusError(response.status, await response.read(), response.headers)
+            async for data in response.iter_sse():
+                text_chunk = self._extract_text(json.loads(data))
                 if text_chunk:
-                    yield text_chunk  # Yield each chunk for real-time processing
+                    yield text_chunk
 
-            if not self._cancel_flag:
-                # Optionally log or save to chat history
-                self._chat_history.add_message("user", prompt)
-                self._chat_history.add_message("assistant", response.text)
-                self._chat_history.save_history()
+    def _hedging_active(self) -> bool:
+        hedging = self._config_manager.get_value("hedging")
+        return hedging.enabled and bool(hedging.secondary_model or hedging.secondary_base_url)
 
-        except Exception as e:
-            self._log_manager.log_error("Failed to send streaming request.", error=e)
-            raise
+    def _stream_generation_async(self, prompt: str, body: Dict, options: RequestOptions,
+                                 secondary_body: Optional[Dict] = None) -> AsyncIterator[str]:
+        """
+        Stream a generation, hedging it against the secondary model or endpoint if configured.
+        secondary_body is sent to the secondary instead of body, e.g. without a model-bound cached context.
+        """
+        model = self._get_model_name(options)
+        if not self._hedging_active():
+            return self._stream_contents_async(model, body)
+        hedging = self._config_manager.get_value("hedging")
+        return self._hedger.stream(
+            lambda: self._stream_contents_async(model, body),
+            lambda: self._stream_hedge_async(
+                prompt, hedging.secondary_model or model, secondary_body or body, options, hedging.secondary_base_url
+            ),
+            hedging.delay_ms / 1000,
+        )
+
+    async def _stream_hedge_async(self, prompt: str, model: str, body: Dict, options: RequestOptions,
+                                  base_url: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Stream the hedged secondary request. It is admitted like any other request, by the circuit
+        breaker, its lane and the rate limiter of its model, and recorded in the telemetry on its own.
+        A secondary endpoint serving the same model shares that model's circuit and rate limit.
+
+        Args:
+            prompt (str): The prompt text.
+            model (str): The secondary model.
+            body (Dict): The REST request body.
+            options (RequestOptions): Settings of the primary request.
+            base_url (Optional[str]): The secondary endpoint, the configured base URL if None.
+
+        Yields:
+            str: Text chunks as they arrive.
+        """
+        key = self._rate_limit_key(model)
+        if not self._breaker.allow(key):
+            raise CircuitOpenError(key)
+        # A token of its own, so the hedge is tracked as a request rather than as a retry of the primary
+        token = CancellationToken()
+        remaining = options.cancellation.remaining() if options.cancellation else None
+        if remaining is not None:
+            token.set_timeout(remaining)
+        hedge_options = replace(options, model=model, cancellation=token, static_prefix=None, failover=False)
+        async with self._track_request(prompt, model, hedge_options) as record:
+            await self.acquire_rate_limit_async(model, prompt, options.priority)
+            async for text_chunk in self._stream_contents_async(model, body, base_url):
+                record.add_output(text_chunk)
+                yield text_chunk
+
+    def get_hedging_stats(self) -> Dict[str, int]:
+        """
+        Returns how many requests were hedged and how often the hedge won.
+        """
+        return self._hedger.get_stats()
+
+    async def _stream_response_async(
+        self, prompt: str, model: str, options: RequestOptions, record: RequestRecord
+    ) -> AsyncIterator[str]:
+        """
+        Send one streaming generateContent request, hedged if enabled, and yield its text chunks.
+        """
+        body = self._request_body(prompt, options)
+        request_body = self._apply_context_cache(body, prompt, model, options, record)
+        started, was_warm, first = time.monotonic(), self._is_warm(), True
+        async for text_chunk in self._stream_generation_async(prompt, request_body, options, body):
+            if first:
+                self._record_first_response(started, was_warm)
+                first = False
+            yield text_chunk
+
+    async def _generate_async(self, prompt: str, model: str, options: RequestOptions, record: RequestRecord) -> str:
+        """
+        Send one generateContent request and return the response text.
+        With hedging enabled the response is streamed, as only streamed requests are hedged.
+        """
+        if self._hedging_active():
+            chunks = [text_chunk async for text_chunk in self._stream_response_async(prompt, model, options, record)]
+            return "".join(chunks)
+
+        body = self._request_body(prompt, options)
+        request_body = self._apply_context_cache(body, prompt, model, options, record)
+        started, was_warm = time.monotonic(), self._is_warm()
+        response = await self._transport.request(
+            "POST",
+            self._endpoint(model, "generateContent"),
+            headers=self._rest_headers(),
+            json_body=request_body,
+        )
+        if response.status != 200:
+            raise HTTPStatusError(response.status, response.content, response.headers)
+        self._record_first_response(started, was_warm)
+        return self._extract_text(response.json())
+
+    async def _retry_options_async(self, error: HTTPStatusError, retry_count: int, model: str,
+                                   options: RequestOptions, record: RequestRecord) -> Optional[RequestOptions]:
+        """
+        Resend a request whose cached context was rejected, e.g. because it expired, with the full prompt.
+        """
+        if options.static_prefix and record.context_cache == "hit" and error.status in REJECTED_STATUSES:
+            self._context_cache.invalidate(model, options.static_prefix)
+            return replace(options, static_prefix=None)
+        return await super()._retry_options_async(error, retry_count, model, options, record)
 
     def get_available_models(self) -> List[str]:
         """
@@ -173,3 +588,27 @@ class GeminiClient(BaseAPIClient):
             self._log_manager.log_error("Failed to get available models.", error=e)
 
         return []
+
+    def get_model_details(self) -> List[Dict]:
+        """
+        Get available Gemini models together with their metadata.
+
+        Returns:
+            List[Dict]: Model name, display name, token limits and supported generation methods.
+
+        Raises:
+            Exception: If the models could not be listed.
+        """
+        return sorted(
+            (
+                {
+                    "name": model.name.split("/")[-1],
+                    "displayName": model.display_name,
+                    "inputTokenLimit": model.input_token_limit,
+                    "outputTokenLimit": model.output_token_limit,
+                    "supportedGenerationMethods": list(model.supported_generation_methods),
+                }
+                for model in genai.list_models()
+            ),
+            key=lambda details: details["name"],
+        )
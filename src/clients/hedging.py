@@ -0,0 +1,112 @@
+import asyncio
+from contextlib import suppress
+from threading import Lock
+from typing import AsyncIterator, Callable, Dict
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.utils.log_manager import LogManager
+
+StreamFactory = Callable[[], AsyncIterator[str]]
+
+
+class RequestHedger:
+    """
+    Races a backup request against a slow primary one to cut tail latency.
+    If the primary stream has not produced its first chunk within the hedge delay, the same
+    request is sent to a secondary model or endpoint. Whichever stream yields first is
+    consumed and the other one is cancelled, which aborts its connection.
+    """
+
+    def __init__(self):
+        self._log_manager = LogManager.get_instance()
+        self._lock = Lock()
+        self._stats = {"requests": 0, "hedges_fired": 0, "hedges_won": 0}
+
+    async def stream(self, primary: StreamFactory, secondary: StreamFactory,
+                     delay_seconds: float) -> AsyncIterator[str]:
+        """
+        Stream from whichever of the two requests answers first.
+
+        Args:
+            primary (StreamFactory): Creates the primary chunk stream.
+            secondary (StreamFactory): Creates the backup chunk stream.
+            delay_seconds (float): How long to wait for the primary's first chunk before hedging.
+
+        Yields:
+            str: Chunks of the winning stream.
+        """
+        self._count("requests")
+        streams = {"primary": primary()}
+        tasks = {"primary": asyncio.ensure_future(streams["primary"].__anext__())}
+        winner = None
+        try:
+            done, _ = await asyncio.wait({tasks["primary"]}, timeout=delay_seconds)
+            if done:
+                winner = "primary"
+            else:
+                self._count("hedges_fired")
+                self._log_manager.log_info(
+                    f"No first chunk after {delay_seconds * 1000:.0f} ms, hedging request."
+                )
+                streams["secondary"] = secondary()
+                tasks["secondary"] = asyncio.ensure_future(streams["secondary"].__anext__())
+                winner = await self._first_successful(tasks)
+                loser = "primary" if winner == "secondary" else "secondary"
+                await self._discard(tasks.pop(loser), streams.pop(loser))
+                if winner == "secondary":
+                    self._count("hedges_won")
+                    self._log_manager.log_info("Hedged request won the race.")
+
+            try:
+                first_chunk = tasks[winner].result()
+            except StopAsyncIteration:
+                return
+            yield first_chunk
+            async for chunk in streams[winner]:
+                yield chunk
+        finally:
+            for name, task in tasks.items():
+                if name != winner or not task.done():
+                    await self._discard(task, streams[name])
+            if winner is not None:
+                await streams[winner].aclose()
+
+    @staticmethod
+    async def _first_successful(tasks: Dict[str, asyncio.Future]) -> str:
+        """
+        Wait for the first task to produce a chunk; re-raise only if both fail.
+        """
+        pending = set(tasks.values())
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None or isinstance(task.exception(), StopAsyncIteration):
+                    return next(name for name, candidate in tasks.items() if candidate is task)
+                error = task.exception()
+        raise error
+
+    @staticmethod
+    async def _discard(task: asyncio.Future, stream: AsyncIterator[str]):
+        """
+        Cancel the losing request and close its stream.
+        """
+        task.cancel()
+        with suppress(asyncio.CancelledError, Exception):
+            await task
+        with suppress(Exception):
+            await stream.aclose()
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Returns how many requests were hedged and how often the hedge won.
+        """
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,139 @@
+import time
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Dict, List, Optional
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.utils.config_manager import ConfigManager
+from src.utils.log_manager import LogManager
+from src.utils.telemetry_store import RequestRecord, TelemetryStore
+from src.clients.rate_limiter import estimate_tokens
+from src.clients.request_options import RequestOptions
+
+# Telemetry of this many past days seeds the latency estimates on startup
+SEED_DAYS = 1
+
+
+class ModelRouter:
+    """
+    Picks the model of each request from the routing rules.
+    Rules match on prompt id and estimated input tokens; the models of all matching rules,
+    followed by the provider's default model, are the candidates in order of preference.
+    If the prompt has a latency target, the first candidate whose observed latency meets it is used.
+    Latencies are learned online as an exponentially weighted moving average per model.
+    """
+
+    def __init__(self, api_client):
+        """
+        Args:
+            api_client: The BaseAPIClient whose requests are routed.
+        """
+        self._log_manager = LogManager.get_instance()
+        self._config_manager = ConfigManager.get_instance()
+        self._api_client = api_client
+        self._lock = Lock()
+        self._latency_ms: Dict[str, float] = {}
+        self._routed: Dict[str, int] = {}
+        # Latencies per provider from the telemetry; the client only knows its provider once initialized
+        self._seeds: Dict[str, Dict[str, float]] = {}
+        settings = self._config_manager.get_value("routing")
+        if settings.enabled and settings.learn_latency:
+            self._seeds = self._read_telemetry()
+
+    def _read_telemetry(self) -> Dict[str, Dict[str, float]]:
+        seeds: Dict[str, Dict[str, float]] = {}
+        try:
+            since = datetime.now() - timedelta(days=SEED_DAYS)
+            for entry in TelemetryStore.get_instance().iter_records(since):
+                if entry.get("outcome") == "ok" and "duration_ms" in entry and entry.get("model"):
+                    # Other providers may serve a model of the same name at a different speed
+                    latencies = seeds.setdefault(entry.get("provider"), {})
+                    latencies[entry["model"]] = self._average(latencies.get(entry["model"]), entry["duration_ms"])
+        except Exception as e:
+            self._log_manager.log_error("Failed to seed model latencies from telemetry.", error=e)
+        return seeds
+
+    def _average(self, previous: Optional[float], duration_ms: float) -> float:
+        alpha = self._config_manager.get_value("routing").ewma_alpha
+        return duration_ms if previous is None else alpha * duration_ms + (1 - alpha) * previous
+
+    def _apply_seeds(self):
+        """
+        Start from the latencies the telemetry recorded for the client's provider. Must be called with the lock held.
+        """
+        if self._seeds:
+            seeds = self._seeds.get(self._api_client.name, {})
+            self._seeds = {}
+            for model, latency_ms in seeds.items():
+                self._latency_ms.setdefault(model, latency_ms)
+
+    def _update(self, model: str, duration_ms: float):
+        with self._lock:
+            self._apply_seeds()
+            self._latency_ms[model] = self._average(self._latency_ms.get(model), duration_ms)
+
+    def observe(self, record: RequestRecord):
+        """
+        Learn from a request that has just finished.
+        """
+        settings = self._config_manager.get_value("routing")
+        if not (settings.enabled and settings.learn_latency) or record.outcome != "ok":
+            return
+        self._update(record.model, (time.monotonic() - record.started) * 1000)
+
+    def _candidates(self, prompt: str, options: RequestOptions, default_model: str) -> List[str]:
+        tokens = estimate_tokens(prompt)
+        candidates = []
+        for rule in self._config_manager.get_value("routing").rules:
+            if rule.prompt_ids and options.prompt_id not in rule.prompt_ids:
+                continue
+            if tokens < rule.min_input_tokens or (rule.max_input_tokens is not None and tokens > rule.max_input_tokens):
+                continue
+            if rule.model not in candidates:
+                candidates.append(rule.model)
+        if default_model not in candidates:
+            candidates.append(default_model)
+        return candidates
+
+    def route(self, prompt: str, options: RequestOptions, default_model: str) -> str:
+        """
+        Pick the model of a request.
+
+        Args:
+            prompt (str): The prompt text.
+            options (RequestOptions): Per-request settings; an explicit options.model is kept.
+            default_model (str): The provider's configured model.
+
+        Returns:
+            str: The model to send the request to.
+        """
+        settings = self._config_manager.get_value("routing")
+        if options.model or not settings.enabled:
+            return options.model or default_model
+
+        candidates = self._candidates(prompt, options, default_model)
+        model = candidates[0]
+        target = options.generation.latency_target_ms if options.generation else None
+        if target and settings.learn_latency:
+            with self._lock:
+                self._apply_seeds()
+                # Unmeasured models are assumed to meet the target until they are observed
+                meeting = [candidate for candidate in candidates
+                           if self._latency_ms.get(candidate, 0.0) <= target]
+                model = meeting[0] if meeting else min(candidates, key=lambda candidate: self._latency_ms[candidate])
+
+        with self._lock:
+            self._routed[model] = self._routed.get(model, 0) + 1
+        if model != default_model:
+            self._log_manager.log_info(f"Routed request of prompt {options.prompt_id} to {model}.")
+        return model
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the number of requests routed to each model and the learned latency per model in ms.
+        """
+        with self._lock:
+            return {"routed": dict(self._routed), "latency_ms": dict(self._latency_ms)}
@@ -0,0 +1,305 @@
+import hashlib
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.clients.base_api_client import BaseAPIClient
+from src.clients.async_transport import AsyncHTTPTransport, EventLoopThread, HTTPStatusError
+from src.clients.request_options import RequestOptions
+from src.clients.session_pool import CHAT_SESSION, ChatSessionPool, PooledSession
+from src.utils.model_catalogue import ModelCatalogue
+from src.utils.telemetry_store import RequestRecord
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+# History entries use the Gemini role names, which the chat context manager relies on
+ROLES = {"user": "user", "model": "assistant"}
+
+
+@dataclass(slots=True)
+class _Part:
+    text: str
+
+
+@dataclass(slots=True)
+class _Content:
+    role: str
+    parts: List[_Part]
+
+
+@dataclass(slots=True)
+class _Chat:
+    history: List[_Content] = field(default_factory=list)
+
+
+class OpenAIClient(BaseAPIClient):
+    """
+    Singleton client for the OpenAI chat completions API and OpenAI-compatible servers,
+    e.g. a self-hosted inference server on localhost or the LAN configured as base URL.
+    """
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @staticmethod
+    def check_api_key(api_key: str, base_url: Optional[str] = None) -> Optional[bool]:
+        """
+        Check an API key by listing the models, which does not consume generation quota.
+
+        Args:
+            api_key (str): The API key to check.
+            base_url (Optional[str]): Base URL of the API, the OpenAI API if None.
+
+        Returns:
+            Optional[bool]: True if valid, False if rejected, None if the check could not complete.
+        """
+        url = f"{(base_url or DEFAULT_BASE_URL).rstrip('/')}/models"
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        try:
+            response = EventLoopThread.get_instance().run(
+                AsyncHTTPTransport().request("GET", url, headers=headers), timeout=10
+            )
+        except Exception:
+            return None
+        if response.status in (401, 403):
+            return False
+        return True if response.status == 200 else None
+
+    @staticmethod
+    def validate_api_key(api_key: str) -> bool:
+        """
+        Validate an OpenAI API key.
+
+        Args:
+            api_key (str): The API key to validate.
+
+        Returns:
+            bool: True if valid, False otherwise.
+        """
+        return OpenAIClient.check_api_key(api_key) is True
+
+    def __init__(self):
+        if hasattr(self, "_initialized"):
+            return
+        super().__init__()
+        self._initialized = True
+        self._sessions = ChatSessionPool(
+            self,
+            lambda model, history: _Chat(history),
+            lambda role, text: _Content(role, [_Part(text)]),
+        )
+        self._initialize_client()
+
+    def _initialize_client(self):
+        """Initialize the client with the API key and start the chat sessions."""
+        try:
+            self.name = "openai"
+            # Self-hosted servers usually do not require a key
+            self._api_key = self._credential_manager.get_api_key("openai")
+            self._start_chat_sessions()
+            self.rewarm("startup")
+            self._log_manager.log_info("OpenAI client configured successfully.")
+        except Exception as e:
+            self._log_manager.log_error("Failed to initialize OpenAI client.", error=e)
+            raise
+
+    def _start_chat_sessions(self):
+        """
+        Start a new pool of chat sessions, each created on its first request.
+        """
+        self._sessions.reset()
+
+    def rewarm(self, reason: str = "idle"):
+        """
+        Open a pooled keep-alive connection in the background with a cheap metadata call.
+
+        Args:
+            reason (str): Why the warm-up was triggered, used for logging.
+        """
+        if not self._config_manager.get_value("warmup").enabled:
+            return
+        self._event_loop.submit(self._warm_async(reason))
+
+    async def _warm_async(self, reason: str):
+        started = time.monotonic()
+        try:
+            await self._transport.request("GET", self._url("models"), headers=self._headers())
+            self._log_manager.log_info(
+                f"OpenAI client warmed ({reason}) in {(time.monotonic() - started) * 1000:.0f} ms."
+            )
+        except Exception as e:
+            self._log_manager.log_error("Failed to warm up OpenAI client.", error=e)
+
+    def _url(self, path: str) -> str:
+        """
+        Build the URL of an API path, e.g. 'chat/completions'.
+        """
+        base_url = self._config_manager.get_value("api_clients")["openai"].base_url
+        return f"{(base_url or DEFAULT_BASE_URL).rstrip('/')}/{path}"
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self._api_key}"} if self._api_key else {}
+
+    def clear_history(self, session: Optional[str] = None):
+        """
+        Clear the history of a chat session.
+
+        Args:
+            session (Optional[str]): Key of the session, the chat window's session if None.
+        """
+        self._sessions.clear(session or CHAT_SESSION)
+
+    def get_session_pool_stats(self) -> Dict[str, int]:
+        """
+        Returns the number of pooled chat sessions and how often sessions were created, reused and evicted.
+        """
+        return self._sessions.get_stats()
+
+    def _session(self, options: RequestOptions) -> PooledSession:
+        """
+        Get the pooled chat session of a request.
+        """
+        return self._sessions.get(options.session or CHAT_SESSION, self._get_model_name(options))
+
+    def _history_messages(self, session: PooledSession) -> List[Dict]:
+        """
+        Convert the chat session history into chat completion messages.
+        """
+        return [
+            {"role": ROLES[content.role], "content": "".join(part.text for part in content.parts)}
+            for content in session.history
+        ]
+
+    def _request_body(self, prompt: str, model: str, options: RequestOptions, stream: bool) -> Dict:
+        """
+        Build the chat completion request body with the messages and the effective generation settings.
+        """
+        messages = [] if options.stateless else self._history_messages(self._session(options))
+        if options.images:
+            content = [{"type": "text", "text": prompt}] + [
+                {"type": "image_url", "image_url": {"url": f"data:{image.mime_type};base64,{image.data}"}}
+                for image in options.images
+            ]
+            messages.append({"role": "user", "content": content})
+        else:
+            messages.append({"role": "user", "content": prompt})
+        settings = self.get_generation_settings(options)
+        body = {"model": model, "messages": messages, "stream": stream}
+        for key, value in (
+            ("max_tokens", settings.max_output_tokens),
+            ("stop", settings.stop_sequences),
+            ("temperature", settings.temperature),
+        ):
+            if value is not None:
+                body[key] = value
+        return body
+
+    def get_context_digest(self, session: Optional[str] = None) -> str:
+        """
+        Digest of the chat session history sent along with the next prompt.
+
+        Args:
+            session (Optional[str]): Key of the chat session, the chat window's session if None.
+
+        Returns:
+            str: Hex digest of the current history.
+        """
+        history = self._history_messages(self._session(RequestOptions(session=session)))
+        serialized = json.dumps(history, ensure_ascii=False)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def add_to_history(self, prompt: str, response_text: str, session: Optional[str] = None):
+        """
+        Record an exchange that was answered without calling the API.
+        """
+        self._record_exchange(prompt, response_text, RequestOptions(session=session))
+
+    def _record_exchange(self, prompt: str, response_text: str, options: RequestOptions):
+        """
+        Append a completed exchange to the chat session and, for the chat window's session,
+        to the local chat history.
+        """
+        if options.stateless:
+            return
+        session = self._session(options)
+        session.history.extend([
+            _Content("user", [_Part(prompt)]),
+            _Content("model", [_Part(response_text)]),
+        ])
+        if session.key == CHAT_SESSION:
+            self._chat_history.add_message("user", prompt)
+            self._chat_history.add_message("assistant", response_text)
+            self._chat_history.save_history()
+        session.context.fit(session.history)
+
+    async def _stream_response_async(
+        self, prompt: str, model: str, options: RequestOptions, record: RequestRecord
+    ) -> AsyncIterator[str]:
+        """
+        Send one streaming chat completion request and yield the text of its server-sent events.
+        """
+        body = self._request_body(prompt, model, options, stream=True)
+        async with self._transport.stream(
+            "POST", self._url("chat/completions"), headers=self._headers(), json_body=body
+        ) as response:
+            if response.status != 200:
+                raise HTTPStatusError(response.status, await response.read(), response.headers)
+            # Read past [DONE] to the end of the body, so the connection goes back to the pool
+            async for data in response.iter_sse():
+                if data.strip() == "[DONE]":
+                    continue
+                choices = json.loads(data).get("choices") or []
+                text_chunk = (choices[0].get("delta") or {}).get("content") if choices else None
+                if text_chunk:
+                    yield text_chunk
+
+    async def _generate_async(self, prompt: str, model: str, options: RequestOptions, record: RequestRecord) -> str:
+        """
+        Send one chat completion request and return the response text.
+        """
+        body = self._request_body(prompt, model, options, stream=False)
+        response = await self._transport.request(
+            "POST", self._url("chat/completions"), headers=self._headers(), json_body=body
+        )
+        if response.status != 200:
+            raise HTTPStatusError(response.status, response.content, response.headers)
+        choices = response.json().get("choices") or []
+        return ((choices[0].get("message") or {}).get("content") or "") if choices else ""
+
+    def get_available_models(self) -> List[str]:
+        """
+        Get a list of the models served by the API from the model catalogue without waiting for the network.
+        A missing or stale catalogue is refreshed in the background.
+
+        Returns:
+            List[str]: List of model names, empty until the first refresh finished.
+        """
+        return sorted(ModelCatalogue.get_instance().get_model_names(self))
+
+    def get_model_details(self) -> List[Dict]:
+        """
+        Fetch the models served by the API. Blocks until the response arrived, so it is only
+        called from the model catalogue's refresh thread.
+
+        Returns:
+            List[Dict]: One dictionary per model with its name.
+
+        Raises:
+            Exception: If the models could not be listed.
+        """
+        response = self.run_async(
+            self._transport.request("GET", self._url("models"), headers=self._headers()), timeout=30
+        )
+        if response.status != 200:
+            raise HTTPStatusError(response.status, response.content, response.headers)
+        return sorted(({"name": model["id"]} for model in response.json().get("data") or []),
+                      key=lambda details: details["name"])
@@ -0,0 +1,381 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from threading import Lock, Timer
+from typing import Callable, Deque, Dict, List, Optional
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.utils.log_manager import LogManager
+from src.clients.request_options import LANE_NAMES, RequestPriority
+
+# Exponential backoff bounds for retries after 429/503 responses
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 32.0
+# HTTP statuses that are retried after a backoff delay
+RETRYABLE_STATUSES = (429, 503)
+# Rough characters per token, used to estimate the TPM cost of a prompt before sending it
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text without calling a tokenizer.
+    """
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def backoff_delay(retry_count: int, retry_after: Optional[float] = None) -> float:
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        retry_count (int): Number of retries already made.
+        retry_after (Optional[float]): Server supplied Retry-After value in seconds, used as lower bound.
+
+    Returns:
+        float: Seconds to wait before the next attempt.
+    """
+    delay = random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** retry_count))
+    return max(delay, retry_after or 0.0)
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at `capacity` tokens per minute.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self._tokens = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def time_until(self, amount: float, now: float) -> float:
+        """
+        Seconds until `amount` tokens are available, 0 if they are available now.
+        """
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) / self._rate
+
+    def consume(self, amount: float):
+        self._tokens -= min(amount, self.capacity)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    tokens: int = field(compare=False)
+    wake: Callable[[], None] = field(compare=False)
+    enqueued: float = field(compare=False)
+    share: float = field(default=1.0, compare=False)
+
+
+class _LimitState:
+    """
+    Buckets and queue of a single provider/model pair.
+    """
+
+    def __init__(self, rpm: Optional[int], tpm: Optional[int]):
+        self.buckets: List[tuple] = []
+        if rpm:
+            self.buckets.append(("requests", TokenBucket(rpm)))
+        if tpm:
+            self.buckets.append(("tokens", TokenBucket(tpm)))
+        self.limits = (rpm, tpm)
+        self.queue: List[_Waiter] = []
+        self.paused_until = 0.0
+        self.timer: Optional[Timer] = None
+        self.granted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.throttled = 0
+
+    def time_until(self, waiter: _Waiter, now: float) -> float:
+        delay = max(0.0, self.paused_until - now)
+        for kind, bucket in self.buckets:
+            # Lanes with a share below 1 leave the rest of the bucket to the lanes above them
+            reserve = (1.0 - min(1.0, max(0.0, waiter.share))) * bucket.capacity
+            amount = 1 if kind == "requests" else waiter.tokens
+            delay = max(delay, bucket.time_until(amount + reserve, now))
+        return delay
+
+    def consume(self, waiter: _Waiter):
+        for kind, bucket in self.buckets:
+            bucket.consume(1 if kind == "requests" else waiter.tokens)
+
+
+@dataclass(slots=True)
+class _LaneState:
+    """
+    Concurrency slots and wait statistics of a lane.
+    """
+    in_flight: int = 0
+    waiters: Deque[asyncio.Future] = field(default_factory=deque)
+    admitted: int = 0
+    slot_wait: float = 0.0
+    max_slot_wait: float = 0.0
+    rate_granted: int = 0
+    rate_wait: float = 0.0
+    max_rate_wait: float = 0.0
+
+
+class RateLimiter:
+    """
+    Singleton client-side rate limiter shared by all API clients.
+    Requests are admitted through per-model RPM/TPM token buckets in priority order, so
+    interactive chat and hotkey requests overtake queued bulk work. Each priority is a lane
+    (hotkey, chat, background) with a cap on its requests in flight and a share of the buckets:
+    a lane with share s is only admitted while more than (1 - s) of a bucket is left, so when
+    the quota gets tight the lower lanes are held back first and the rest stays available to
+    the lanes above them. A 429 or 503 response pauses admission for the affected model until
+    the backoff delay has passed.
+    Limits are opt-in: a model without an entry in its provider's rate_limits is admitted at
+    once and only throttled after the provider rejected a request.
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = RateLimiter()
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self._log_manager = LogManager.get_instance()
+        self._lock = Lock()
+        self._states: Dict[str, _LimitState] = {}
+        self._lanes: Dict[int, _LaneState] = {}
+        self._sequence = itertools.count()
+
+        self._log_manager.log_info("RateLimiter initialized")
+
+    def _get_state(self, key: str, rpm: Optional[int], tpm: Optional[int]) -> _LimitState:
+        state = self._states.get(key)
+        if state is None or state.limits != (rpm, tpm):
+            previous = state
+            state = _LimitState(rpm, tpm)
+            if previous is not None:  # Limits changed in the settings, keep queued requests
+                state.queue = previous.queue
+                state.paused_until = previous.paused_until
+                if previous.timer:
+                    previous.timer.cancel()
+            self._states[key] = state
+        return state
+
+    def _is_unrestricted(self, key: str, rpm: Optional[int], tpm: Optional[int]) -> bool:
+        if rpm or tpm:
+            return False
+        with self._lock:
+            state = self._states.get(key)
+            return state is None or (state.paused_until <= time.monotonic() and not state.queue)
+
+    def _enqueue(self, key: str, rpm: Optional[int], tpm: Optional[int], tokens: int,
+                 priority: int, wake: Callable[[], None], share: float = 1.0) -> _Waiter:
+        waiter = _Waiter(priority, next(self._sequence), tokens, wake, time.monotonic(), share)
+        with self._lock:
+            state = self._get_state(key, rpm, tpm)
+            heapq.heappush(state.queue, waiter)
+            self._dispatch(key, state)
+        return waiter
+
+    def _dispatch(self, key: str, state: _LimitState):
+        """
+        Admit queued requests in priority order while the buckets allow it.
+        Must be called with the lock held.
+        """
+        if state.timer:
+            state.timer.cancel()
+            state.timer = None
+        while state.queue:
+            now = time.monotonic()
+            waiter = state.queue[0]
+            delay = state.time_until(waiter, now)
+            if delay > 0:
+                state.timer = Timer(delay, self._redispatch, args=(key,))
+                state.timer.daemon = True
+                state.timer.start()
+                return
+            heapq.heappop(state.queue)
+            state.consume(waiter)
+            waited = now - waiter.enqueued
+            state.granted += 1
+            state.total_wait += waited
+            state.max_wait = max(state.max_wait, waited)
+            lane = self._lanes.setdefault(waiter.priority, _LaneState())
+            lane.rate_granted += 1
+            lane.rate_wait += waited
+            lane.max_rate_wait = max(lane.max_rate_wait, waited)
+            waiter.wake()
+
+    def _redispatch(self, key: str):
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None:
+                state.timer = None
+                self._dispatch(key, state)
+
+    def _withdraw(self, key: str, waiter: _Waiter):
+        """
+        Remove a waiter that gave up, e.g. because its request was cancelled.
+        """
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None and waiter in state.queue:
+                state.queue.remove(waiter)
+                heapq.heapify(state.queue)
+                self._dispatch(key, state)
+
+    async def acquire_async(self, key: str, rpm: Optional[int], tpm: Optional[int], tokens: int = 1,
+                            priority: int = RequestPriority.INTERACTIVE, share: float = 1.0):
+        """
+        Wait on the running event loop until a request may be sent.
+        Cancelling the awaiting task withdraws the request from the queue.
+
+        Args:
+            key (str): Limit key, usually '<provider>:<model>'.
+            rpm (Optional[int]): Requests per minute, None for unlimited.
+            tpm (Optional[int]): Tokens per minute, None for unlimited.
+            tokens (int): Estimated tokens of the request.
+            priority (int): A RequestPriority value.
+            share (float): Share of the buckets the request's lane may use.
+        """
+        if self._is_unrestricted(key, rpm, tpm):
+            return
+        loop = asyncio.get_running_loop()
+        admitted = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: admitted.done() or admitted.set_result(None))
+
+        waiter = self._enqueue(key, rpm, tpm, tokens, priority, wake, share)
+        try:
+            await admitted
+        except asyncio.CancelledError:
+            self._withdraw(key, waiter)
+            raise
+
+    async def enter_lane_async(self, priority: int, max_concurrent: Optional[int]):
+        """
+        Wait until the lane of a priority has a free slot for another request in flight.
+        Every entered lane must be left with leave_lane(). Must be used on the shared event loop only.
+
+        Args:
+            priority (int): A RequestPriority value.
+            max_concurrent (Optional[int]): Maximum requests of the lane in flight, None for unlimited.
+        """
+        started = time.monotonic()
+        with self._lock:
+            lane = self._lanes.setdefault(priority, _LaneState())
+            if max_concurrent is None or (lane.in_flight < max_concurrent and not lane.waiters):
+                lane.in_flight += 1
+                self._record_slot_wait(lane, 0.0)
+                return
+            admitted = asyncio.get_running_loop().create_future()
+            lane.waiters.append(admitted)
+        try:
+            await admitted
+        except asyncio.CancelledError:
+            with self._lock:
+                handed_over = admitted not in lane.waiters
+                if not handed_over:
+                    lane.waiters.remove(admitted)
+            if handed_over and admitted.done() and not admitted.cancelled():
+                # The slot was handed over just before the cancellation, pass it on
+                self.leave_lane(priority)
+            raise
+        with self._lock:
+            self._record_slot_wait(lane, time.monotonic() - started)
+
+    def leave_lane(self, priority: int):
+        """
+        Release the slot of a request that entered the lane of a priority, handing it to the next waiting request.
+        """
+        with self._lock:
+            lane = self._lanes.setdefault(priority, _LaneState())
+            while lane.waiters:
+                waiter = lane.waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+            lane.in_flight = max(0, lane.in_flight - 1)
+
+    @staticmethod
+    def _record_slot_wait(lane: _LaneState, waited: float):
+        lane.admitted += 1
+        lane.slot_wait += waited
+        lane.max_slot_wait = max(lane.max_slot_wait, waited)
+
+    def report_throttled(self, key: str, retry_count: int, retry_after: Optional[float] = None) -> float:
+        """
+        Record a 429/503 response and pause admission for the key.
+
+        Args:
+            key (str): Limit key of the throttled request.
+            retry_count (int): Number of retries already made for the request.
+            retry_after (Optional[float]): Server supplied Retry-After value in seconds.
+
+        Returns:
+            float: Seconds the caller should wait before retrying.
+        """
+        delay = backoff_delay(retry_count, retry_after)
+        with self._lock:
+            state = self._states.setdefault(key, _LimitState(None, None))
+            state.throttled += 1
+            state.paused_until = max(state.paused_until, time.monotonic() + delay)
+            self._dispatch(key, state)
+        self._log_manager.log_warning(f"Rate limited on {key}, retrying in {delay:.1f} s.")
+        return delay
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns queue depth, admitted requests, wait times and throttled responses per key.
+        """
+        with self._lock:
+            return {
+                key: {
+                    "queue_depth": len(state.queue),
+                    "granted": state.granted,
+                    "avg_wait_ms": state.total_wait / state.granted * 1000 if state.granted else 0.0,
+                    "max_wait_ms": state.max_wait * 1000,
+                    "throttled": state.throttled,
+                }
+                for key, state in self._states.items()
+            }
+
+    def get_lane_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns requests in flight and queued per lane, with the time spent waiting for a lane slot
+        and for the rate limit, to tune the lane caps and shares.
+        """
+        with self._lock:
+            return {
+                LANE_NAMES.get(priority, str(priority)): {
+                    "in_flight": lane.in_flight,
+                    "queued": len(lane.waiters),
+                    "admitted": lane.admitted,
+                    "avg_slot_wait_ms": lane.slot_wait / lane.admitted * 1000 if lane.admitted else 0.0,
+                    "max_slot_wait_ms": lane.max_slot_wait * 1000,
+                    "avg_rate_wait_ms": lane.rate_wait / lane.rate_granted * 1000 if lane.rate_granted else 0.0,
+                    "max_rate_wait_ms": lane.max_rate_wait * 1000,
+                }
+                for priority, lane in sorted(self._lanes.items())
+            }
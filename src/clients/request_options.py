@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.clients.cancellation import CancellationToken
+from src.utils.dataclasses import GenerationSettings
+from src.utils.image_encoder import EncodedImage
+
+
+class RequestPriority:
+    """
+    Rate limiter lanes in admission priority; lower values are served first.
+    """
+    INTERACTIVE = 0  # Hotkey prompts, the user waits for the paste
+    NORMAL = 1  # Chat window
+    BULK = 2  # Background work, e.g. context summaries and batch runs
+
+
+# Lane of each priority, as named in the lanes settings and the lane statistics
+LANE_NAMES = {
+    RequestPriority.INTERACTIVE: "hotkey",
+    RequestPriority.NORMAL: "chat",
+    RequestPriority.BULK: "background",
+}
+
+
+@dataclass(slots=True)
+class RequestOptions:
+    """
+    Per-request settings accepted by the API client send methods.
+
+    Attributes:
+        stateless: Send the prompt without the chat session history and do not record the exchange.
+        session: Key of the pooled chat session the request belongs to, the chat window's session if None.
+        model: Override the configured model for this request only.
+        priority: Rate limiter admission priority, see RequestPriority.
+        cancellation: Token for cancelling the request; one is created if omitted.
+        generation: Per-request generation settings, overriding the provider's settings field by field.
+        prompt_id: Prompt the request belongs to, recorded in the telemetry.
+        cache: Response cache status recorded in the telemetry, e.g. 'miss'; None if not looked up.
+        static_prefix: Static start of the prompt that may be served from a provider-side cached context.
+        failover: Whether the request may be sent to the fallback provider or model while its circuit is open.
+        images: Images sent along with the prompt; they are not kept in the chat session history.
+    """
+    stateless: bool = False
+    session: Optional[str] = None
+    model: Optional[str] = None
+    priority: int = RequestPriority.INTERACTIVE
+    cancellation: Optional[CancellationToken] = None
+    generation: Optional[GenerationSettings] = None
+    prompt_id: Optional[str] = None
+    cache: Optional[str] = None
+    static_prefix: Optional[str] = None
+    failover: bool = True
+    images: Tuple[EncodedImage, ...] = ()
@@ -0,0 +1,137 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.utils.config_manager import ConfigManager
+from src.utils.log_manager import LogManager
+from src.clients.chat_context import ChatContextManager
+
+# Session of the chat window, also used by prompts whose output is shown there
+CHAT_SESSION = "chat:main"
+
+
+def prompt_session_key(prompt_id: str) -> str:
+    """
+    Returns the pool key of the session of a prompt.
+    """
+    return f"prompt:{prompt_id}"
+
+
+@dataclass(slots=True)
+class PooledSession:
+    """
+    A conversation of the pool with its own model, history and context budget.
+    history is the only history list of the session for its whole lifetime, requests are built
+    from it and the context manager trims and summarizes it in place. chat is created from it
+    for the current model but never read.
+    """
+    key: str
+    model: str
+    history: List
+    chat: Any
+    context: ChatContextManager
+
+
+class ChatSessionPool:
+    """
+    Pool of conversation histories keyed by prompt id ('prompt:<id>') and chat tab ('chat:<tab>'),
+    so prompts do not share history with each other or with the chat window.
+    Sessions are created on their first request and the least recently used ones are evicted
+    once more than session_pool.max_sessions exist.
+    """
+
+    def __init__(self, api_client, start_chat: Callable[[str, List], Any], make_content: Callable[[str, str], Any]):
+        """
+        Args:
+            api_client: The BaseAPIClient the sessions belong to, used for context summaries.
+            start_chat: Creates the history holder of a model from an initial history.
+            make_content: Builds a history entry from a role ('user' or 'model') and a text.
+        """
+        self._log_manager = LogManager.get_instance()
+        self._config_manager = ConfigManager.get_instance()
+        self._api_client = api_client
+        self._start_chat = start_chat
+        self._make_content = make_content
+        self._lock = Lock()
+        self._sessions: "OrderedDict[str, PooledSession]" = OrderedDict()
+        self._stats = {"created": 0, "reused": 0, "evicted": 0}
+
+    def _create(self, key: str, model: str) -> PooledSession:
+        history = []
+        session = PooledSession(
+            key=key, model=model, history=history, chat=self._start_chat(model, history),
+            context=ChatContextManager(self._api_client, self._make_content),
+        )
+        self._stats["created"] += 1
+        return session
+
+    def get(self, key: str, model: str) -> PooledSession:
+        """
+        Get the session of a key, creating it if needed.
+        A session asked for with another model keeps its history list and switches to that model.
+
+        Args:
+            key (str): The session key, e.g. CHAT_SESSION or prompt_session_key(prompt_id).
+            model (str): The model of the request.
+
+        Returns:
+            PooledSession: The session.
+        """
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._create(key, model)
+                self._sessions[key] = session
+                self._evict()
+            else:
+                self._sessions.move_to_end(key)
+                self._stats["reused"] += 1
+                if session.model != model:
+                    session.chat = self._start_chat(model, session.history)
+                    session.model = model
+            return session
+
+    def peek(self, key: str) -> Optional[PooledSession]:
+        """
+        Get the session of a key without creating it or changing its recency.
+        """
+        with self._lock:
+            return self._sessions.get(key)
+
+    def _evict(self):
+        max_sessions = max(1, self._config_manager.get_value("session_pool").max_sessions)
+        while len(self._sessions) > max_sessions:
+            key, session = self._sessions.popitem(last=False)
+            session.context.reset()
+            self._stats["evicted"] += 1
+            self._log_manager.log_info(f"Evicted least recently used chat session {key}.")
+
+    def clear(self, key: str):
+        """
+        Clear the history of a session.
+        """
+        session = self.peek(key)
+        if session is not None:
+            session.history.clear()
+            session.context.reset()
+
+    def reset(self):
+        """
+        Drop all sessions, e.g. when the client is reinitialized.
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.context.reset()
+            self._sessions.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Returns the number of pooled sessions and how often sessions were created, reused and evicted.
+        """
+        with self._lock:
+            return {"sessions": len(self._sessions), **self._stats}
@@ -0,0 +1,114 @@
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, List, Optional
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.clients.cancellation import CANCELLED, CancellationToken, cancel_scope
+
+UpstreamFactory = Callable[[CancellationToken], AsyncIterator[Any]]
+
+
+class _Flight:
+    """
+    A request in flight and the items it produced so far.
+    """
+
+    def __init__(self, token: CancellationToken):
+        self.token = token
+        self.items: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self.changed = asyncio.get_running_loop().create_future()
+
+    def notify(self):
+        changed, self.changed = self.changed, asyncio.get_running_loop().create_future()
+        changed.set_result(None)
+
+
+class SingleFlight:
+    """
+    Coalesces identical requests in flight into one upstream request.
+    The first subscriber of a key starts the upstream request in a task of its own; later
+    subscribers attach to it and receive the items produced so far followed by the rest.
+    Subscribers leave individually when their token is cancelled; the upstream request is
+    cancelled once no subscriber is left, for the reason the last one left, so a request
+    whose last subscriber ran out of time ends with DeadlineExceededError.
+    Must be used on the shared event loop only.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._stats = {"flights": 0, "joined": 0}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    async def stream(self, key: Hashable, upstream: UpstreamFactory,
+                     token: Optional[CancellationToken] = None) -> AsyncIterator[Any]:
+        """
+        Subscribe to the flight of a key, starting it if none is in flight.
+
+        Args:
+            key (Hashable): Identity of the request.
+            upstream (UpstreamFactory): Starts the upstream request with the flight's own cancellation token.
+            token (Optional[CancellationToken]): The subscriber's token.
+
+        Yields:
+            Any: Every item of the upstream request, from the first one on.
+
+        Raises:
+            Exception: The error the upstream request failed with.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(CancellationToken())
+            self._flights[key] = flight
+            flight.task = asyncio.get_running_loop().create_task(self._run(key, flight, upstream(flight.token)))
+            self._stats["flights"] += 1
+        else:
+            self._stats["joined"] += 1
+        flight.subscribers += 1
+        index = 0
+        try:
+            async with cancel_scope(token):
+                while True:
+                    while index < len(flight.items):
+                        index += 1
+                        yield flight.items[index - 1]
+                    if flight.done:
+                        if flight.error is not None:
+                            raise flight.error
+                        return
+                    await asyncio.shield(flight.changed)
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done:
+                # Nobody is waiting for the result anymore
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.token.cancel(token.reason if token is not None and token.reason else CANCELLED)
+
+    async def _run(self, key: Hashable, flight: _Flight, items: AsyncIterator[Any]):
+        try:
+            async for item in items:
+                flight.items.append(item)
+                flight.notify()
+        except BaseException as e:
+            flight.error = e
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            flight.done = True
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.notify()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Returns the number of upstream requests started and how many requests attached to one instead.
+        """
+        return {"in_flight": len(self._flights), **self._stats}
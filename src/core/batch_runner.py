@@ -0,0 +1,178 @@
+import asyncio
+import glob
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+import sys
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.clients.request_options import RequestOptions, RequestPriority
+from src.utils.config_manager import ConfigManager
+from src.utils.dataclasses import Prompt
+from src.utils.log_manager import LogManager
+from src.utils.prompt_manager import PromptManager
+
+# Checkpoint of a batch run, stored in its output directory
+CHECKPOINT_FILE = ".promptly_batch.json"
+
+
+def write_atomic(path: Path, text: str):
+    """
+    Write a file so that readers see either the old or the complete new content, never a partial file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = path.with_name(f".{path.name}.tmp")
+    with open(temp_file, 'w', encoding='utf-8') as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_file, path)
+
+
+class BatchRunner:
+    """
+    Runs a saved prompt over a set of files without the GUI.
+    Files are read, sent and written by a fixed number of concurrent workers at bulk priority,
+    so the rate limiter still serves interactive requests first. Every result is written
+    atomically to the output directory, mirroring the input layout, and recorded in a checkpoint
+    together with the hash of its input; a resumed run skips files whose input has not changed.
+    """
+
+    def __init__(self, prompt_id: str, input_glob: str, output_dir: Path,
+                 concurrency: int = 4, additional_input: str = ""):
+        """
+        Args:
+            prompt_id: Id of the saved prompt to run.
+            input_glob: Glob of the input files, '**' matches across directories.
+            output_dir: Directory the results and the checkpoint are written to.
+            concurrency: Number of files processed at the same time.
+            additional_input: Text used for the prompt's {input} placeholder.
+        """
+        self._log_manager = LogManager.get_instance()
+        self._prompt_id = prompt_id
+        self._prompt: Optional[Prompt] = PromptManager.get_instance().get_prompt_by_id(prompt_id)
+        if self._prompt is None:
+            raise KeyError(f"Prompt '{prompt_id}' not found.")
+        self._input_glob = input_glob
+        self._output_dir = Path(output_dir)
+        self._concurrency = max(1, concurrency)
+        self._additional_input = additional_input
+        self._checkpoint_file = self._output_dir / CHECKPOINT_FILE
+        self._completed: Dict[str, str] = {}
+        self._checkpoint_lock: Optional[asyncio.Lock] = None
+        self._stats = {"files": 0, "completed": 0, "skipped": 0, "failed": 0}
+
+    def _collect_files(self) -> Dict[str, Path]:
+        """
+        Returns the input files keyed by their path relative to the common input directory.
+        """
+        output_dir = self._output_dir.resolve()
+        # Results of an earlier run are never picked up as input
+        files = sorted(path for path in (Path(name).resolve() for name in glob.glob(self._input_glob, recursive=True))
+                       if path.is_file() and output_dir not in path.parents)
+        if not files:
+            return {}
+        root = Path(os.path.commonpath([file.parent for file in files]))
+        return {file.relative_to(root).as_posix(): file for file in files}
+
+    def _load_checkpoint(self):
+        try:
+            with open(self._checkpoint_file, 'r', encoding='utf-8') as file:
+                checkpoint = json.load(file)
+            if checkpoint.get("promptId") == self._prompt_id:
+                self._completed = checkpoint.get("completed", {})
+                self._log_manager.log_info(f"Resuming batch run, {len(self._completed)} files already completed.")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self._log_manager.log_error("Failed to load batch checkpoint, starting over.", error=e)
+
+    async def _save_checkpoint_async(self):
+        """
+        Write the checkpoint in a worker thread. The snapshot is taken and written under a lock,
+        so a slower save never replaces the checkpoint with an older snapshot.
+        """
+        async with self._checkpoint_lock:
+            text = json.dumps({"promptId": self._prompt_id, "completed": self._completed})
+            await asyncio.to_thread(write_atomic, self._checkpoint_file, text)
+
+    def _render(self, text: str) -> str:
+        template = self._prompt.template
+        if self._prompt.behavior.additional_input:
+            template = template.replace('{input}', self._additional_input)
+        return template.replace('{text}', text)
+
+    def run(self) -> Dict[str, int]:
+        """
+        Process all input files, blocking until the run finished or was interrupted.
+        An interrupted run keeps its checkpoint and continues where it stopped when started again.
+
+        Returns:
+            Dict[str, int]: Number of input files and how many were completed, skipped and failed.
+        """
+        api_client = ConfigManager.get_instance().get_api_client()
+        files = self._collect_files()
+        self._stats["files"] = len(files)
+        self._load_checkpoint()
+        self._log_manager.log_info(
+            f"Running prompt {self._prompt_id} over {len(files)} files with concurrency {self._concurrency}."
+        )
+        future = api_client.submit_async(self._run_async(api_client, files))
+        try:
+            future.result()
+        except KeyboardInterrupt:
+            # Cancelling the run aborts the requests in flight together with their workers
+            future.cancel()
+            self._log_manager.log_warning("Batch run interrupted, completed files are kept in the checkpoint.")
+        self._log_manager.log_info(f"Batch run finished: {self._stats}")
+        return dict(self._stats)
+
+    async def _run_async(self, api_client, files: Dict[str, Path]):
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._concurrency * 2)
+        self._checkpoint_lock = asyncio.Lock()
+
+        async def produce():
+            for name, path in files.items():
+                await queue.put((name, path))
+            for _ in range(self._concurrency):
+                await queue.put(None)
+
+        async def work():
+            while (item := await queue.get()) is not None:
+                await self._process_file(api_client, *item)
+
+        await asyncio.gather(produce(), *(work() for _ in range(self._concurrency)))
+
+    async def _process_file(self, api_client, name: str, path: Path):
+        try:
+            text = await asyncio.to_thread(path.read_text, encoding='utf-8')
+            digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+            output_file = self._output_dir / name
+            if self._completed.get(name) == digest and output_file.exists():
+                self._stats["skipped"] += 1
+                return
+
+            options = RequestOptions(
+                stateless=True, priority=RequestPriority.BULK,
+                generation=self._prompt.generation, prompt_id=self._prompt_id,
+            )
+            response = await api_client.send_request_non_stream_async(self._render(text), options=options)
+            if response is None:
+                raise RuntimeError("Request failed")
+            await asyncio.to_thread(write_atomic, output_file, response)
+            self._completed[name] = digest
+            await self._save_checkpoint_async()
+            self._stats["completed"] += 1
+            self._log_manager.log_info(f"Processed {name}.")
+        except Exception as e:
+            self._stats["failed"] += 1
+            self._log_manager.log_error(f"Failed to process {name}.", error=e)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Returns the number of input files and how many were completed, skipped and failed so far.
+        """
+        return dict(self._stats)
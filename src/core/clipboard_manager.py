@@ -2,8 +2,14 @@ import pyperclip
 from pynput.keyboard import Controller
 from typing import Optional
 from time import sleep
+from threading import RLock
 import pyautogui
 
+try:
+    from PIL import Image, ImageGrab
+except ImportError:  # Image input is optional and disables itself without Pillow
+    Image = ImageGrab = None
+
 import sys
 from pathlib import Path
 root_dir = Path(__file__).parent.parent.parent
@@ -28,6 +34,7 @@ class ClipboardManager:
         self._keyboard = Controller()
         self._log_manager = LogManager.get_instance()
         self._sleep_time = 0.05
+        self._lock = RLock()  # Hotkey jobs run in parallel, clipboard round trips must not interleave
         self._log_manager.log_info("ClipboardManager initialized")
 
     def get_selected_text(self) -> Optional[str]:
@@ -37,34 +44,35 @@ class ClipboardManager:
         Returns:
             Optional[str]: Selected text or None if no selection/error
         """
-        try:
-            # Store current clipboard content
-            original = pyperclip.paste()
+        with self._lock:
+            try:
+                # Store current clipboard content
+                original = pyperclip.paste()
             
-            # Clear clipboard
-            pyperclip.copy('')
+                # Clear clipboard
+                pyperclip.copy('')
             
-            # Release all modifiers to ensure no interference
-            self.release_all_modifiers()
+                # Release all modifiers to ensure no interference
+                self.release_all_modifiers()
 
-            # Simulate Ctrl+C
-            pyautogui.hotkey('ctrl', 'c')    
+                # Simulate Ctrl+C
+                pyautogui.hotkey('ctrl', 'c')    
             
-            # Wait a bit for the clipboard to update
-            sleep(self._sleep_time)
+                # Wait a bit for the clipboard to update
+                sleep(self._sleep_time)
             
-            # Get selection
-            selected_text = pyperclip.paste()
+                # Get selection
+                selected_text = pyperclip.paste()
             
-            # Restore original clipboard content
-            if original:
-                pyperclip.copy(original)
+                # Restore original clipboard content
+                if original:
+                    pyperclip.copy(original)
                 
-            return selected_text if selected_text else None
+                return selected_text if selected_text else None
             
-        except Exception as e:
-            self._log_manager.log_error(f"Failed to get selected text", error = e)
-            return None
+            except Exception as e:
+                self._log_manager.log_error(f"Failed to get selected text", error = e)
+                return None
 
     def release_all_modifiers(self):
         """
@@ -83,27 +91,98 @@ class ClipboardManager:
         Args:
             new_text: Text to replace selection with
         """
-        try:
-             # Store current clipboard content
-            original = pyperclip.paste()
+        with self._lock:
+            try:
+                 # Store current clipboard content
+                original = pyperclip.paste()
 
-            # Copy new text to clipboard
-            pyperclip.copy(new_text)
+                # Copy new text to clipboard
+                pyperclip.copy(new_text)
 
-            # Release all modifiers to ensure no interference
-            self.release_all_modifiers()
+                # Release all modifiers to ensure no interference
+                self.release_all_modifiers()
 
-            # Simulate Ctrl+V
-            pyautogui.hotkey('ctrl', 'v')  
+                # Simulate Ctrl+V
+                pyautogui.hotkey('ctrl', 'v')  
             
-            if original:
-                pyperclip.copy(original)
+                if original:
+                    pyperclip.copy(original)
             
-            self._log_manager.log_info("Text replaced successfully")
-            return True
-        except Exception as e:
-            self._log_manager.log_error(f"Failed to replace text", error = e)
-            return False
+                self._log_manager.log_info("Text replaced successfully")
+                return True
+            except Exception as e:
+                self._log_manager.log_error(f"Failed to replace text", error = e)
+                return False
+
+    def paste_text(self, text: str) -> bool:
+        """
+        Paste text at the cursor without restoring the clipboard, e.g. for pasting a response in parts
+
+        Args:
+            text: Text to paste
+        """
+        with self._lock:
+            try:
+                pyperclip.copy(text)
+
+                # Release all modifiers to ensure no interference
+                self.release_all_modifiers()
+
+                pyautogui.hotkey('ctrl', 'v')
+
+                # Give the target application time to read the clipboard before it changes again
+                sleep(self._sleep_time)
+                return True
+            except Exception as e:
+                self._log_manager.log_error("Failed to paste text", error = e)
+                return False
+
+    def exclusive(self) -> RLock:
+        """
+        Hold the clipboard across several operations, e.g. the parts of a streamed paste and the
+        restore of the original content, so parallel hotkey jobs cannot save and restore it in between.
+
+        Returns:
+            RLock: The clipboard lock, to be used as a context manager
+        """
+        return self._lock
+
+    def get_clipboard_text(self) -> str:
+        """
+        Get the current clipboard content
+        """
+        return pyperclip.paste()
+
+    def get_clipboard_image(self) -> Optional["Image.Image"]:
+        """
+        Get the image in the clipboard, e.g. a screenshot or a copied image file
+
+        Returns:
+            Optional[Image.Image]: The image or None if the clipboard holds no image
+        """
+        if ImageGrab is None:
+            return None
+        with self._lock:
+            try:
+                content = ImageGrab.grabclipboard()
+            except Exception as e:
+                self._log_manager.log_error("Failed to get clipboard image", error = e)
+                return None
+        if isinstance(content, Image.Image):
+            return content
+        # Copied files arrive as a list of paths, use the first one that is an image
+        for path in content or []:
+            try:
+                return Image.open(path)
+            except Exception:
+                continue
+        return None
+
+    def set_clipboard_text(self, text: str):
+        """
+        Set the clipboard content
+        """
+        pyperclip.copy(text)
 
     def select_all_text(self) -> Optional[str]:
         """
@@ -112,18 +191,19 @@ class ClipboardManager:
         Returns:
             Optional[str]: All text or None if error
         """
-        try:
-            # Release all modifiers to ensure no interference
-            self.release_all_modifiers()
+        with self._lock:
+            try:
+                # Release all modifiers to ensure no interference
+                self.release_all_modifiers()
   
-            pyautogui.hotkey('ctrl', 'a')  # Select all
-            sleep(self._sleep_time)  # Wait for selection
-            pyautogui.hotkey('ctrl', 'c')  # Copy
-            sleep(self._sleep_time)  # Wait for clipboard update
+                pyautogui.hotkey('ctrl', 'a')  # Select all
+                sleep(self._sleep_time)  # Wait for selection
+                pyautogui.hotkey('ctrl', 'c')  # Copy
+                sleep(self._sleep_time)  # Wait for clipboard update
 
-            selected_text = pyperclip.paste() 
-            return selected_text
+                selected_text = pyperclip.paste() 
+                return selected_text
             
-        except Exception as e:
-            self._log_manager.log_error(f"Failed to select all text", error = e)
-            return None
\ No newline at end of file
+            except Exception as e:
+                self._log_manager.log_error(f"Failed to select all text", error = e)
+                return None
\ No newline at end of file
@@ -0,0 +1,78 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Deque, Dict, Hashable
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.utils.log_manager import LogManager
+
+
+class HotkeyJobPool:
+    """
+    Bounded worker pool for hotkey jobs.
+    Jobs with the same key (the target window) run one after another in submission order,
+    jobs with different keys run in parallel on up to `max_workers` threads.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending_jobs: int = 16):
+        """
+        Args:
+            max_workers (int): Maximum number of jobs running at the same time.
+            max_pending_jobs (int): Maximum number of queued and running jobs, further jobs are dropped.
+        """
+        self._log_manager = LogManager.get_instance()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="HotkeyWorker")
+        self._max_pending_jobs = max_pending_jobs
+        self._lock = Lock()
+        self._queues: Dict[Hashable, Deque[Callable[[], None]]] = {}
+        self._pending = 0
+
+    def submit(self, key: Hashable, job: Callable[[], None]) -> bool:
+        """
+        Queue a job behind the earlier jobs of the same key.
+
+        Args:
+            key: Serialization key, e.g. the handle of the target window.
+            job: Callable executed on a worker thread.
+
+        Returns:
+            bool: False if the job was dropped because too many jobs are pending.
+        """
+        with self._lock:
+            if self._pending >= self._max_pending_jobs:
+                self._log_manager.log_warning(f"Hotkey job dropped, {self._pending} jobs are already pending.")
+                return False
+            self._pending += 1
+            queue = self._queues.get(key)
+            if queue is not None:
+                # A job of this key is running, it picks this one up when it is done
+                queue.append(job)
+                return True
+            self._queues[key] = deque()
+        self._executor.submit(self._run, key, job)
+        return True
+
+    def _run(self, key: Hashable, job: Callable[[], None]):
+        while job is not None:
+            try:
+                job()
+            except Exception as e:
+                self._log_manager.log_error("Hotkey job failed", error = e)
+            with self._lock:
+                self._pending -= 1
+                queue = self._queues[key]
+                if queue:
+                    job = queue.popleft()
+                else:
+                    del self._queues[key]
+                    job = None
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Returns the number of pending jobs and of keys with a running job.
+        """
+        with self._lock:
+            return {'pending': self._pending, 'active_keys': len(self._queues)}
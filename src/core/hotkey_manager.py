@@ -17,6 +17,14 @@ from src.utils.log_manager import LogManager
 from src.utils.ipc_command_handler import send_ipc_command
 from src.utils.helper_methods import HelperMethods
 from src.ui.prompt_selector_window import PromptSelector
+from src.core.hotkey_job_pool import HotkeyJobPool
+
+# System hotkeys only send an IPC command and are handled on the fast lane
+SYSTEM_HOTKEY_COMMANDS = {
+    'chat_window': 'show-chat',
+    'settings_window': 'show-config',
+    'prompt_selector': 'show-prompt_selector',
+}
 
 class HotkeyManager:
     """
@@ -57,13 +65,18 @@ class HotkeyManager:
         self._hotkey_queue = Queue()
         self._monitor_thread = None
 
+        # Prompt hotkeys run on a worker pool, serialized per target window
+        pool_config = self._config_manager.get_value('hotkey_pool')
+        self._job_pool = HotkeyJobPool(pool_config.max_workers, pool_config.max_pending_jobs)
+
         self._last_activity_time = None
+        self._api_client = self._config_manager.get_api_client()
 
         self._log_manager.log_info('HotkeyManager initialized')
     
     def _queue_handler(self):
         """
-        handles the hotkey queue
+        handles the hotkey queue of system hotkeys, which never wait for prompt jobs
         """
         while True:
             task = self._hotkey_queue.get()
@@ -148,18 +161,28 @@ class HotkeyManager:
             self._non_mod.clear()
             self._mod.clear()
             self._cur_non_mod.clear()
-            self._hotkey_queue.put(id)     
+            if id in SYSTEM_HOTKEY_COMMANDS:
+                self._hotkey_queue.put(id)
+            else:
+                self.submit_prompt(id)
+
+    def submit_prompt(self, id: str) -> bool:
+        """
+        Run a prompt on the hotkey worker pool against the window in the foreground.
+        Jobs for the same window stay in order, jobs for other windows run in parallel.
+
+        Returns:
+            bool: False if the job was dropped because too many jobs are pending.
+        """
+        target_window = ctypes.windll.user32.GetForegroundWindow()
+        return self._job_pool.submit(target_window, lambda: self._execute_hotkey(id))
 
     def _execute_hotkey(self, id: str):
         """
         executes hotkey
         """
-        if id == 'chat_window':
-            send_ipc_command('show-chat')
-        elif id == 'settings_window':
-            send_ipc_command('show-config')
-        elif id == 'prompt_selector':
-            send_ipc_command('show-prompt_selector')
+        if id in SYSTEM_HOTKEY_COMMANDS:
+            send_ipc_command(SYSTEM_HOTKEY_COMMANDS[id])
         elif id is not None:
             self._text_processor.process_text_with_prompt(id)
 
@@ -246,12 +269,22 @@ class HotkeyManager:
         die after a PC lock event.
         """
         was_locked = False
+        was_idle = False
+        idle_after = self._config_manager.get_value('warmup').idle_after_seconds
         while True:
             time.sleep(3)  # Adjust interval as needed
             if not self._helper.get_hotkey_listener_status():
                 return
 
             is_locked = ctypes.windll.user32.GetForegroundWindow() == 0
+            is_idle = time.time() - self._last_activity_time > idle_after
+
+            # Re-warm the API connection as soon as the user is back
+            if was_locked and not is_locked:
+                self._api_client.rewarm('resume')
+            elif was_idle and not is_idle:
+                self._api_client.rewarm('idle')
+            was_idle = is_idle
             if is_locked or was_locked or self._last_activity_time - time.time() > 30:
                 with self._lock:
                     self._cur_mod.clear()
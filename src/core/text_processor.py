@@ -1,8 +1,14 @@
 import ctypes
-from PyQt5.QtCore import Qt
+import re
+import time
+from concurrent.futures import Future
+from contextlib import ExitStack
+from dataclasses import replace
+from threading import Lock
+from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal
 from PyQt5.QtWidgets import QInputDialog
 from PyQt5.QtGui import QFont
-from typing import Optional
+from typing import Optional, Tuple
 
 
 import sys
@@ -15,6 +21,50 @@ from src.utils.chat_history import ChatHistory
 from src.utils.log_manager import LogManager
 from src.utils.ipc_command_handler import send_ipc_command
 from src.utils.config_manager import ConfigManager
+from src.utils.response_cache import ResponseCache
+from src.utils.semantic_cache import SemanticCache
+from src.utils.image_encoder import ImageEncoder
+from src.clients.cancellation import CancellationToken, DeadlineExceededError
+from src.clients.request_options import RequestOptions
+from src.clients.session_pool import CHAT_SESSION, prompt_session_key
+
+# Streamed responses are pasted up to the last sentence or line end
+PASTE_BOUNDARY = re.compile(r'(?<=[.!?:;])\s+|\n')
+# Without a sentence boundary, paste up to the last space once this many characters are pending
+MAX_PENDING_CHARS = 120
+
+class _InputDialogBridge(QObject):
+    """
+    Shows the additional input dialog on the GUI thread for prompts running on hotkey worker threads
+    """
+    requested = pyqtSignal()
+
+    def __init__(self, dialog: QInputDialog):
+        super().__init__()
+        self._dialog = dialog
+        self._lock = Lock()  # One dialog at a time, further workers wait for their turn
+        self._result: Optional[str] = None
+        # The emitting worker blocks until the slot has returned on the GUI thread
+        self.requested.connect(self._show, Qt.BlockingQueuedConnection)
+
+    def _show(self):
+        self._dialog.activateWindow()
+        self._dialog.raise_()
+        self._dialog.setFocus()
+
+        # Execute the dialog and get user input
+        if self._dialog.exec_() == QInputDialog.Accepted:
+            self._result = self._dialog.textValue() or ""
+        else:
+            self._result = None
+
+    def get_input(self) -> Optional[str]:
+        if QThread.currentThread() == self.thread():
+            self._show()
+            return self._result
+        with self._lock:
+            self.requested.emit()
+            return self._result
 
 class TextProcessor:
     """Class responsible for all text processing operations"""
@@ -38,6 +88,9 @@ class TextProcessor:
         self._clipboard_manager = ClipboardManager.get_instance()
         self._api_client = self._config_manager.get_api_client()
         self._prompt_manager = PromptManager.get_instance()
+        self._response_cache = ResponseCache.get_instance()
+        self._semantic_cache = SemanticCache.get_instance()
+        self._image_encoder = ImageEncoder.get_instance()
         
         self._log_manager.log_info("TextProcessor initialized")
 
@@ -52,6 +105,8 @@ class TextProcessor:
         self._user_input.setFont(font)
         # Ensure the dialog is modal and brought to the foreground
         self._user_input.setWindowFlags(Qt.Dialog | Qt.WindowStaysOnTopHint | Qt.CustomizeWindowHint)
+        # Created on the GUI thread, which then runs the dialog for all workers
+        self._input_bridge = _InputDialogBridge(self._user_input)
 
     def _set_busy_cursor(self):
         # Set the system-wide busy cursor (IDC_WAIT)
@@ -78,36 +133,57 @@ class TextProcessor:
 
             # Handle Chat history
             if prompt.behavior.clear_history:
-                ChatHistory.get_instance().clear_history()
-            
-            # Get selected text
-            selected_text = self._clipboard_manager.get_selected_text()
+                session = self._session_key(prompt, prompt_id)
+                if session == CHAT_SESSION:
+                    ChatHistory.get_instance().clear_history()
+                self._api_client.clear_history(session)
             
+            # Hotkey jobs for other windows run in parallel; a job holds the clipboard while it copies
+            # the selection and again while it pastes, but not while it waits for the response
+            with self._clipboard_manager.exclusive():
+                # Grab a clipboard image before copying the selection replaces it
+                image_job = None
+                if prompt.behavior.accept_images:
+                    image = self._clipboard_manager.get_clipboard_image()
+                    if image is not None:
+                        # Downscaled and encoded in the background while the selection is copied
+                        image_job = self._image_encoder.submit(image)
+
+                # Get selected text
+                selected_text = self._clipboard_manager.get_selected_text()
+
             # Handle text selection based on prompt behavior
             if selected_text and prompt.behavior.text_selected.value == 'skip':
                 return True
-            
-            # Handle no selection based on prompt behavior
-            if not selected_text:
+
+            # An image that could not be encoded counts as no input at all
+            if not selected_text and image_job is not None and image_job.result() is None:
+                image_job = None
+
+            # Handle no selection based on prompt behavior, an image is processed on its own
+            if not selected_text and image_job is None:
                 if prompt.behavior.no_text_selected.value == 'skip':
                     return True
                 elif prompt.behavior.no_text_selected.value == 'process':
                     pass
-                elif prompt.behavior.no_text_selected.value == 'select_all':  
+                elif prompt.behavior.no_text_selected.value == 'select_all':
                     selected_text = self._clipboard_manager.select_all_text()
 
             # Process the text
-            self._process_with_openai(prompt, selected_text)
+            self._process_with_openai(prompt, selected_text, prompt_id, image_job)
         except Exception as e:
             self._log_manager.log_error(f"Failed to process text", error = e)
 
-    def _process_with_openai(self, prompt: Prompt, text: str):
+    def _process_with_openai(self, prompt: Prompt, text: str, prompt_id: Optional[str] = None,
+                             image_job: Optional[Future] = None):
         """
         Process text with OpenAI API
         
         Args:
             prompt: The prompt to use
             text: The text to process
+            prompt_id: ID of the prompt, recorded in the request telemetry
+            image_job: Encoding of a clipboard image sent along with the prompt
         """
         try:
             # Get additional input if needed
@@ -123,10 +199,25 @@ class TextProcessor:
             if not final_prompt:
                 return
 
+            # Near-duplicate lookups compare only what the user supplied, not the template around it
+            user_input = "\n".join(part for part in (additional_input, text) if part)
+
             self._set_busy_cursor()
+            started = time.monotonic()
+            image = image_job.result() if image_job else None
+            options = RequestOptions(
+                session=self._session_key(prompt, prompt_id), generation=prompt.generation,
+                prompt_id=prompt_id, static_prefix=self._static_prefix(prompt),
+                images=(image,) if image else (),
+            )
+
+            if prompt.behavior.stream_output and not prompt.behavior.output_on_separate_window:
+                if self._stream_response(prompt, final_prompt, user_input, options, started):
+                    self._log_manager.log_info("Text processed successfully.")
+                return
 
             # Send to OpenAI
-            response = self._api_client.send_request_non_stream(final_prompt)
+            response = self._request_response(prompt, final_prompt, user_input, options)
             if not response:
                 return
 
@@ -136,24 +227,221 @@ class TextProcessor:
                 send_ipc_command('show-chat')
             else:
                 self._clipboard_manager.replace_text(response)
+                self._log_first_visible(started, streaming=False)
             self._log_manager.log_info("Text processed successfully.")            
+        except DeadlineExceededError:
+            self._restore_default_cursor()
+            self._log_manager.log_warning("Prompt exceeded its deadline, no text was replaced.")
         except Exception as e:
             self._log_manager.log_error(f"Error processing with OpenAI", error = e)
         
-    def _get_user_input(self) -> str:
+    def _request_response(self, prompt: Prompt, final_prompt: str, user_input: str,
+                          options: RequestOptions) -> Optional[str]:
         """
-        Get additional input from user
+        Send the final prompt, answering from the response cache if the prompt opts in
+        
+        Args:
+            prompt: The prompt being executed
+            final_prompt: The rendered prompt text
+            user_input: The selected text and additional input rendered into the template
+            options: Settings of the request
         """
-        self._user_input.activateWindow()
-        self._user_input.raise_()
-        self._user_input.setFocus()
+        # Cached responses are keyed by the prompt text only, so requests with images bypass the caches
+        if not prompt.behavior.cache_response or options.images:
+            return self._api_client.send_request_non_stream(final_prompt, options=options)
 
-        # Execute the dialog and get user input
-        if self._user_input.exec_() == QInputDialog.Accepted:
-            return self._user_input.textValue() or ""
+        response, cache_entry = self._lookup_cache(prompt, final_prompt, user_input, options)
+        if response is not None:
+            return response
+
+        response = self._api_client.send_request_non_stream(final_prompt, options=options)
+        self._store_in_cache(response, cache_entry, options)
+        return response
+
+    def _lookup_cache(self, prompt: Prompt, final_prompt: str, user_input: str,
+                      options: RequestOptions) -> Tuple[Optional[str], Tuple[str, str, str, str]]:
+        """
+        Look up a cached response for the final prompt and record the cache status in the options.
+        The request is routed first and its model pinned in the options, so the response is cached
+        under the model that is actually asked, together with the generation settings and chat context.
+        Near-duplicates are only looked up for the same template, comparing the user's input alone.
+
+        Returns:
+            Tuple: The cached response or None, and the (key, model, semantic scope, user input)
+            to store a new response under
+        """
+        started = time.monotonic()
+        options.model = self._api_client.route_model(final_prompt, options)
+        model, scope_digest = self._api_client.get_cache_scope(options)
+        cache_key = self._response_cache.make_key(model, final_prompt, scope_digest)
+        semantic_scope = self._semantic_cache.make_scope(prompt.template, scope_digest)
+        options.cache = 'exact'
+        response = self._response_cache.get(cache_key)
+        if response is None:
+            options.cache = 'semantic'
+            response = self._semantic_cache.get(model, user_input, semantic_scope)
+        if response is None:
+            options.cache = 'miss'
         else:
-            return None  
+            self._log_manager.log_info("Response served from cache.")
+            self._api_client.add_to_history(final_prompt, response, options.session)
+            self._api_client.record_cache_hit(final_prompt, response, options, started)
+        return response, (cache_key, model, semantic_scope, user_input)
+
+    def _store_in_cache(self, response: Optional[str], cache_entry: Tuple[str, str, str, str],
+                        options: RequestOptions):
+        if not response:
+            return
+        cache_key, model, semantic_scope, user_input = cache_entry
+        # A circuit that opened while the request was sent failed it over to another model
+        if self._api_client.get_cache_scope(options)[0] != model:
+            return
+        self._response_cache.put(cache_key, model, response)
+        self._semantic_cache.put(model, user_input, response, semantic_scope)
+
+    def _stream_response(self, prompt: Prompt, final_prompt: str, user_input: str, options: RequestOptions,
+                         started: float) -> bool:
+        """
+        Paste the response into the target application while it is being generated.
+        Streaming stops as soon as the target window loses focus; text pasted so far is kept.
+        The clipboard is held from the first paste until it was restored, not while waiting for the response.
+
+        Args:
+            prompt: The prompt being executed
+            final_prompt: The rendered prompt text
+            user_input: The selected text and additional input rendered into the template
+            options: Settings of the request
+            started: Monotonic time the request was started
+
+        Returns:
+            bool: True if the complete response was pasted
+        """
+        target_window = ctypes.windll.user32.GetForegroundWindow()
+        clipboard = ExitStack()
+        original_clipboard = None
+        cache_entry = None
+        stream = None
+        pasted = False
+
+        def paste(text: str):
+            nonlocal original_clipboard
+            if original_clipboard is None:
+                clipboard.enter_context(self._clipboard_manager.exclusive())
+                original_clipboard = self._clipboard_manager.get_clipboard_text()
+            self._clipboard_manager.paste_text(text)
+
+        try:
+            if prompt.behavior.cache_response and not options.images:
+                response, cache_entry = self._lookup_cache(prompt, final_prompt, user_input, options)
+                if response is not None:
+                    self._restore_default_cursor()
+                    paste(response)
+                    self._log_first_visible(started, streaming=True)
+                    return True
+
+            chunks = []
+            pending = ""
+            cancellation = CancellationToken()
+            options = replace(options, cancellation=cancellation)
+            stream = self._api_client.send_request(final_prompt, options=options)
+            for text_chunk in stream:
+                chunks.append(text_chunk)
+                ready, pending = self._split_pasteable(pending + text_chunk)
+                if not ready:
+                    continue
+                if self._target_lost(target_window):
+                    cancellation.cancel()
+                    return False
+                if not pasted:
+                    self._restore_default_cursor()
+                    self._log_first_visible(started, streaming=True)
+                    pasted = True
+                paste(ready)
+
+            if pending:
+                if self._target_lost(target_window):
+                    return False
+                paste(pending)
+                if not pasted:
+                    self._log_first_visible(started, streaming=True)
+            if cache_entry:
+                self._store_in_cache("".join(chunks), cache_entry, options)
+            return True
+        except DeadlineExceededError:
+            self._log_manager.log_warning("Prompt exceeded its deadline, the text pasted so far is kept.")
+            return False
+        except Exception as e:
+            self._log_manager.log_error("Streaming paste failed", error = e)
+            return False
+        finally:
+            if stream is not None:
+                stream.close()
+            self._restore_default_cursor()
+            with clipboard:
+                if original_clipboard is not None:
+                    self._clipboard_manager.set_clipboard_text(original_clipboard)
+
+    def _target_lost(self, target_window: int) -> bool:
+        if ctypes.windll.user32.GetForegroundWindow() == target_window:
+            return False
+        self._log_manager.log_warning("Target window lost focus, streaming paste cancelled.")
+        return True
+
+    @staticmethod
+    def _split_pasteable(pending: str) -> Tuple[str, str]:
+        """
+        Split pending text into the part that is ready to paste and the remainder
+
+        Returns:
+            Tuple[str, str]: Text ending at the last sentence boundary, and the rest
+        """
+        boundary = None
+        for boundary in PASTE_BOUNDARY.finditer(pending):
+            pass
+        if boundary:
+            return pending[:boundary.end()], pending[boundary.end():]
+        if len(pending) > MAX_PENDING_CHARS:
+            split_at = pending.rfind(' ') + 1
+            if split_at > 0:
+                return pending[:split_at], pending[split_at:]
+        return "", pending
+
+    def _log_first_visible(self, started: float, streaming: bool):
+        """
+        Log the time from sending the request until the first character appeared in the target application
+        """
+        elapsed_ms = (time.monotonic() - started) * 1000
+        self._log_manager.log_info(
+            f"First visible character after {elapsed_ms:.0f} ms ({'streaming' if streaming else 'non-streaming'})."
+        )
+
+    def _get_user_input(self) -> Optional[str]:
+        """
+        Get additional input from user, showing the dialog on the GUI thread
+        """
+        return self._input_bridge.get_input()
     
+    @staticmethod
+    def _session_key(prompt: Prompt, prompt_id: Optional[str]) -> str:
+        """
+        Chat session of a prompt: prompts shown in the chat window continue its conversation,
+        all others have a session of their own
+        """
+        if prompt.behavior.output_on_separate_window or not prompt_id:
+            return CHAT_SESSION
+        return prompt_session_key(prompt_id)
+
+    def _static_prefix(self, prompt: Prompt) -> Optional[str]:
+        """
+        Part of the template before the first placeholder, which is the same for every execution
+        of the prompt and can be served from a cached context
+        """
+        placeholders = ['{text}', '{input}'] if prompt.behavior.additional_input else ['{text}']
+        positions = [prompt.template.find(placeholder) for placeholder in placeholders if placeholder in prompt.template]
+        if not positions:
+            return None
+        return prompt.template[:min(positions)] or None
+
     def _process_prompt(self, prompt: Prompt, selected_text: str = "", additional_input: str = "") -> Optional[str]:
         """
         Process prompt with given text and additional input
@@ -23,17 +23,22 @@ from src.ui.chat_window import ChatWindow
 from src.ui.prompt_selector_window import PromptSelector
 from src.utils.path_manager import get_assets_path, get_config_path, get_base_path
 from src.clients.gemini_api_client import GeminiClient
+from src.clients.circuit_breaker import CircuitBreaker
 from src.utils.cleanup_manager import CleanupManager
 from src.utils.credential_manager import CredentialManager
+from src.utils.config_manager import ConfigManager
 
 from src.utils.ipc_command_handler import send_ipc_command
 from src.utils.helper_methods import HelperMethods
 from src.core.text_processor import TextProcessor
 from src.core.clipboard_manager import ClipboardManager
+from src.core.batch_runner import BatchRunner
 
 class SignalHelper(QObject):
     execute_command_signal = pyqtSignal(str)
     process_text_signal = pyqtSignal(str)
+    api_key_invalid_signal = pyqtSignal()
+    circuit_state_signal = pyqtSignal()
 
 class HelperWindow(QDialog):
     def __init__(self, parent):
@@ -100,6 +105,7 @@ class APIKeyDialog(QDialog):
 
         if GeminiClient.validate_api_key(api_key):
             CredentialManager.get_instance().store_api_key('gemini', api_key)
+            CredentialManager.get_instance().mark_api_key_validated('gemini', api_key)
             QMessageBox.information(
                 self, "Validation Successful", "The provided API Key is valid.\nContinuing..."
             )
@@ -130,13 +136,17 @@ class MainProcess:
         self._icon = HelperMethods.get_instance().get_icon()
         self._app.setApplicationName("Promptly")
         self._app.setWindowIcon(self._icon)
+        self._signal_helper = SignalHelper()
+        self._signal_helper.api_key_invalid_signal.connect(self._handle_invalid_api_key)
         self._ensure_valid_api_key()
 
         self._hotkey_manager = HotkeyManager.get_instance()
         self._clipboard_manager = ClipboardManager.get_instance()
-        self._signal_helper = SignalHelper()
         self._signal_helper.execute_command_signal.connect(self._execute_command)
-        self._signal_helper.process_text_signal.connect(self._process_text_in_main_thread)
+        self._signal_helper.process_text_signal.connect(self._process_selected_prompt)
+        self._signal_helper.circuit_state_signal.connect(self._update_tray_tooltip)
+        # Circuits change state on the event loop thread, the tooltip is updated on the GUI thread
+        CircuitBreaker.get_instance().add_listener(self._signal_helper.circuit_state_signal.emit)
         self._keep_running = False
 
         self._listeners = []
@@ -198,7 +208,8 @@ class MainProcess:
         """
         Ensures a valid Gemini API Key is available by:
         1) Checking the config file.
-        2) Prompting the user to input a key if one is not available or invalid.
+        2) Starting immediately if the key matches a cached validation and re-checking it in the background.
+        3) Prompting the user to input a key if one is not available or invalid.
         Exits the application if a valid key is not provided.
 
         Raises:
@@ -207,19 +218,56 @@ class MainProcess:
 
         config_path = get_config_path() / "config.json"
         api_key = None
+        credential_manager = CredentialManager.get_instance()
 
         # Check if API key exists in configuration
         if config_path.exists():
             try:
-                valid_api_key = False
-                api_key = CredentialManager.get_instance().get_api_key('gemini')
+                api_key = credential_manager.get_api_key('gemini')
+                if credential_manager.is_api_key_validated('gemini', api_key):
+                    self._log_manager.log_info("API key matches cached validation, re-checking in background.")
+                    threading.Thread(
+                        target=self._revalidate_api_key, args=(api_key,), daemon=True
+                    ).start()
+                    return
                 if GeminiClient.validate_api_key(api_key):
+                    credential_manager.mark_api_key_validated('gemini', api_key)
                     self._log_manager.log_info("Valid API key found.")
                     return
             except Exception as e:
                 self._log_manager.log_error(f"Error validating API key: {e}")
 
-        # Prompt for API key until it is valid or user cancels
+        self._prompt_for_api_key()
+
+    def _revalidate_api_key(self, api_key: str):
+        """
+        Re-check a cached API key in the background and notify the main thread if it was rejected
+        """
+        result = GeminiClient.check_api_key(api_key)
+        if result is True:
+            CredentialManager.get_instance().mark_api_key_validated('gemini', api_key)
+            self._log_manager.log_info("Background API key check succeeded.")
+        elif result is False:
+            self._log_manager.log_warning("Background API key check failed, the key was rejected.")
+            CredentialManager.get_instance().clear_api_key_validation('gemini')
+            self._signal_helper.api_key_invalid_signal.emit()
+        else:
+            self._log_manager.log_warning("Background API key check could not complete, keeping cached validation.")
+
+    def _handle_invalid_api_key(self):
+        """
+        Ask for a new API key after the background check rejected the cached one
+        """
+        self._prompt_for_api_key()
+        try:
+            ConfigManager.get_instance().get_api_client().reinitialize()
+        except Exception as e:
+            self._log_manager.log_error("Failed to reinitialize API client", error = e)
+
+    def _prompt_for_api_key(self):
+        """
+        Prompt for an API key until it is valid or the user cancels
+        """
         while True:
             dialog = APIKeyDialog(parent=None)  # Create the dialog
             result = dialog.exec_()  # Show the dialog modally
@@ -258,6 +306,16 @@ class MainProcess:
         self.tray_icon.setContextMenu(tray_menu)
         self.tray_icon.setToolTip("Promptly")
         self.tray_icon.show()
+        self._update_tray_tooltip()
+
+    def _update_tray_tooltip(self):
+        """
+        Show the providers and models whose circuit is not closed in the tray tooltip.
+        """
+        if not hasattr(self, "tray_icon"):
+            return
+        circuits = CircuitBreaker.get_instance().describe()
+        self.tray_icon.setToolTip(f"Promptly\n{circuits}" if circuits else "Promptly")
 
     def _start_ipc_server(self):
         """
@@ -439,12 +497,15 @@ class MainProcess:
             self._keyboard_listener.stop()
             self._keyboard_listener = None
 
-    def _process_text_in_main_thread(self, action):
-        """Process text with prompt in the main thread."""
+    def _process_selected_prompt(self, action):
+        """
+        Run the prompt picked in the prompt selector on the hotkey worker pool.
+        On the GUI thread it could wait for the clipboard held by a job that waits for the GUI thread to show its input dialog.
+        """
         try:
-            TextProcessor.get_instance().process_text_with_prompt(action)
+            self._hotkey_manager.submit_prompt(action)
         except Exception as e:
-            self._log_manager.log_error(f"Error processing text in main thread: {e}")
+            self._log_manager.log_error(f"Error processing selected prompt: {e}")
 
     def check_active_components(self):
         """
@@ -491,7 +552,14 @@ def main():
     group.add_argument("--start-listener", action="store_true", help="Start the hotkey listener")
     group.add_argument("--stop-listener", action="store_true", help="Stop the hotkey listener")
     group.add_argument("--cleanup", action="store_true", help="Erase all program data")
+    group.add_argument("--batch", metavar="PROMPT_ID", help="Run a saved prompt over files without the GUI")
+    parser.add_argument("--input", help="Glob of the input files for --batch, e.g. 'docs/**/*.md'")
+    parser.add_argument("--output", help="Output directory for --batch")
+    parser.add_argument("--concurrency", type=int, default=4, help="Files processed at the same time by --batch")
+    parser.add_argument("--additional-input", default="", help="Text for the {input} placeholder of --batch")
     args = parser.parse_args()
+    if args.batch and not (args.input and args.output):
+        parser.error("--batch requires --input and --output")
 
 
     try:
@@ -509,6 +577,15 @@ def main():
                 process.start_hotkey_listener()
         elif args.stop_listener:
             send_ipc_command('stop-listener')
+        elif args.batch:
+            try:
+                runner = BatchRunner(args.batch, args.input, Path(args.output), args.concurrency, args.additional_input)
+            except KeyError as e:
+                parser.error(str(e))
+            stats = runner.run()
+            print(f"{stats['completed']} completed, {stats['skipped']} skipped, "
+                  f"{stats['failed']} failed of {stats['files']} files")
+            sys.exit(1 if stats["failed"] else 0)
         elif args.cleanup:
             app = QApplication(sys.argv)
             # Ensure no other instance is running
@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from dataclasses import asdict
+from typing import Dict, List, Optional
+
+import psutil
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.clients.cancellation import RequestCancelledError
+from src.clients.gemini_api_client import GeminiClient
+from src.clients.rate_limiter import RateLimiter
+from src.clients.request_options import RequestOptions
+from src.tools.gemini_stub_server import GeminiStubServer, add_config_arguments, config_from_arguments
+from src.utils.config_manager import ConfigManager
+from src.utils.dataclasses import GenerationSettings
+from src.utils.telemetry_store import percentile
+
+BENCHMARK_PROMPT = "Rewrite the following sentence in a more formal tone: hey, can you send me the report?"
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else None,
+    }
+
+
+class ClientBenchmark:
+    """
+    Drives GeminiClient against a base URL at increasing concurrency and measures
+    time to first token, latency, throughput and memory.
+    """
+
+    def __init__(self, client: GeminiClient, stream: bool = True, max_output_tokens: Optional[int] = None):
+        self._client = client
+        self._stream = stream
+        self._generation = GenerationSettings(max_output_tokens=max_output_tokens)
+
+    async def _one_request(self, results: Dict):
+        options = RequestOptions(stateless=True, generation=self._generation)
+        started = time.perf_counter()
+        first_chunk = None
+        characters = 0
+        try:
+            if self._stream:
+                async for chunk in self._client.send_request_async(BENCHMARK_PROMPT, options=options):
+                    if first_chunk is None:
+                        first_chunk = time.perf_counter()
+                    characters += len(chunk)
+            else:
+                response = await self._client.send_request_non_stream_async(BENCHMARK_PROMPT, options=options)
+                if response is None:
+                    raise RuntimeError("Request failed")
+                first_chunk = time.perf_counter()
+                characters = len(response)
+        except RequestCancelledError:
+            results["errors"]["cancelled"] = results["errors"].get("cancelled", 0) + 1
+            return
+        except Exception as e:
+            name = type(e).__name__
+            results["errors"][name] = results["errors"].get(name, 0) + 1
+            return
+        finished = time.perf_counter()
+        results["ttft_ms"].append((first_chunk - started) * 1000)
+        results["latency_ms"].append((finished - started) * 1000)
+        results["characters"] += characters
+
+    async def run_level(self, concurrency: int, requests: int) -> Dict:
+        """
+        Send `requests` requests with at most `concurrency` in flight.
+
+        Returns:
+            Dict: Measurements of this concurrency level.
+        """
+        results = {"ttft_ms": [], "latency_ms": [], "characters": 0, "errors": {}}
+        semaphore = asyncio.Semaphore(concurrency)
+        process = psutil.Process()
+
+        async def worker():
+            async with semaphore:
+                await self._one_request(results)
+
+        tracemalloc.start()
+        rss_before = process.memory_info().rss
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        completed = len(results["latency_ms"])
+        return {
+            "concurrency": concurrency,
+            "requests": requests,
+            "completed": completed,
+            "errors": results["errors"],
+            "elapsed_s": elapsed,
+            "throughput_rps": completed / elapsed if elapsed else 0.0,
+            "characters_per_s": results["characters"] / elapsed if elapsed else 0.0,
+            "ttft_ms": summarize(results["ttft_ms"]),
+            "latency_ms": summarize(results["latency_ms"]),
+            "memory": {
+                "traced_peak_kb": traced_peak / 1024,
+                "rss_mb": process.memory_info().rss / 2 ** 20,
+                "rss_growth_mb": (process.memory_info().rss - rss_before) / 2 ** 20,
+            },
+        }
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict:
+    """
+    Run the benchmark described by the command line arguments and return the report.
+    """
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = GeminiStubServer(config_from_arguments(args)).start_in_thread()
+        base_url = server.base_url
+
+    # Point the client at the benchmark target for this process only; the config file is not saved
+    provider = ConfigManager.get_instance().get_value("api_clients")["gemini"]
+    provider.base_url = base_url
+    if args.model:
+        provider.model = args.model
+    if args.ignore_rate_limits:
+        provider.rate_limits = {}
+    # The benchmark sends identical prompts on purpose, each of them has to reach the server
+    ConfigManager.get_instance().get_value("single_flight").enabled = False
+
+    client = GeminiClient.get_instance()
+    benchmark = ClientBenchmark(client, stream=not args.non_stream, max_output_tokens=args.max_output_tokens)
+    levels = []
+    try:
+        client.run_async(benchmark.run_level(1, 1))  # Establish the connection pool before measuring
+        for concurrency in args.concurrency:
+            levels.append(client.run_async(benchmark.run_level(concurrency, args.requests)))
+    finally:
+        if server:
+            server.stop_in_thread()
+
+    return {
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "target": base_url,
+        "model": provider.model,
+        "mode": "non-stream" if args.non_stream else "stream",
+        "server": asdict(server.config) if server else None,
+        "serverStats": server.get_stats() if server else None,
+        "levels": levels,
+        "client": {
+            "requests": client.get_request_stats(),
+            "rateLimiter": RateLimiter.get_instance().get_stats(),
+            "lanes": RateLimiter.get_instance().get_lane_stats(),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Gemini client against a local stand-in server")
+    parser.add_argument("--base-url", help="Benchmark an already running server instead of starting the stand-in")
+    parser.add_argument("--model", help="Model name sent in the request path")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="Concurrency levels to measure")
+    parser.add_argument("--requests", type=int, default=64, help="Requests per concurrency level")
+    parser.add_argument("--max-output-tokens", type=int, help="maxOutputTokens sent with each request")
+    parser.add_argument("--non-stream", action="store_true", help="Use generateContent instead of streaming")
+    parser.add_argument("--ignore-rate-limits", action="store_true",
+                        help="Disable the configured client-side rate limits")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    report = json.dumps(run_benchmark(args), indent=2)
+    if args.output:
+        Path(args.output).write_text(report, encoding="utf-8")
+    else:
+        print(report)
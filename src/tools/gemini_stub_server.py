@@ -0,0 +1,298 @@
+import argparse
+import asyncio
+import json
+import random
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+
+WORDS = (
+    "the quick brown fox jumps over the lazy dog while a patient model streams "
+    "its answer one token at a time to measure the client"
+).split()
+
+
+@dataclass(slots=True)
+class StubServerConfig:
+    """
+    Behaviour of the stand-in server.
+
+    Attributes:
+        ttft_ms: Delay before the first chunk (or the complete response) is sent.
+        tokens_per_second: Generation speed after the first token.
+        output_tokens: Tokens generated per response, capped by maxOutputTokens.
+        tokens_per_chunk: Tokens per streamed server-sent event.
+        error_rate: Share of requests answered with HTTP 500.
+        rate_limit_rate: Share of requests answered with HTTP 429.
+        retry_after_seconds: Retry-After header sent with 429 responses.
+        seed: Seed of the error injection, None for a random seed.
+    """
+    ttft_ms: float = 300.0
+    tokens_per_second: float = 80.0
+    output_tokens: int = 200
+    tokens_per_chunk: int = 8
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: float = 1.0
+    seed: Optional[int] = None
+
+
+class GeminiStubServer:
+    """
+    Local HTTP/1.1 server mimicking the Gemini REST API for offline benchmarks and tests.
+    Serves models.get, models.list, generateContent, streamGenerateContent (alt=sse) and
+    cachedContents with keep-alive connections, simulated latency and injected errors.
+    """
+
+    def __init__(self, config: Optional[StubServerConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubServerConfig()
+        self._host = host
+        self._port = port
+        self._random = random.Random(self.config.seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats = {"requests": 0, "connections": 0, "status": {}}
+        self._cached_contents = set()
+        # Open keep-alive connections, closed on stop
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1] if self._server else self._port
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self._host}:{self.port}"
+
+    async def start(self):
+        """
+        Start listening on the running event loop.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_connection, self._host, self._port)
+
+    async def stop(self):
+        """
+        Stop listening and close the open keep-alive connections, waiting for their handlers to finish.
+        """
+        if self._server:
+            self._server.close()
+        connections = list(self._connections.items())
+        for task, writer in connections:
+            writer.close()
+            task.cancel()
+        await asyncio.gather(*(task for task, _ in connections), return_exceptions=True)
+        if self._server:
+            await self._server.wait_closed()
+
+    def start_in_thread(self) -> "GeminiStubServer":
+        """
+        Run the server on its own event loop thread, so it does not compete with the client's loop.
+
+        Returns:
+            GeminiStubServer: self, once the server is listening.
+        """
+        ready = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.start())
+            ready.set()
+            loop.run_forever()
+            loop.close()
+
+        threading.Thread(target=run, name="GeminiStubServer", daemon=True).start()
+        ready.wait()
+        return self
+
+    def stop_in_thread(self):
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def get_stats(self) -> Dict:
+        return json.loads(json.dumps(self._stats))
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._stats["connections"] += 1
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                self._stats["requests"] += 1
+                await self._dispatch(writer, method, target, body)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # Cancelled by stop(); the handler task must finish normally, asyncio's stream
+            # callback reports a cancelled connection task as an error
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+        return method, target, headers, body
+
+    async def _dispatch(self, writer: asyncio.StreamWriter, method: str, target: str, body: bytes):
+        url = urlsplit(target)
+        if "/cachedContents" in url.path:
+            return await self._dispatch_cached_content(writer, method, url.path)
+        path = url.path.split("/models", 1)[-1].lstrip("/")
+        model, _, action = path.partition(":")
+
+        if method == "GET" and not model:
+            models = [self._model_resource(name) for name in ("gemini-2.0-flash", "gemini-2.0-flash-lite")]
+            return await self._send_json(writer, 200, {"models": models})
+        if method == "GET":
+            return await self._send_json(writer, 200, self._model_resource(model))
+        if method != "POST" or action not in ("generateContent", "streamGenerateContent"):
+            return await self._send_json(writer, 404, {"error": {"code": 404, "message": "Not found"}})
+
+        injected = self._random.random()
+        if injected < self.config.rate_limit_rate:
+            return await self._send_json(
+                writer, 429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}},
+                {"Retry-After": f"{self.config.retry_after_seconds:g}"},
+            )
+        if injected < self.config.rate_limit_rate + self.config.error_rate:
+            return await self._send_json(writer, 500, {"error": {"code": 500, "status": "INTERNAL"}})
+
+        payload = json.loads(body or b"{}")
+        if payload.get("cachedContent") and payload["cachedContent"] not in self._cached_contents:
+            return await self._send_json(writer, 404, {"error": {"code": 404, "status": "NOT_FOUND"}})
+        max_tokens = (payload.get("generationConfig") or {}).get("maxOutputTokens")
+        token_count = min(self.config.output_tokens, max_tokens or self.config.output_tokens)
+        tokens = [WORDS[index % len(WORDS)] + " " for index in range(token_count)]
+
+        await asyncio.sleep(self.config.ttft_ms / 1000)
+        if action == "generateContent":
+            await asyncio.sleep(token_count / self.config.tokens_per_second)
+            return await self._send_json(writer, 200, self._response_payload("".join(tokens), token_count))
+        await self._stream(writer, tokens)
+
+    async def _dispatch_cached_content(self, writer: asyncio.StreamWriter, method: str, path: str):
+        name = "cachedContents/" + path.split("/cachedContents", 1)[-1].strip("/")
+        if method == "POST":
+            name += f"stub{self._stats['requests']}"
+            self._cached_contents.add(name)
+            return await self._send_json(writer, 200, {"name": name})
+        if name not in self._cached_contents:
+            return await self._send_json(writer, 404, {"error": {"code": 404, "status": "NOT_FOUND"}})
+        if method == "DELETE":
+            self._cached_contents.discard(name)
+            return await self._send_json(writer, 200, {})
+        return await self._send_json(writer, 200, {"name": name})
+
+    async def _stream(self, writer: asyncio.StreamWriter, tokens):
+        self._count_status(200)
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\nConnection: keep-alive\r\n\r\n"
+        )
+        step = self.config.tokens_per_chunk
+        for start in range(0, len(tokens), step):
+            if start:
+                await asyncio.sleep(step / self.config.tokens_per_second)
+            text = "".join(tokens[start:start + step])
+            event = b"data: " + json.dumps(self._response_payload(text, start + step)).encode() + b"\r\n\r\n"
+            writer.write(b"%x\r\n%s\r\n" % (len(event), event))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, payload: Dict,
+                         extra_headers: Optional[Dict[str, str]] = None):
+        self._count_status(status)
+        body = json.dumps(payload).encode()
+        reason = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error"}[status]
+        headers = "".join(f"{name}: {value}\r\n" for name, value in (extra_headers or {}).items())
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n{headers}\r\n".encode() + body
+        )
+        await writer.drain()
+
+    def _count_status(self, status: int):
+        self._stats["status"][str(status)] = self._stats["status"].get(str(status), 0) + 1
+
+    @staticmethod
+    def _model_resource(model: str) -> Dict:
+        return {
+            "name": f"models/{model}",
+            "displayName": model,
+            "inputTokenLimit": 1048576,
+            "outputTokenLimit": 8192,
+            "supportedGenerationMethods": ["generateContent", "countTokens"],
+        }
+
+    @staticmethod
+    def _response_payload(text: str, token_count: int) -> Dict:
+        return {
+            "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}],
+            "usageMetadata": {"candidatesTokenCount": token_count},
+        }
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    """
+    Add the StubServerConfig fields as command line options.
+    """
+    defaults = StubServerConfig()
+    parser.add_argument("--ttft-ms", type=float, default=defaults.ttft_ms, help="Time to first token in ms")
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    parser.add_argument("--output-tokens", type=int, default=defaults.output_tokens)
+    parser.add_argument("--tokens-per-chunk", type=int, default=defaults.tokens_per_chunk)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="Share of HTTP 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=defaults.rate_limit_rate,
+                        help="Share of HTTP 429 responses")
+    parser.add_argument("--retry-after-seconds", type=float, default=defaults.retry_after_seconds)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def config_from_arguments(args: argparse.Namespace) -> StubServerConfig:
+    return StubServerConfig(**{name: getattr(args, name) for name in asdict(StubServerConfig())})
+
+
+async def _serve(server: GeminiStubServer):
+    await server.start()
+    print(f"Gemini stand-in server listening on {server.base_url}", flush=True)
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Gemini REST API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(GeminiStubServer(config_from_arguments(args), args.host, args.port)))
+    except KeyboardInterrupt:
+        pass
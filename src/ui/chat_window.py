@@ -15,6 +15,10 @@ from src.utils.chat_history import ChatHistory
 from src.utils.log_manager import LogManager
 from src.utils.config_manager import ConfigManager
 from src.utils.path_manager import get_assets_path
+from src.clients.cancellation import CancellationToken, RequestCancelledError
+from src.clients.request_options import RequestOptions, RequestPriority
+from src.clients.session_pool import CHAT_SESSION
+from src.utils.chunk_coalescer import ChunkCoalescer
 
 class ChatWindow(QMainWindow):
     def __init__(self, on_window_close_callback=None):
@@ -262,7 +266,8 @@ class ChatWindow(QMainWindow):
             self._stop_request()
     
     def _stop_request(self):
-        self._api_client.cancel_request()
+        if self._api_thread is not None:
+            self._api_thread.cancel()
 
     def _send_message(self):
         """
@@ -474,7 +479,7 @@ class APIRequestThread(QThread):
     """
     Thread for making OpenAI API requests without blocking the UI
     """
-    chunk_received = pyqtSignal(str)  # Signal for each streamed chunk
+    chunk_received = pyqtSignal(str)  # Signal for each batch of streamed chunks
     finished = pyqtSignal()         # Signal when request is complete
 
     def __init__(self, user_message, api_client):
@@ -488,14 +493,32 @@ class APIRequestThread(QThread):
         super().__init__()
         self._user_message = user_message
         self._api_client = api_client
+        self._cancellation = CancellationToken()
+        self._flush_settings = ConfigManager.get_instance().get_value('stream_flush')
+
+    def cancel(self):
+        """
+        Abort the request, closing its connection immediately
+        """
+        self._cancellation.cancel()
 
     def run(self):
         """
         Perform the API request in a separate thread
         """
+        # Emit chunks in batches, so fast streams do not flood the GUI thread with display updates
+        coalescer = ChunkCoalescer(
+            self.chunk_received.emit, self._flush_settings.interval_ms, self._flush_settings.max_chars
+        )
         try:
-            for chunk in self._api_client.send_request(self._user_message):
-                if chunk:  # Emit each chunk as it arrives
-                    self.chunk_received.emit(chunk)
+            options = RequestOptions(
+                session=CHAT_SESSION, cancellation=self._cancellation, prompt_id="chat",
+                priority=RequestPriority.NORMAL,
+            )
+            for chunk in self._api_client.send_request(self._user_message, options=options):
+                coalescer.add(chunk)
+        except RequestCancelledError:
+            pass
         finally:
+            coalescer.close()
             self.finished.emit()
\ No newline at end of file
@@ -1,6 +1,8 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QCheckBox, QGroupBox, QMessageBox, QComboBox
 )
+from PyQt5.QtCore import pyqtSignal
+from typing import List
 import copy
 
 import sys
@@ -13,8 +15,11 @@ sys.path.append(str(root_dir))
 from src.utils.credential_manager import CredentialManager
 from src.utils.config_manager import ConfigManager
 from src.utils.log_manager import LogManager
+from src.utils.model_catalogue import ModelCatalogue
 
 class APITab(QWidget):
+    models_refreshed = pyqtSignal(str, list)
+
     def __init__(self, parent=None):
         """
         Initialize API settings tab
@@ -25,6 +30,7 @@ class APITab(QWidget):
         self._config_manager = ConfigManager.get_instance()
         self._api_client = self._config_manager.get_api_client()
         self._api_clients = copy.deepcopy(self._config_manager.get_value('api_clients'))
+        self._model_catalogue = ModelCatalogue.get_instance()
 
         # Initialize UI variables
         self._api_key_input = None
@@ -35,6 +41,13 @@ class APITab(QWidget):
         # Create UI components
         try:
             self._create_widgets()
+            # Catalogue refreshes arrive on a background thread, hand them to the GUI thread
+            self.models_refreshed.connect(self._on_models_refreshed)
+            listener = self.models_refreshed.emit
+            self._model_catalogue.add_listener(listener)
+            # The catalogue outlives the tab, so it must not keep calling into a destroyed widget
+            catalogue = self._model_catalogue
+            self.destroyed.connect(lambda: catalogue.remove_listener(listener))
             self._load_config()
             self._log_manager.log_info("API tab initialized.")
         except Exception as e:
@@ -155,27 +168,40 @@ class APITab(QWidget):
                 self._api_key_input.setText(api_key)
                 self._api_key_old = api_key
 
-            if self._api_client.name == 'openai':
-                available_models = [
-                    model for model in self._api_client.get_available_models()
-                    if "gpt" in model or "o1" in model
-                ]
-            elif self._api_client.name == 'gemini':
-                available_models = [
-                    model for model in self._api_client.get_available_models()
-                ]
-            
-            if available_models:
-                self._model_combo.addItems(available_models)
-            
-            if model in available_models:
-                self._model_combo.setCurrentText(model)
+            self._populate_models(self._model_catalogue.get_model_names(self._api_client), model)
 
             self._log_manager.log_info("API tab configuration loaded")
         except Exception as e:
             self._log_manager.log_error(f"Failed to load API tab configuration", error = e)
             raise
 
+    def _populate_models(self, model_names: List[str], selected_model: str):
+        """
+        Fill the model dropdown, always keeping the selected model available
+        """
+        if self._api_client.name == 'openai':
+            available_models = [name for name in model_names if "gpt" in name or "o1" in name]
+        else:
+            available_models = list(model_names)
+
+        if selected_model and selected_model not in available_models:
+            available_models.insert(0, selected_model)
+
+        self._model_combo.blockSignals(True)
+        self._model_combo.clear()
+        self._model_combo.addItems(available_models)
+        if selected_model:
+            self._model_combo.setCurrentText(selected_model)
+        self._model_combo.blockSignals(False)
+
+    def _on_models_refreshed(self, provider: str, models: list):
+        """
+        Update the model dropdown after a background catalogue refresh
+        """
+        if provider != self._api_client.name:
+            return
+        self._populate_models([details['name'] for details in models], self._model_combo.currentText())
+
     def get_config(self) -> dict:
         """
         Get current configuration from widgets
@@ -128,6 +128,15 @@ class PromptsTab(QWidget):
             self._output_on_separate_window_checkbox = QCheckBox("Output on Separate Window")
             self._output_on_separate_window_checkbox.stateChanged.connect(self._on_field_change)
 
+            self._cache_response_checkbox = QCheckBox("Cache Responses")
+            self._cache_response_checkbox.stateChanged.connect(self._on_field_change)
+
+            self._stream_output_checkbox = QCheckBox("Stream Output")
+            self._stream_output_checkbox.stateChanged.connect(self._on_field_change)
+
+            self._accept_images_checkbox = QCheckBox("Accept Clipboard Images")
+            self._accept_images_checkbox.stateChanged.connect(self._on_field_change)
+
             behavior_layout.addWidget(self._clear_history_checkbox, 0, 0)
             behavior_layout.addWidget(text_selected_label, 1, 0)
             behavior_layout.addWidget(self._text_selected_dropdown, 1, 1)
@@ -135,6 +144,9 @@ class PromptsTab(QWidget):
             behavior_layout.addWidget(self._no_text_selected_dropdown, 2, 1)
             behavior_layout.addWidget(self._additional_input_checkbox, 0, 1)
             behavior_layout.addWidget(self._output_on_separate_window_checkbox, 0, 2)
+            behavior_layout.addWidget(self._cache_response_checkbox, 1, 2)
+            behavior_layout.addWidget(self._stream_output_checkbox, 2, 2)
+            behavior_layout.addWidget(self._accept_images_checkbox, 3, 2)
 
             behaviour_group.setLayout(behavior_layout)
 
@@ -297,6 +309,9 @@ class PromptsTab(QWidget):
 
             additional_input = self._additional_input_checkbox.isChecked()
             output_on_separate_window = self._output_on_separate_window_checkbox.isChecked()
+            cache_response = self._cache_response_checkbox.isChecked()
+            stream_output = self._stream_output_checkbox.isChecked()
+            accept_images = self._accept_images_checkbox.isChecked()
 
             hotkey = self._hotkey_widget.get_hotkey()
             hotkey_enabled = self._hotkey_enabled_checkbox.isChecked()
@@ -331,8 +346,12 @@ class PromptsTab(QWidget):
                         text_selected=text_selected,
                         no_text_selected=no_text_selected,
                         additional_input=additional_input,
-                        output_on_separate_window=output_on_separate_window
-                    )
+                        output_on_separate_window=output_on_separate_window,
+                        cache_response=cache_response,
+                        stream_output=stream_output,
+                        accept_images=accept_images
+                    ),
+                    generation=self._current_prompt.generation
                 )) for k in keys}
 
                 self._modified_prompts = new_dict
@@ -351,8 +370,12 @@ class PromptsTab(QWidget):
                             text_selected=text_selected,
                             no_text_selected=no_text_selected,
                             additional_input=additional_input,
-                            output_on_separate_window=output_on_separate_window
-                        )
+                            output_on_separate_window=output_on_separate_window,
+                            cache_response=cache_response,
+                            stream_output=stream_output,
+                            accept_images=accept_images
+                        ),
+                        generation=self._current_prompt.generation
                 )
             
             self._changes = False
@@ -470,6 +493,9 @@ class PromptsTab(QWidget):
             
             self._additional_input_checkbox.setChecked(self._current_prompt.behavior.additional_input)
             self._output_on_separate_window_checkbox.setChecked(self._current_prompt.behavior.output_on_separate_window)
+            self._cache_response_checkbox.setChecked(self._current_prompt.behavior.cache_response)
+            self._stream_output_checkbox.setChecked(self._current_prompt.behavior.stream_output)
+            self._accept_images_checkbox.setChecked(self._current_prompt.behavior.accept_images)
 
             self._hotkey_widget.set_hotkey(self._current_prompt.hotkey)
             self._hotkey_enabled_checkbox.setChecked(self._current_prompt.hotkey_enabled)
@@ -492,6 +518,9 @@ class PromptsTab(QWidget):
             self._no_text_selected_dropdown.setCurrentIndex(0)
             self._additional_input_checkbox.setChecked(False)
             self._output_on_separate_window_checkbox.setChecked(False)
+            self._cache_response_checkbox.setChecked(False)
+            self._stream_output_checkbox.setChecked(False)
+            self._accept_images_checkbox.setChecked(False)
 
             # Reset Hotkey
             self._hotkey_widget.set_hotkey("")
@@ -0,0 +1,84 @@
+import time
+from threading import Condition, Thread
+from typing import Callable, List, Optional
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+
+
+class ChunkCoalescer:
+    """
+    Buffers streamed chunks and delivers them in batches, at most once per interval unless
+    the buffer exceeds its size budget. The first chunk after a quiet interval is delivered
+    immediately, buffered chunks are delivered by a flusher thread even if the stream pauses.
+    """
+
+    def __init__(self, deliver: Callable[[str], None], interval_ms: int = 33, max_chars: int = 2048):
+        """
+        Args:
+            deliver: Called with the joined text of each batch, in order and never concurrently.
+            interval_ms: Minimum time between two deliveries.
+            max_chars: Buffer size that is delivered without waiting for the interval.
+        """
+        self._deliver = deliver
+        self._interval = interval_ms / 1000
+        self._max_chars = max_chars
+        self._condition = Condition()
+        self._buffer: List[str] = []
+        self._size = 0
+        self._last_flush = float('-inf')
+        # One flusher per stream, started with the first buffered chunk and stopped by close()
+        self._flusher: Optional[Thread] = None
+        self._closed = False
+
+    def add(self, chunk: str):
+        """
+        Buffer a chunk, delivering the buffer if the interval has passed or the buffer is full.
+        """
+        with self._condition:
+            if self._closed or not chunk:
+                return
+            self._buffer.append(chunk)
+            self._size += len(chunk)
+            if self._size >= self._max_chars or time.monotonic() - self._last_flush >= self._interval:
+                self._flush()
+                return
+            if self._flusher is None:
+                self._flusher = Thread(target=self._flush_loop, name="ChunkCoalescer", daemon=True)
+                self._flusher.start()
+            else:
+                self._condition.notify()
+
+    def _flush_loop(self):
+        with self._condition:
+            while not self._closed:
+                if not self._buffer:
+                    self._condition.wait()
+                    continue
+                remaining = self._last_flush + self._interval - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                self._flush()
+
+    def _flush(self):
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        text = "".join(self._buffer)
+        self._buffer = []
+        self._size = 0
+        self._deliver(text)
+
+    def close(self):
+        """
+        Deliver the remaining buffer as the final batch. Later chunks are ignored.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._flush()
+            self._closed = True
+            self._condition.notify()
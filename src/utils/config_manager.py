@@ -1,6 +1,6 @@
 import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 root_dir = Path(__file__).parent.parent.parent
 sys.path.append(str(root_dir))
@@ -110,22 +110,26 @@ class ConfigManager:
             self._log_manager.log_error(f"Failed to set attribute '{key}'", error=e)
             raise
 
-    def get_api_client(self):
+    def get_api_client(self, provider: Optional[str] = None):
+        """
+        Get the client of a provider, the configured api_provider if None.
+        """
         from src.clients.gemini_api_client import GeminiClient
+        from src.clients.openai_api_client import OpenAIClient
 
-        api = self._config.general_config.api_provider
+        api = provider or self._config.general_config.api_provider
         if not api:
             raise KeyError("Missing 'api_provider' in configuration file.")
 
         if api == "openai":
             if not self._config.api_clients[api].model:
                 self._config.api_clients[api].model = "gpt-4o"
-            return OpenAIClient().get_instance()
+            return OpenAIClient.get_instance()
 
         elif api == "gemini":
             if not self._config.api_clients[api].model:
                 self._config.api_clients[api].model = "gemini-2.0-flash"
-            return GeminiClient().get_instance()
+            return GeminiClient.get_instance()
 
     def _get_default_config(self):
         """
@@ -1,4 +1,6 @@
+import hashlib
 import sys
+import time
 from pathlib import Path
 
 import keyring
@@ -9,6 +11,11 @@ sys.path.append(str(root_dir))
 from src.utils.config_manager import ConfigManager
 from src.utils.dataclasses import APIClient
 from src.utils.log_manager import LogManager
+from src.utils.json_manager import JsonManager
+from src.utils.path_manager import get_key_validation_file
+
+# Cached validations older than this are re-checked before startup continues
+KEY_VALIDATION_MAX_AGE = 30 * 24 * 3600
 
 
 class CredentialManager:
@@ -120,6 +127,70 @@ class CredentialManager:
             self._log_manager.log_error("Failed to get API key", error=e)
             raise
 
+    @staticmethod
+    def _fingerprint(api_key: str) -> str:
+        """
+        Return a non-reversible fingerprint of an API key
+        """
+        return hashlib.sha256(f"Promptly:{api_key}".encode()).hexdigest()
+
+    def _load_validations(self) -> dict:
+        try:
+            return JsonManager.load_from_file(get_key_validation_file()) or {}
+        except Exception as e:
+            self._log_manager.log_error("Failed to load key validations", error=e)
+            return {}
+
+    def mark_api_key_validated(self, api_provider: str, api_key: str):
+        """
+        Remember that an API key was successfully validated
+
+        Args:
+            api_provider: The provider the key belongs to
+            api_key: The validated API key
+        """
+        try:
+            validations = self._load_validations()
+            validations[api_provider] = {
+                "fingerprint": self._fingerprint(api_key),
+                "validatedAt": time.time(),
+            }
+            JsonManager.save_to_file(validations, get_key_validation_file())
+        except Exception as e:
+            self._log_manager.log_error("Failed to store key validation", error=e)
+
+    def is_api_key_validated(self, api_provider: str, api_key: str) -> bool:
+        """
+        Check whether an API key matches a recent successful validation
+
+        Args:
+            api_provider: The provider the key belongs to
+            api_key: The API key to check
+
+        Returns:
+            bool: True if the key was validated within KEY_VALIDATION_MAX_AGE
+        """
+        if not api_key:
+            return False
+        validation = self._load_validations().get(api_provider)
+        if not validation:
+            return False
+        return (
+            validation.get("fingerprint") == self._fingerprint(api_key)
+            and time.time() - validation.get("validatedAt", 0) < KEY_VALIDATION_MAX_AGE
+        )
+
+    def clear_api_key_validation(self, api_provider: str):
+        """
+        Forget the cached validation of a provider's API key
+        """
+        try:
+            validations = self._load_validations()
+            if validations.pop(api_provider, None) is not None:
+                JsonManager.save_to_file(validations, get_key_validation_file())
+        except Exception as e:
+            self._log_manager.log_error("Failed to clear key validation", error=e)
+
     def delete_api_key(self):
         """
         Delete the stored API key
@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from dataclass_wizard import JSONWizard
 
 @dataclass(slots=True)
@@ -8,6 +8,11 @@ class GeneralConfig(JSONWizard):
     autostart: bool
     api_provider: Optional[str]
 
+@dataclass(slots=True)
+class RateLimit(JSONWizard):
+    rpm: Optional[int] = None
+    tpm: Optional[int] = None
+
 @dataclass(slots=True)
 class APIClient(JSONWizard):
     api_key_encrypted: str
@@ -15,6 +20,10 @@ class APIClient(JSONWizard):
     temperature: Optional[float]
     max_tokens: Optional[int]
     timeout: Optional[int]
+    base_url: Optional[str] = None
+    rate_limits: Dict[str, RateLimit] = field(default_factory=dict)
+    max_retries: int = 3
+    stop_sequences: Optional[List[str]] = None
 
 class TextSelectionBehaviour(Enum):
     SKIP = 'skip'
@@ -37,6 +46,17 @@ class PromptBehavior(JSONWizard):
     no_text_selected: TextSelectionBehaviour
     additional_input: bool
     output_on_separate_window: bool
+    cache_response: bool = False
+    stream_output: bool = False
+    accept_images: bool = False
+
+@dataclass(slots=True)
+class GenerationSettings(JSONWizard):
+    max_output_tokens: Optional[int] = None
+    stop_sequences: Optional[List[str]] = None
+    temperature: Optional[float] = None
+    deadline_seconds: Optional[float] = None
+    latency_target_ms: Optional[int] = None
 
 @dataclass(slots=True)
 class Prompt(JSONWizard):
@@ -46,6 +66,7 @@ class Prompt(JSONWizard):
     hotkey: str
     hotkey_enabled: bool
     behavior: PromptBehavior
+    generation: GenerationSettings = field(default_factory=GenerationSettings)
 
 @dataclass(slots=True)
 class SystemHotkey(JSONWizard):
@@ -53,9 +74,134 @@ class SystemHotkey(JSONWizard):
     hotkey_enabled: bool
     callback: str  
 
+@dataclass(slots=True)
+class ResponseCacheConfig(JSONWizard):
+    max_memory_entries: int = 256
+    max_disk_entries: int = 2000
+    max_disk_bytes: int = 20 * 1024 * 1024
+    ttl_seconds: int = 7 * 24 * 3600
+
+@dataclass(slots=True)
+class SemanticCacheConfig(JSONWizard):
+    enabled: bool = False
+    similarity_threshold: float = 0.98
+    capacity: int = 1024
+    embedder: str = 'local'
+    dimensions: int = 512
+
+@dataclass(slots=True)
+class WarmupConfig(JSONWizard):
+    enabled: bool = True
+    keepalive_interval_seconds: int = 45
+    idle_after_seconds: int = 600
+
+@dataclass(slots=True)
+class HedgingConfig(JSONWizard):
+    enabled: bool = False
+    delay_ms: int = 1500
+    secondary_model: Optional[str] = None
+    secondary_base_url: Optional[str] = None
+
+@dataclass(slots=True)
+class ChatContextConfig(JSONWizard):
+    max_context_tokens: int = 8000
+    summarize: bool = False
+    summary_max_words: int = 200
+
+@dataclass(slots=True)
+class TelemetryConfig(JSONWizard):
+    enabled: bool = True
+    retention_days: int = 30
+
+@dataclass(slots=True)
+class ContextCacheConfig(JSONWizard):
+    enabled: bool = False
+    min_prefix_tokens: int = 1024
+    ttl_seconds: int = 3600
+    refresh_margin_seconds: int = 300
+    max_entries: int = 16
+
+@dataclass(slots=True)
+class SingleFlightConfig(JSONWizard):
+    enabled: bool = True
+
+@dataclass(slots=True)
+class StreamFlushConfig(JSONWizard):
+    interval_ms: int = 33
+    max_chars: int = 2048
+
+@dataclass(slots=True)
+class RoutingRule(JSONWizard):
+    model: str
+    prompt_ids: Optional[List[str]] = None
+    min_input_tokens: int = 0
+    max_input_tokens: Optional[int] = None
+
+@dataclass(slots=True)
+class RoutingConfig(JSONWizard):
+    enabled: bool = False
+    rules: List[RoutingRule] = field(default_factory=list)
+    learn_latency: bool = True
+    ewma_alpha: float = 0.2
+
+@dataclass(slots=True)
+class SessionPoolConfig(JSONWizard):
+    max_sessions: int = 16
+
+@dataclass(slots=True)
+class HotkeyPoolConfig(JSONWizard):
+    max_workers: int = 4
+    max_pending_jobs: int = 16
+
+@dataclass(slots=True)
+class CircuitBreakerConfig(JSONWizard):
+    enabled: bool = False
+    failure_threshold: int = 3
+    error_rate_threshold: float = 0.5
+    min_requests: int = 5
+    window_seconds: int = 60
+    slow_call_ms: Optional[int] = None
+    open_seconds: int = 30
+    half_open_probes: int = 1
+    fallback_provider: Optional[str] = None
+    fallback_model: Optional[str] = None
+
+@dataclass(slots=True)
+class LaneConfig(JSONWizard):
+    max_concurrent: Optional[int] = None
+    rate_share: float = 1.0
+
+@dataclass(slots=True)
+class LanesConfig(JSONWizard):
+    hotkey: LaneConfig = field(default_factory=LaneConfig)
+    chat: LaneConfig = field(default_factory=lambda: LaneConfig(max_concurrent=4, rate_share=0.9))
+    background: LaneConfig = field(default_factory=lambda: LaneConfig(max_concurrent=2, rate_share=0.5))
+
+@dataclass(slots=True)
+class ImageInputConfig(JSONWizard):
+    max_dimension: int = 1536
+    format: str = "WEBP"
+    quality: int = 80
+    cache_entries: int = 8
+
 @dataclass(slots=True)
 class Config(JSONWizard):
     general_config: GeneralConfig
     api_clients: Dict[str, APIClient]
     prompts: Dict[str, Prompt]
-    system_hotkeys: Dict[str, SystemHotkey]
\ No newline at end of file
+    system_hotkeys: Dict[str, SystemHotkey]
+    response_cache: ResponseCacheConfig = field(default_factory=ResponseCacheConfig)
+    semantic_cache: SemanticCacheConfig = field(default_factory=SemanticCacheConfig)
+    warmup: WarmupConfig = field(default_factory=WarmupConfig)
+    hedging: HedgingConfig = field(default_factory=HedgingConfig)
+    chat_context: ChatContextConfig = field(default_factory=ChatContextConfig)
+    telemetry: TelemetryConfig = field(default_factory=TelemetryConfig)
+    hotkey_pool: HotkeyPoolConfig = field(default_factory=HotkeyPoolConfig)
+    context_cache: ContextCacheConfig = field(default_factory=ContextCacheConfig)
+    session_pool: SessionPoolConfig = field(default_factory=SessionPoolConfig)
+    routing: RoutingConfig = field(default_factory=RoutingConfig)
+    stream_flush: StreamFlushConfig = field(default_factory=StreamFlushConfig)
+    single_flight: SingleFlightConfig = field(default_factory=SingleFlightConfig)
+    circuit_breaker: CircuitBreakerConfig = field(default_factory=CircuitBreakerConfig)
+    lanes: LanesConfig = field(default_factory=LanesConfig)
+    image_input: ImageInputConfig = field(default_factory=ImageInputConfig)
\ No newline at end of file
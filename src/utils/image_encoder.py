@@ -0,0 +1,144 @@
+import base64
+import hashlib
+import io
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Optional
+
+try:
+    from PIL import Image
+except ImportError:  # Image input is optional and disables itself without Pillow
+    Image = None
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.utils.config_manager import ConfigManager
+from src.utils.log_manager import LogManager
+
+MIME_TYPES = {"WEBP": "image/webp", "JPEG": "image/jpeg", "PNG": "image/png"}
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedImage:
+    """
+    An image ready for upload.
+
+    Attributes:
+        mime_type: MIME type of the encoded data, e.g. 'image/webp'.
+        data: Base64 encoded image data.
+        digest: Hash of the source image, identifies the image in cache and single-flight keys.
+        width: Width after downscaling.
+        height: Height after downscaling.
+    """
+    mime_type: str
+    data: str
+    digest: str
+    width: int
+    height: int
+
+
+class ImageEncoder:
+    """
+    Singleton that prepares images for upload in a worker thread.
+    Images are downscaled to image_input.max_dimension, which is about the resolution the model
+    works with anyway, and re-encoded to a compact format. Results are kept in a small LRU cache
+    keyed by a hash of the source pixels, so the same screenshot is only encoded once.
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = ImageEncoder()
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self._log_manager = LogManager.get_instance()
+        self._config_manager = ConfigManager.get_instance()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-encoder")
+        self._lock = Lock()
+        self._cache: "OrderedDict[tuple, EncodedImage]" = OrderedDict()
+        self._stats = {"encoded": 0, "cache_hits": 0, "input_bytes": 0, "output_bytes": 0}
+
+        if Image is None:
+            self._log_manager.log_warning("Pillow is not installed, image input is disabled.")
+        self._log_manager.log_info("ImageEncoder initialized")
+
+    def is_available(self) -> bool:
+        return Image is not None
+
+    def submit(self, image: "Image.Image") -> Future:
+        """
+        Encode an image in the worker thread.
+
+        Args:
+            image (Image.Image): The source image.
+
+        Returns:
+            Future: Resolves to the EncodedImage, or None if the image could not be encoded.
+        """
+        return self._executor.submit(self._encode, image)
+
+    def _encode(self, image: "Image.Image") -> Optional[EncodedImage]:
+        try:
+            settings = self._config_manager.get_value("image_input")
+            image_format = settings.format.upper()
+            if image_format not in MIME_TYPES:
+                self._log_manager.log_warning(f"Unsupported image format {settings.format}, using WEBP.")
+                image_format = "WEBP"
+            source = image.tobytes()
+            digest = hashlib.sha256(
+                f"{image.mode}:{image.width}x{image.height}:".encode("utf-8") + source
+            ).hexdigest()
+            key = (digest, settings.max_dimension, image_format, settings.quality)
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self._stats["cache_hits"] += 1
+                    return cached
+
+            resized = image.copy()
+            resized.thumbnail((settings.max_dimension, settings.max_dimension), Image.LANCZOS)
+            if image_format == "JPEG" and resized.mode != "RGB":
+                resized = resized.convert("RGB")
+            elif resized.mode not in ("RGB", "RGBA", "L", "LA"):
+                resized = resized.convert("RGBA")
+            buffer = io.BytesIO()
+            resized.save(buffer, format=image_format, quality=settings.quality, optimize=True)
+            encoded = EncodedImage(
+                mime_type=MIME_TYPES[image_format],
+                data=base64.b64encode(buffer.getvalue()).decode("ascii"),
+                digest=digest, width=resized.width, height=resized.height,
+            )
+
+            with self._lock:
+                self._cache[key] = encoded
+                while len(self._cache) > max(1, settings.cache_entries):
+                    self._cache.popitem(last=False)
+                self._stats["encoded"] += 1
+                self._stats["input_bytes"] += len(source)
+                self._stats["output_bytes"] += buffer.tell()
+            self._log_manager.log_info(
+                f"Encoded {image.width}x{image.height} image to {encoded.width}x{encoded.height} "
+                f"{image_format}, {buffer.tell() / 1024:.0f} KB."
+            )
+            return encoded
+        except Exception as e:
+            self._log_manager.log_error("Failed to encode image.", error=e)
+            return None
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Returns how many images were encoded or served from the cache, and the bytes before and after encoding.
+        """
+        with self._lock:
+            return {"cached": len(self._cache), **self._stats}
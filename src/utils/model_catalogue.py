@@ -0,0 +1,131 @@
+import time
+from threading import Lock, Thread
+from typing import Callable, Dict, List, Optional
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.utils.json_manager import JsonManager
+from src.utils.log_manager import LogManager
+from src.utils.path_manager import get_model_catalogue_file
+
+# Catalogues older than this are served as-is but refreshed in the background
+CATALOGUE_TTL_SECONDS = 24 * 3600
+
+
+class ModelCatalogue:
+    """
+    Singleton persistent cache of the models offered by each API provider.
+    Serves the stored catalogue immediately, stale or not, and revalidates it in the background.
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = ModelCatalogue()
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self._log_manager = LogManager.get_instance()
+        self._catalogue_file = get_model_catalogue_file()
+        self._lock = Lock()
+        self._refreshing = set()
+        self._listeners: List[Callable[[str, List[Dict]], None]] = []
+        self._load_catalogue()
+
+        self._log_manager.log_info("ModelCatalogue initialized")
+
+    def _load_catalogue(self):
+        """
+        Load the stored catalogue from file
+        """
+        try:
+            self._catalogue: Dict[str, Dict] = JsonManager.load_from_file(self._catalogue_file) or {}
+        except Exception as e:
+            self._log_manager.log_error("Failed to load model catalogue", error = e)
+            self._catalogue = {}
+
+    def add_listener(self, listener: Callable[[str, List[Dict]], None]):
+        """
+        Register a callback invoked with (provider, models) after a background refresh.
+        The callback runs on the refresh thread.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, List[Dict]], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def get_models(self, api_client) -> List[Dict]:
+        """
+        Return the stored models of a provider and refresh them in the background when stale
+
+        Args:
+            api_client: The BaseAPIClient whose models are requested
+
+        Returns:
+            List[Dict]: Stored model details, empty if nothing was fetched yet
+        """
+        with self._lock:
+            entry = self._catalogue.get(api_client.name)
+        if entry is None or time.time() - entry.get('fetchedAt', 0) > CATALOGUE_TTL_SECONDS:
+            self.refresh(api_client)
+        return list(entry['models']) if entry else []
+
+    def get_model_names(self, api_client) -> List[str]:
+        """
+        Return the stored model names of a provider
+        """
+        return [model['name'] for model in self.get_models(api_client)]
+
+    def get_model_info(self, provider: str, model: str) -> Optional[Dict]:
+        """
+        Return the stored metadata of a single model, without triggering a refresh
+
+        Args:
+            provider: Name of the API provider
+            model: Model name
+
+        Returns:
+            Optional[Dict]: The model details or None if unknown
+        """
+        with self._lock:
+            entry = self._catalogue.get(provider)
+        if not entry:
+            return None
+        return next((details for details in entry['models'] if details['name'] == model), None)
+
+    def refresh(self, api_client):
+        """
+        Fetch the provider's models on a background thread unless a refresh is already running
+        """
+        with self._lock:
+            if api_client.name in self._refreshing:
+                return
+            self._refreshing.add(api_client.name)
+        Thread(target=self._refresh_worker, args=(api_client,), daemon=True).start()
+
+    def _refresh_worker(self, api_client):
+        provider = api_client.name
+        try:
+            models = api_client.get_model_details()
+            if not models:
+                self._log_manager.log_warning(f"Model catalogue refresh for {provider} returned no models.")
+                return
+            with self._lock:
+                self._catalogue[provider] = {'fetchedAt': time.time(), 'models': models}
+                JsonManager.save_to_file(self._catalogue, self._catalogue_file)
+            self._log_manager.log_info(f"Model catalogue for {provider} refreshed ({len(models)} models).")
+            for listener in list(self._listeners):
+                listener(provider, models)
+        except Exception as e:
+            self._log_manager.log_error(f"Failed to refresh model catalogue for {provider}", error = e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(provider)
@@ -14,6 +14,10 @@ ASSETS_DIR = BASE_DIR / "assets"
 
 # Files
 CHAT_HISTORY_FILE = CONFIG_DIR / "chathistory.json"
+RESPONSE_CACHE_DIR = CONFIG_DIR / "response_cache"
+KEY_VALIDATION_FILE = CONFIG_DIR / "key_validation.json"
+MODEL_CATALOGUE_FILE = CONFIG_DIR / "model_catalogue.json"
+TELEMETRY_DIR = LOGS_DIR / "telemetry"
 
 def ensure_directories():
     """
@@ -47,6 +51,30 @@ def get_chat_history_file() -> Path:
     """
     return CHAT_HISTORY_FILE
 
+def get_response_cache_path() -> Path:
+    """
+    Returns the path to the on-disk response cache directory
+    """
+    return RESPONSE_CACHE_DIR
+
+def get_key_validation_file() -> Path:
+    """
+    Returns the path to the 'key_validation.json' file
+    """
+    return KEY_VALIDATION_FILE
+
+def get_model_catalogue_file() -> Path:
+    """
+    Returns the path to the 'model_catalogue.json' file
+    """
+    return MODEL_CATALOGUE_FILE
+
+def get_telemetry_path() -> Path:
+    """
+    Returns the path to the request telemetry directory
+    """
+    return TELEMETRY_DIR
+
 def get_assets_path() -> Path:
     """
     Return the path to the assets files
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.utils.config_manager import ConfigManager
+from src.utils.log_manager import LogManager
+from src.utils.path_manager import get_response_cache_path
+
+
+class ResponseCache:
+    """
+    Singleton exact-match cache for prompt responses.
+    Keeps a small LRU tier in memory and a larger size- and TTL-bounded tier on disk.
+    Entries expire a fixed time after they were stored, reads do not extend their lifetime.
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = ResponseCache()
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self._log_manager = LogManager.get_instance()
+        self._settings = ConfigManager.get_instance().get_value('response_cache')
+        self._cache_dir = get_response_cache_path()
+        self._lock = Lock()
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # key -> (last access time, creation time, file size) for the disk tier
+        self._disk_index: Dict[str, Tuple[float, float, int]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._load_disk_index()
+
+        self._log_manager.log_info("ResponseCache initialized")
+
+    @staticmethod
+    def make_key(model: str, prompt: str, context_digest: str = "") -> str:
+        """
+        Build the cache key for a request
+
+        Args:
+            model: Model name
+            prompt: Fully rendered prompt
+            context_digest: Digest of the chat history sent along with the prompt
+
+        Returns:
+            str: Hex digest identifying the request
+        """
+        material = json.dumps([model, prompt, context_digest], ensure_ascii=False)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _load_disk_index(self):
+        """
+        Scan the cache directory and build the disk index
+        """
+        try:
+            if not self._cache_dir.exists():
+                return
+            for entry_file in self._cache_dir.glob("*.json"):
+                # Entry files are never modified after they were written, so their mtime is the creation time
+                stat = entry_file.stat()
+                self._disk_index[entry_file.stem] = (stat.st_mtime, stat.st_mtime, stat.st_size)
+            self._evict_disk()
+        except Exception as e:
+            self._log_manager.log_error("Failed to load response cache index", error = e)
+
+    def _is_expired(self, created_at: float) -> bool:
+        return time.time() - created_at > self._settings.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Optional[str]: The cached response or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, response = entry
+                if not self._is_expired(created_at):
+                    self._memory.move_to_end(key)
+                    self._hits += 1
+                    return response
+                del self._memory[key]
+
+            response = self._read_disk_entry(key)
+            if response is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return response
+
+    def _read_disk_entry(self, key: str) -> Optional[str]:
+        """
+        Read an entry from the disk tier and promote it to memory
+        """
+        if key not in self._disk_index:
+            return None
+        entry_file = self._cache_dir / f"{key}.json"
+        try:
+            with open(entry_file, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if self._is_expired(data['createdAt']):
+                self._remove_disk_entry(key)
+                return None
+            _, created_at, size = self._disk_index[key]
+            self._disk_index[key] = (time.time(), created_at, size)
+            self._put_memory(key, data['createdAt'], data['response'])
+            return data['response']
+        except Exception as e:
+            self._log_manager.log_error("Failed to read response cache entry", error = e)
+            self._remove_disk_entry(key)
+            return None
+
+    def put(self, key: str, model: str, response: str):
+        """
+        Store a response in both cache tiers
+
+        Args:
+            key: Cache key from make_key()
+            model: Model that produced the response
+            response: The response text
+        """
+        if not response:
+            return
+        created_at = time.time()
+        with self._lock:
+            self._put_memory(key, created_at, response)
+            try:
+                self._cache_dir.mkdir(parents=True, exist_ok=True)
+                entry_file = self._cache_dir / f"{key}.json"
+                temp_file = entry_file.with_suffix('.tmp')
+                with open(temp_file, 'w', encoding='utf-8') as file:
+                    json.dump({'model': model, 'createdAt': created_at, 'response': response}, file)
+                os.replace(temp_file, entry_file)
+                os.utime(entry_file, (created_at, created_at))
+                self._disk_index[key] = (created_at, created_at, entry_file.stat().st_size)
+                self._evict_disk()
+            except Exception as e:
+                self._log_manager.log_error("Failed to write response cache entry", error = e)
+
+    def _put_memory(self, key: str, created_at: float, response: str):
+        self._memory[key] = (created_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._settings.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _remove_disk_entry(self, key: str):
+        self._disk_index.pop(key, None)
+        try:
+            (self._cache_dir / f"{key}.json").unlink(missing_ok=True)
+        except OSError as e:
+            self._log_manager.log_error("Failed to remove response cache entry", error = e)
+
+    def _evict_disk(self):
+        """
+        Drop expired entries, then least recently used ones until the disk tier fits its bounds
+        """
+        for key, (_, created_at, _) in list(self._disk_index.items()):
+            if self._is_expired(created_at):
+                self._remove_disk_entry(key)
+
+        total_bytes = sum(size for _, _, size in self._disk_index.values())
+        by_access = sorted(self._disk_index.items(), key=lambda item: item[1][0])
+        for key, (_, _, size) in by_access:
+            if len(self._disk_index) <= self._settings.max_disk_entries \
+                    and total_bytes <= self._settings.max_disk_bytes:
+                break
+            self._remove_disk_entry(key)
+            total_bytes -= size
+
+    def clear(self):
+        """
+        Remove all cached responses
+        """
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._disk_index):
+                self._remove_disk_entry(key)
+        self._log_manager.log_info("Response cache cleared")
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Returns hit/miss counters and tier sizes
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'memory_entries': len(self._memory),
+                'disk_entries': len(self._disk_index),
+            }
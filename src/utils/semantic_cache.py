@@ -0,0 +1,254 @@
+import hashlib
+import json
+import re
+import time
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # The semantic cache is optional and disables itself without NumPy
+    np = None
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.utils.config_manager import ConfigManager
+from src.utils.log_manager import LogManager
+
+
+class Embedder(ABC):
+    """
+    Abstract base class for turning text into unit-length vectors.
+    """
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+
+    @abstractmethod
+    def embed(self, text: str) -> "np.ndarray":
+        """
+        Embed a text.
+        Must be implemented by subclasses.
+
+        Returns:
+            np.ndarray: L2-normalised float32 vector of length `dimensions`.
+        """
+        pass
+
+
+class HashingEmbedder(Embedder):
+    """
+    Deterministic offline embedder using hashed word and character trigram features.
+    Insensitive to case, whitespace and punctuation.
+    """
+
+    _token_pattern = re.compile(r"\w+", re.UNICODE)
+
+    def embed(self, text: str) -> "np.ndarray":
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        words = self._token_pattern.findall(text.lower())
+        normalized = " ".join(words)
+        features = words + [normalized[i:i + 3] for i in range(max(0, len(normalized) - 2))]
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+            value = int.from_bytes(digest, 'little')
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dimensions] += sign
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class GeminiEmbedder(Embedder):
+    """
+    Embedder backed by the Gemini embedding API.
+    """
+
+    def __init__(self, dimensions: int, model: str = "models/text-embedding-004"):
+        super().__init__(dimensions)
+        self._model = model
+
+    def embed(self, text: str) -> "np.ndarray":
+        import google.generativeai as genai
+
+        result = genai.embed_content(
+            model=self._model,
+            content=text,
+            task_type="semantic_similarity",
+            output_dimensionality=self.dimensions,
+        )
+        vector = np.asarray(result['embedding'], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """
+    Singleton near-duplicate response cache.
+    Only the text the user supplied is embedded, since the static template text would dominate
+    the similarity of two rendered prompts; the template is part of the exact-match scope instead.
+    Embeddings are kept in a preallocated NumPy matrix and searched with a single vectorised
+    cosine-similarity product. Entries only match within the same model and scope, and the
+    least recently used row is overwritten when full.
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = SemanticCache()
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self._log_manager = LogManager.get_instance()
+        self._settings = ConfigManager.get_instance().get_value('semantic_cache')
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._embedder: Optional[Embedder] = None
+        self.enabled = self._settings.enabled and np is not None
+
+        if self._settings.enabled and np is None:
+            self._log_manager.log_warning("NumPy is not installed, semantic cache disabled.")
+        if self.enabled:
+            self.set_embedder(self._create_embedder())
+
+        self._log_manager.log_info("SemanticCache initialized")
+
+    def _create_embedder(self) -> Embedder:
+        """
+        Create the embedder selected in the configuration
+        """
+        if self._settings.embedder == 'gemini':
+            return GeminiEmbedder(self._settings.dimensions)
+        return HashingEmbedder(self._settings.dimensions)
+
+    def set_embedder(self, embedder: Embedder):
+        """
+        Replace the embedder and reset the index, since vectors from different embedders are not comparable
+
+        Args:
+            embedder: The embedder to use for new lookups and entries
+        """
+        with self._lock:
+            self._embedder = embedder
+            capacity = self._settings.capacity
+            self._vectors = np.zeros((capacity, embedder.dimensions), dtype=np.float32)
+            self._scope_ids = np.full(capacity, -1, dtype=np.int64)
+            self._last_used = np.zeros(capacity, dtype=np.float64)
+            self._responses: List[Optional[str]] = [None] * capacity
+            self._scopes: Dict[str, int] = {}
+            self._size = 0
+
+    @staticmethod
+    def make_scope(template: str, context_digest: str = "") -> str:
+        """
+        Build the scope of a request, everything besides the user's text its response depends on
+
+        Args:
+            template: Prompt template the user's text was rendered into
+            context_digest: Digest of the generation settings and chat history sent along with the prompt
+
+        Returns:
+            str: Hex digest identifying the scope
+        """
+        material = json.dumps([template, context_digest], ensure_ascii=False)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _scope_id(self, model: str, scope: str, create: bool = False) -> int:
+        scope = f"{model}\0{scope}"
+        if scope not in self._scopes:
+            if not create:
+                return -1
+            if len(self._scopes) >= 4 * len(self._responses):
+                self._compact_scopes()
+            self._scopes[scope] = max(self._scopes.values(), default=-1) + 1
+        return self._scopes[scope]
+
+    def _compact_scopes(self):
+        """
+        Forget scopes that no longer have any indexed entry
+        """
+        live_ids = set(self._scope_ids[:self._size].tolist())
+        self._scopes = {scope: scope_id for scope, scope_id in self._scopes.items() if scope_id in live_ids}
+
+    def get(self, model: str, text: str, scope: str = "") -> Optional[str]:
+        """
+        Find a cached response for a sufficiently similar text within the same scope
+
+        Args:
+            model: Model name
+            text: Text the user supplied for the prompt's placeholders
+            scope: Scope from make_scope()
+
+        Returns:
+            Optional[str]: The cached response or None on a miss
+        """
+        if not self.enabled or not text.strip():
+            return None
+        try:
+            query = self._embedder.embed(text)
+            with self._lock:
+                scope_id = self._scope_id(model, scope)
+                if scope_id < 0 or self._size == 0:
+                    self._misses += 1
+                    return None
+                similarities = self._vectors[:self._size] @ query
+                similarities[self._scope_ids[:self._size] != scope_id] = -1.0
+                best = int(np.argmax(similarities))
+                if similarities[best] < self._settings.similarity_threshold:
+                    self._misses += 1
+                    return None
+                self._last_used[best] = time.time()
+                self._hits += 1
+                self._log_manager.log_info(
+                    f"Semantic cache hit with similarity {similarities[best]:.3f}."
+                )
+                return self._responses[best]
+        except Exception as e:
+            self._log_manager.log_error("Semantic cache lookup failed", error = e)
+            return None
+
+    def put(self, model: str, text: str, response: str, scope: str = ""):
+        """
+        Store a response for later near-duplicate lookups
+
+        Args:
+            model: Model name
+            text: Text the user supplied for the prompt's placeholders
+            response: The response text
+            scope: Scope from make_scope()
+        """
+        if not self.enabled or not response or not text.strip():
+            return
+        try:
+            vector = self._embedder.embed(text)
+            with self._lock:
+                if self._size < len(self._responses):
+                    row = self._size
+                    self._size += 1
+                else:
+                    row = int(np.argmin(self._last_used))
+                self._vectors[row] = vector
+                self._scope_ids[row] = self._scope_id(model, scope, create=True)
+                self._last_used[row] = time.time()
+                self._responses[row] = response
+        except Exception as e:
+            self._log_manager.log_error("Failed to store semantic cache entry", error = e)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Returns hit/miss counters and the number of indexed entries
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'entries': self._size if self.enabled else 0,
+            }
@@ -0,0 +1,252 @@
+import atexit
+import json
+import math
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from threading import Lock, Thread, Event
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.append(str(root_dir))
+from src.utils.config_manager import ConfigManager
+from src.utils.log_manager import LogManager
+from src.utils.path_manager import get_telemetry_path
+
+# Buffered records are written at least this often
+FLUSH_INTERVAL_SECONDS = 2.0
+# Rough characters per token, used for the tokens per second estimate
+CHARS_PER_TOKEN = 4
+
+# Short field names keep the daily files compact
+FIELDS = {
+    'timestamp': 't', 'provider': 'pv', 'prompt_id': 'p', 'model': 'm', 'input_chars': 'in',
+    'output_chars': 'out', 'ttfc_ms': 'ttfc', 'duration_ms': 'dur', 'tokens_per_second': 'tps',
+    'retries': 'r', 'outcome': 'o', 'cache': 'c', 'context_cache': 'cc',
+}
+METRICS = ('ttfc_ms', 'duration_ms', 'tokens_per_second')
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of a sample.
+
+    Args:
+        values: The sample.
+        q: Percentile between 0 and 100.
+
+    Returns:
+        Optional[float]: The percentile, None for an empty sample.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+@dataclass(slots=True)
+class RequestRecord:
+    """
+    Measurements of a single request, filled in while the request runs.
+    Outcomes are 'ok', 'error', 'cancelled', 'deadline' and 'cached'.
+    context_cache is 'hit' or 'miss' for requests with a cacheable static prompt prefix.
+    """
+    provider: str
+    model: str
+    prompt_id: Optional[str] = None
+    input_chars: int = 0
+    output_chars: int = 0
+    retries: int = 0
+    outcome: str = 'ok'
+    cache: Optional[str] = None
+    context_cache: Optional[str] = None
+    started: float = 0.0
+    first_chunk: Optional[float] = None
+    chunks: int = 0
+
+    def __post_init__(self):
+        self.started = self.started or time.monotonic()
+
+    def add_output(self, text: str):
+        """
+        Account for a received chunk or the complete response text.
+        """
+        if self.first_chunk is None:
+            self.first_chunk = time.monotonic()
+        self.chunks += 1
+        self.output_chars += len(text)
+
+    def to_entry(self) -> Dict:
+        finished = time.monotonic()
+        duration = finished - self.started
+        # A response received in one piece, e.g. a non-streamed request, was generated before its
+        # first chunk arrived, so its speed is measured over the whole request
+        generation = finished - self.first_chunk if self.first_chunk is not None and self.chunks > 1 else duration
+        # Cached responses were not generated, their speed says nothing about the model
+        measured = generation > 0 and self.output_chars and self.outcome != 'cached'
+        entry = {
+            'timestamp': round(time.time(), 3),
+            'provider': self.provider,
+            'prompt_id': self.prompt_id,
+            'model': self.model,
+            'input_chars': self.input_chars,
+            'output_chars': self.output_chars,
+            'ttfc_ms': round((self.first_chunk - self.started) * 1000, 1) if self.first_chunk is not None else None,
+            'duration_ms': round(duration * 1000, 1),
+            'tokens_per_second': round(self.output_chars / CHARS_PER_TOKEN / generation, 1) if measured else None,
+            'retries': self.retries,
+            'outcome': self.outcome,
+            'cache': self.cache,
+            'context_cache': self.context_cache,
+        }
+        return {FIELDS[name]: value for name, value in entry.items() if value is not None}
+
+
+class TelemetryStore:
+    """
+    Singleton local time-series store of per-request latency telemetry.
+    Records are appended to one JSON-lines file per day by a background writer, and files
+    older than the retention period are deleted.
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = TelemetryStore()
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self._log_manager = LogManager.get_instance()
+        self._settings = ConfigManager.get_instance().get_value('telemetry')
+        self._directory = get_telemetry_path()
+        self._lock = Lock()
+        self._buffer: List[Dict] = []
+        self._flush_event = Event()
+        self._pruned_on: Optional[date] = None
+
+        if self._settings.enabled:
+            Thread(target=self._writer_loop, name="TelemetryWriter", daemon=True).start()
+            atexit.register(self.flush)
+
+        self._log_manager.log_info("TelemetryStore initialized")
+
+    def record(self, record: RequestRecord):
+        """
+        Queue a finished request for storage
+        """
+        if not self._settings.enabled:
+            return
+        entry = record.to_entry()
+        with self._lock:
+            self._buffer.append(entry)
+
+    def _writer_loop(self):
+        while True:
+            self._flush_event.wait(FLUSH_INTERVAL_SECONDS)
+            self._flush_event.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Write buffered records to the file of the current day
+        """
+        with self._lock:
+            entries, self._buffer = self._buffer, []
+        if not entries:
+            return
+        try:
+            today = date.today()
+            self._directory.mkdir(parents=True, exist_ok=True)
+            with open(self._directory / f"{today.isoformat()}.jsonl", 'a', encoding='utf-8') as file:
+                file.writelines(json.dumps(entry, separators=(',', ':')) + '\n' for entry in entries)
+            if self._pruned_on != today:
+                self._prune(today)
+        except Exception as e:
+            self._log_manager.log_error("Failed to write telemetry", error = e)
+
+    def _prune(self, today: date):
+        """
+        Delete daily files older than the retention period
+        """
+        oldest = today - timedelta(days=self._settings.retention_days)
+        for day_file in self._directory.glob("*.jsonl"):
+            try:
+                if date.fromisoformat(day_file.stem) < oldest:
+                    day_file.unlink()
+            except ValueError:
+                continue
+        self._pruned_on = today
+
+    def iter_records(self, since: Optional[datetime] = None) -> Iterator[Dict]:
+        """
+        Iterate over stored records, oldest first, with their long field names
+
+        Args:
+            since: Only return records from this time on, all retained records if None
+        """
+        self.flush()
+        if not self._directory.exists():
+            return
+        since_timestamp = since.timestamp() if since else 0.0
+        names = {short: name for name, short in FIELDS.items()}
+        for day_file in sorted(self._directory.glob("*.jsonl")):
+            try:
+                if since and date.fromisoformat(day_file.stem) < since.date():
+                    continue
+            except ValueError:
+                continue
+            with open(day_file, 'r', encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if entry.get('t', 0) >= since_timestamp:
+                        yield {names.get(key, key): value for key, value in entry.items()}
+
+    def query_percentiles(self, group_by: str = 'prompt_id', since: Optional[datetime] = None,
+                          percentiles: Sequence[float] = (50, 90, 99)) -> Dict[str, Dict]:
+        """
+        Compute latency percentiles per prompt or per model
+
+        Args:
+            group_by: 'prompt_id', 'model' or 'provider'
+            since: Only include records from this time on
+            percentiles: The percentiles to compute
+
+        Returns:
+            Dict[str, Dict]: Per group the request count, outcome counts and, per metric
+            (ttfc_ms, duration_ms, tokens_per_second), the requested percentiles
+        """
+        groups: Dict[str, Dict] = {}
+        for entry in self.iter_records(since):
+            key = entry.get(group_by) or '(none)'
+            group = groups.setdefault(key, {'count': 0, 'outcomes': {}, 'samples': {metric: [] for metric in METRICS}})
+            group['count'] += 1
+            outcome = entry.get('outcome', 'ok')
+            group['outcomes'][outcome] = group['outcomes'].get(outcome, 0) + 1
+            if outcome not in ('ok', 'cached'):
+                continue
+            for metric in METRICS:
+                if metric in entry:
+                    group['samples'][metric].append(entry[metric])
+
+        return {
+            key: {
+                'count': group['count'],
+                'outcomes': group['outcomes'],
+                **{
+                    metric: {f"p{q:g}": percentile(samples, q) for q in percentiles}
+                    for metric, samples in group.pop('samples').items()
+                },
+            }
+            for key, group in groups.items()
+        }
@@ -0,0 +1,139 @@
+import asyncio
+import unittest
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.clients.async_transport import AsyncHTTPTransport, EventLoopThread, HTTPStatusError, TransportError
+
+
+def _run(coro):
+    return EventLoopThread.get_instance().run(coro, timeout=5)
+
+
+def _content_length(body: bytes) -> bytes:
+    return b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+
+
+def _chunked(*chunks: bytes) -> bytes:
+    return b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n" + b"".join(
+        b"%x\r\n%s\r\n" % (len(chunk), chunk) for chunk in chunks
+    ) + b"0\r\n\r\n"
+
+
+class _ScriptedServer:
+    """
+    Answers each request with respond(connection index, request index on that connection, method),
+    which returns the raw response or None to close the connection without answering.
+    """
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.connections = 0
+        self.requests = []
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self._server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        self._server.close()
+
+    async def _handle(self, reader, writer):
+        connection = self.connections
+        self.connections += 1
+        try:
+            for index in range(100):
+                head = await reader.readuntil(b"\r\n\r\n")
+                method = head.split(b" ", 1)[0].decode()
+                length = next((int(line.split(b":")[1]) for line in head.split(b"\r\n")
+                               if line.lower().startswith(b"content-length")), 0)
+                await reader.readexactly(length)
+                self.requests.append((connection, method))
+                response = self.respond(connection, index, method)
+                if response is None:
+                    break
+                writer.write(response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class AsyncHTTPTransportTest(unittest.TestCase):
+
+    def _serve(self, respond):
+        self.server = _ScriptedServer(respond)
+        self.url = _run(self.server.start())
+        self.transport = AsyncHTTPTransport()
+        self.addCleanup(lambda: _run(self.server.stop()))
+        self.addCleanup(self.transport.close_idle)
+
+    def test_keep_alive_connection_is_reused(self):
+        self._serve(lambda connection, index, method: _content_length(b'{"n": %d}' % index))
+
+        async def scenario():
+            return [(await self.transport.request("GET", self.url)).json() for _ in range(3)]
+
+        self.assertEqual(_run(scenario()), [{"n": 0}, {"n": 1}, {"n": 2}])
+        self.assertEqual(self.server.connections, 1)
+
+    def test_sse_events_are_parsed_across_chunks(self):
+        self._serve(lambda connection, index, method: _chunked(
+            b": keep-alive comment\r\n\r\ndata: {\"a\":", b" 1}\r\n\r\ndata: first line\ndata:second line\n",
+            b"\nevent: ignored\ndata: last",
+        ))
+
+        async def scenario():
+            async with self.transport.stream("POST", self.url, json_body={}) as response:
+                return [data async for data in response.iter_sse()], response.complete
+
+        events, complete = _run(scenario())
+        self.assertEqual(events, ['{"a": 1}', "first line\nsecond line", "last"])
+        self.assertTrue(complete)
+
+    def test_unread_body_drops_the_connection(self):
+        self._serve(lambda connection, index, method: _chunked(b"data: x\n\n", b"data: y\n\n"))
+
+        async def scenario():
+            async with self.transport.stream("POST", self.url, json_body={}) as response:
+                async for _ in response.iter_sse():
+                    break
+            await self.transport.request("POST", self.url, json_body={})
+
+        _run(scenario())
+        self.assertEqual(self.server.connections, 2)
+
+    def test_stale_connection_retries_idempotent_request(self):
+        # The first connection goes stale after one response, the server drops the next request unanswered
+        self._serve(lambda connection, index, method:
+                    None if connection == 0 and index == 1 else _content_length(b"ok"))
+
+        async def scenario():
+            await self.transport.request("GET", self.url)
+            return await self.transport.request("GET", self.url)
+
+        self.assertEqual(_run(scenario()).content, b"ok")
+        self.assertEqual(self.server.requests, [(0, "GET"), (0, "GET"), (1, "GET")])
+
+    def test_stale_connection_does_not_resend_post(self):
+        self._serve(lambda connection, index, method:
+                    None if connection == 0 and index == 1 else _content_length(b"ok"))
+
+        async def scenario():
+            await self.transport.request("POST", self.url, json_body={})
+            await self.transport.request("POST", self.url, json_body={})
+
+        with self.assertRaises(TransportError):
+            _run(scenario())
+        self.assertEqual(self.server.requests, [(0, "POST"), (0, "POST")])
+
+    def test_status_error_exposes_retry_after(self):
+        self.assertEqual(HTTPStatusError(429, b"", {"retry-after": "2.5"}).retry_after, 2.5)
+        self.assertIsNone(HTTPStatusError(429, b"", {"retry-after": "Wed, 21 Oct 2015"}).retry_after)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import sys
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.clients.async_transport import EventLoopThread
+from src.clients.request_options import RequestPriority
+from src.core import batch_runner
+from src.core.batch_runner import CHECKPOINT_FILE, BatchRunner
+from src.utils.dataclasses import Prompt, PromptBehavior, TextSelectionBehaviour
+
+
+def _prompt(template: str = "Fix: {text}", additional_input: bool = False) -> Prompt:
+    behavior = PromptBehavior(
+        clear_history=False, text_selected=TextSelectionBehaviour.PROCESS,
+        no_text_selected=TextSelectionBehaviour.SKIP, additional_input=additional_input,
+        output_on_separate_window=False,
+    )
+    return Prompt(description="Fix", template=template, hotkey="", hotkey_enabled=False, behavior=behavior)
+
+
+class _Prompts:
+    def __init__(self, prompts):
+        self.prompts = prompts
+
+    def get_instance(self):
+        return self
+
+    def get_prompt_by_id(self, prompt_id):
+        return self.prompts.get(prompt_id)
+
+
+class _Config:
+    def __init__(self, api_client):
+        self.api_client = api_client
+
+    def get_instance(self):
+        return self
+
+    def get_api_client(self):
+        return self.api_client
+
+
+class _Client:
+    """
+    Answers each prompt with its upper-cased text, failing prompts that contain 'fail'.
+    """
+
+    def __init__(self):
+        self.prompts = []
+        self.options = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def submit_async(self, coro):
+        return EventLoopThread.get_instance().submit(coro)
+
+    async def send_request_non_stream_async(self, prompt, options=None):
+        self.prompts.append(prompt)
+        self.options.append(options)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return None if "fail" in prompt else prompt.upper()
+
+
+class BatchRunnerTest(unittest.TestCase):
+    """
+    Files are processed concurrently into a mirrored output tree and skipped when resumed unchanged.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.input_dir = Path(directory.name) / "notes"
+        self.output_dir = Path(directory.name) / "out"
+        self.client = _Client()
+        self.prompts = {"fix": _prompt(), "reply": _prompt("{input}: {text}", additional_input=True)}
+        for name, value in (("PromptManager", _Prompts(self.prompts)), ("ConfigManager", _Config(self.client))):
+            patcher = mock.patch.object(batch_runner, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _write(self, name: str, text: str):
+        path = self.input_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    def _run(self, prompt_id="fix", **kwargs):
+        runner = BatchRunner(prompt_id, str(self.input_dir / "**" / "*.txt"), self.output_dir, **kwargs)
+        return runner.run()
+
+    def test_results_mirror_the_input_layout(self):
+        self._write("a.txt", "first")
+        self._write("sub/b.txt", "second")
+        self.assertEqual(self._run(), {"files": 2, "completed": 2, "skipped": 0, "failed": 0})
+        self.assertEqual((self.output_dir / "a.txt").read_text(encoding="utf-8"), "FIX: FIRST")
+        self.assertEqual((self.output_dir / "sub" / "b.txt").read_text(encoding="utf-8"), "FIX: SECOND")
+        checkpoint = json.loads((self.output_dir / CHECKPOINT_FILE).read_text(encoding="utf-8"))
+        self.assertEqual(checkpoint["promptId"], "fix")
+        self.assertEqual(sorted(checkpoint["completed"]), ["a.txt", "sub/b.txt"])
+        self.assertTrue(all(options.stateless and options.priority == RequestPriority.BULK
+                            for options in self.client.options))
+
+    def test_additional_input_fills_the_input_placeholder(self):
+        self._write("a.txt", "thanks")
+        self._run("reply", additional_input="Decline politely")
+        self.assertEqual(self.client.prompts, ["Decline politely: thanks"])
+
+    def test_resumed_run_skips_unchanged_files(self):
+        for name in ("a.txt", "b.txt", "c.txt"):
+            self._write(name, name)
+        self._run()
+        self._write("b.txt", "changed")
+        (self.output_dir / "c.txt").unlink()
+        self.assertEqual(self._run(), {"files": 3, "completed": 2, "skipped": 1, "failed": 0})
+        self.assertEqual(sorted(self.client.prompts[3:]), ["Fix: c.txt", "Fix: changed"])
+        self.assertEqual((self.output_dir / "b.txt").read_text(encoding="utf-8"), "FIX: CHANGED")
+
+    def test_failed_files_are_retried_on_the_next_run(self):
+        self._write("a.txt", "fail")
+        self._write("b.txt", "ok")
+        self.assertEqual(self._run(), {"files": 2, "completed": 1, "skipped": 0, "failed": 1})
+        self.assertFalse((self.output_dir / "a.txt").exists())
+        self._write("a.txt", "fixed")
+        self.assertEqual(self._run(), {"files": 2, "completed": 1, "skipped": 1, "failed": 0})
+
+    def test_checkpoint_of_another_prompt_is_ignored(self):
+        self._write("a.txt", "first")
+        self._run()
+        self.assertEqual(self._run("reply")["completed"], 1)
+
+    def test_workers_are_limited_to_the_concurrency(self):
+        for index in range(10):
+            self._write(f"{index}.txt", str(index))
+        self.assertEqual(self._run(concurrency=3)["completed"], 10)
+        self.assertEqual(self.client.max_in_flight, 3)
+
+    def test_output_inside_the_input_tree_is_not_processed(self):
+        self._write("a.txt", "first")
+        self.output_dir = self.input_dir / "out"
+        self._run()
+        self.assertEqual(self._run()["files"], 1)
+
+    def test_unknown_prompt_is_rejected(self):
+        with self.assertRaises(KeyError):
+            BatchRunner("missing", "*.txt", self.output_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
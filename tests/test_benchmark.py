@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.clients.async_transport import EventLoopThread
+from src.clients.cancellation import RequestCancelledError
+from src.tools.benchmark import ClientBenchmark, summarize
+
+
+def _run(coro):
+    return EventLoopThread.get_instance().run(coro, timeout=5)
+
+
+class _Client:
+    """
+    Streams two chunks per request and fails every request listed in `failures` by call number.
+    """
+
+    def __init__(self, failures=None):
+        self.failures = failures or {}
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send_request_async(self, prompt, options=None):
+        self.calls += 1
+        error = self.failures.get(self.calls)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if error:
+                raise error
+            yield "Dear colleague, "
+            yield "please send the report."
+        finally:
+            self.in_flight -= 1
+
+    async def send_request_non_stream_async(self, prompt, options=None):
+        self.calls += 1
+        failed = self.calls in self.failures
+        await asyncio.sleep(0.01)
+        return None if failed else "Please send the report."
+
+
+class ClientBenchmarkTest(unittest.TestCase):
+
+    def test_level_measures_completed_requests_and_concurrency(self):
+        client = _Client()
+        report = _run(ClientBenchmark(client).run_level(3, 9))
+        self.assertEqual(report["completed"], 9)
+        self.assertEqual(client.max_in_flight, 3)
+        self.assertEqual(report["errors"], {})
+        self.assertGreater(report["throughput_rps"], 0)
+        self.assertLessEqual(report["ttft_ms"]["p50"], report["latency_ms"]["p50"])
+        self.assertIn("traced_peak_kb", report["memory"])
+
+    def test_errors_are_counted_by_type(self):
+        client = _Client({1: RuntimeError("boom"), 2: RequestCancelledError("cancelled")})
+        report = _run(ClientBenchmark(client).run_level(1, 4))
+        self.assertEqual(report["completed"], 2)
+        self.assertEqual(report["errors"], {"RuntimeError": 1, "cancelled": 1})
+
+    def test_non_stream_failure_is_an_error(self):
+        report = _run(ClientBenchmark(_Client({2: True}), stream=False).run_level(2, 3))
+        self.assertEqual(report["completed"], 2)
+        self.assertEqual(report["errors"], {"RuntimeError": 1})
+
+    def test_summary_of_no_values(self):
+        self.assertEqual(summarize([]), {"p50": None, "p95": None, "p99": None, "max": None})
+        self.assertEqual(summarize([5.0])["max"], 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
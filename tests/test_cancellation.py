@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import unittest
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.clients.async_transport import EventLoopThread
+from src.clients.cancellation import (
+    CANCELLED, DEADLINE_EXCEEDED, CancellationToken, DeadlineExceededError, RequestCancelledError, cancel_scope
+)
+
+
+def _run(coro):
+    return EventLoopThread.get_instance().run(coro, timeout=5)
+
+
+class CancellationTokenTest(unittest.TestCase):
+
+    def test_callbacks_run_once_on_cancel(self):
+        token, calls = CancellationToken(), []
+        token.add_callback(lambda: calls.append("first"))
+        remove = token.add_callback(lambda: calls.append("removed"))
+        remove()
+        token.cancel()
+        token.cancel(DEADLINE_EXCEEDED)
+        self.assertEqual(calls, ["first"])
+        self.assertEqual(token.reason, CANCELLED)
+        self.assertIsInstance(token.error(), RequestCancelledError)
+        self.assertNotIsInstance(token.error(), DeadlineExceededError)
+
+    def test_callback_added_after_cancel_runs_at_once(self):
+        token, calls = CancellationToken(), []
+        token.cancel()
+        token.add_callback(lambda: calls.append("late"))
+        self.assertEqual(calls, ["late"])
+        with self.assertRaises(RequestCancelledError):
+            token.raise_if_cancelled()
+
+    def test_deadline_cancels_the_token(self):
+        token, fired = CancellationToken(timeout=0.05), threading.Event()
+        token.add_callback(fired.set)
+        self.assertTrue(fired.wait(2))
+        self.assertEqual(token.reason, DEADLINE_EXCEEDED)
+        self.assertIsInstance(token.error(), DeadlineExceededError)
+        self.assertEqual(token.remaining(), 0.0)
+
+    def test_later_timeout_keeps_the_earlier_deadline(self):
+        token = CancellationToken(timeout=10)
+        deadline = token.deadline
+        token.set_timeout(60)
+        self.assertEqual(token.deadline, deadline)
+        token.set_timeout(5)
+        self.assertLess(token.deadline, deadline)
+        self.assertIsNone(CancellationToken().remaining())
+        token.cancel()
+
+
+class CancelScopeTest(unittest.TestCase):
+    """
+    Cancelling a token aborts the task running in its scope with the token's error.
+    """
+
+    def test_cancel_aborts_the_running_task(self):
+        token = CancellationToken()
+
+        async def scenario():
+            asyncio.get_running_loop().call_later(0.05, token.cancel)
+            async with cancel_scope(token):
+                await asyncio.sleep(5)
+
+        with self.assertRaises(RequestCancelledError):
+            _run(scenario())
+
+    def test_deadline_raises_deadline_exceeded(self):
+        async def scenario():
+            async with cancel_scope(CancellationToken(timeout=0.05)):
+                await asyncio.sleep(5)
+
+        with self.assertRaises(DeadlineExceededError):
+            _run(scenario())
+
+    def test_cancelled_token_does_not_enter_the_scope(self):
+        token, entered = CancellationToken(), []
+        token.cancel()
+
+        async def scenario():
+            async with cancel_scope(token):
+                entered.append(True)
+
+        with self.assertRaises(RequestCancelledError):
+            _run(scenario())
+        self.assertEqual(entered, [])
+
+    def test_nested_scope_and_no_token_are_passed_through(self):
+        token = CancellationToken()
+
+        async def scenario():
+            async with cancel_scope(None):
+                async with cancel_scope(token):
+                    async with cancel_scope(token):
+                        self.assertEqual(len(token._tasks), 1)
+                    self.assertEqual(len(token._tasks), 1)
+            return len(token._tasks), len(token._callbacks)
+
+        self.assertEqual(_run(scenario()), (0, 0))
+
+    def test_outside_cancellation_is_not_translated(self):
+        async def scenario():
+            task = asyncio.current_task()
+            asyncio.get_running_loop().call_later(0.05, task.cancel)
+            async with cancel_scope(CancellationToken()):
+                await asyncio.sleep(5)
+
+        async def outer():
+            try:
+                await asyncio.ensure_future(scenario())
+            except asyncio.CancelledError:
+                return "cancelled"
+
+        self.assertEqual(_run(outer()), "cancelled")
+
+
+if __name__ == "__main__":
+    unittest.main()
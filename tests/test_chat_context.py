@@ -0,0 +1,132 @@
+import asyncio
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.clients import chat_context
+from src.clients.async_transport import EventLoopThread
+from src.clients.chat_context import SUMMARY_ACKNOWLEDGEMENT, SUMMARY_PREFIX, ChatContextManager
+from src.utils.dataclasses import ChatContextConfig
+
+
+def _content(role: str, text: str):
+    return SimpleNamespace(role=role, parts=[SimpleNamespace(text=text)])
+
+
+def _text(entry) -> str:
+    return entry.parts[0].text
+
+
+class _Config:
+    def __init__(self, settings: ChatContextConfig):
+        self.settings = settings
+
+    def get_instance(self):
+        return self
+
+    def get_value(self, key):
+        return self.settings
+
+
+class _SummaryClient:
+    """
+    Answers summary requests once released, released from the start unless told otherwise.
+    """
+
+    def __init__(self, summary="the user asked about invoices"):
+        self.summary = summary
+        self.prompts = []
+        self.futures = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def submit_async(self, coro):
+        self.futures.append(EventLoopThread.get_instance().submit(coro))
+
+    async def send_request_non_stream_async(self, prompt, options=None):
+        self.prompts.append(prompt)
+        await asyncio.get_running_loop().run_in_executor(None, self.release.wait, 5)
+        return self.summary
+
+    def wait(self):
+        self.release.set()
+        for future in self.futures:
+            future.result(5)
+
+
+class ChatContextManagerTest(unittest.TestCase):
+    """
+    Old turns are dropped to stay within the token budget and optionally summarized.
+    """
+
+    def setUp(self):
+        self.client = _SummaryClient()
+
+    def _manager(self, **settings) -> ChatContextManager:
+        patcher = mock.patch.object(chat_context, "ConfigManager", _Config(ChatContextConfig(**settings)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return ChatContextManager(self.client, _content)
+
+    @staticmethod
+    def _history(turns: int):
+        history = []
+        for index in range(turns):
+            history.extend([_content("user", f"question {index} " * 8), _content("model", "answer " * 8)])
+        return history
+
+    def test_history_within_budget_is_kept(self):
+        manager, history = self._manager(max_context_tokens=1000), self._history(3)
+        manager.fit(history)
+        self.assertEqual(len(history), 6)
+
+    def test_disabled_budget_keeps_everything(self):
+        manager, history = self._manager(max_context_tokens=0), self._history(20)
+        manager.fit(history)
+        self.assertEqual(len(history), 40)
+
+    def test_oldest_whole_turns_are_dropped(self):
+        manager, history = self._manager(max_context_tokens=60, summarize=False), self._history(4)
+        manager.fit(history)
+        self.assertEqual(len(history) % 2, 0)
+        self.assertLess(len(history), 8)
+        self.assertEqual(_text(history[-2]), "question 3 " * 8)
+        self.assertEqual(self.client.prompts, [])
+
+    def test_latest_turn_is_kept_over_budget(self):
+        manager, history = self._manager(max_context_tokens=1, summarize=False), self._history(3)
+        manager.fit(history)
+        self.assertEqual([_text(entry) for entry in history], ["question 2 " * 8, "answer " * 8])
+
+    def test_dropped_turns_are_summarized_into_the_first_turn(self):
+        manager, history = self._manager(max_context_tokens=60, summarize=True), self._history(4)
+        manager.fit(history)
+        self.client.wait()
+        self.assertEqual(_text(history[0]), SUMMARY_PREFIX + "the user asked about invoices")
+        self.assertEqual(_text(history[1]), SUMMARY_ACKNOWLEDGEMENT)
+        self.assertIn("question 0", self.client.prompts[0])
+
+        # The next trim keeps the summary and folds it into the new one
+        history.extend(self._history(3))
+        manager.fit(history)
+        self.client.wait()
+        self.assertTrue(_text(history[0]).startswith(SUMMARY_PREFIX))
+        self.assertFalse(_text(history[2]).startswith(SUMMARY_PREFIX))
+        self.assertIn("Earlier summary: the user asked about invoices", self.client.prompts[-1])
+
+    def test_reset_discards_summary_of_the_old_session(self):
+        manager, history = self._manager(max_context_tokens=60, summarize=True), self._history(4)
+        self.client.release.clear()
+        manager.fit(history)
+        manager.reset()
+        self.client.wait()
+        self.assertFalse(any(_text(entry).startswith(SUMMARY_PREFIX) for entry in history))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import threading
+import time
+import unittest
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.utils.chunk_coalescer import ChunkCoalescer
+
+
+class ChunkCoalescerTest(unittest.TestCase):
+    """
+    Streamed chunks are delivered in order, batched to at most one delivery per interval.
+    """
+
+    def setUp(self):
+        self.batches = []
+        self.delivered = threading.Event()
+
+    def _deliver(self, text: str):
+        self.batches.append(text)
+        self.delivered.set()
+
+    def test_first_chunk_is_delivered_immediately(self):
+        coalescer = ChunkCoalescer(self._deliver, interval_ms=10000)
+        coalescer.add("Hello")
+        self.assertEqual(self.batches, ["Hello"])
+        coalescer.close()
+
+    def test_chunks_within_the_interval_are_batched(self):
+        coalescer = ChunkCoalescer(self._deliver, interval_ms=100)
+        coalescer.add("a")
+        self.delivered.clear()
+        for chunk in ("b", "c", "d"):
+            coalescer.add(chunk)
+        self.assertEqual(self.batches, ["a"])
+        # The flusher delivers the batch once the interval has passed, without waiting for more chunks
+        self.assertTrue(self.delivered.wait(2))
+        self.assertEqual(self.batches, ["a", "bcd"])
+        coalescer.close()
+        self.assertEqual(self.batches, ["a", "bcd"])
+
+    def test_full_buffer_is_delivered_without_waiting(self):
+        coalescer = ChunkCoalescer(self._deliver, interval_ms=10000, max_chars=5)
+        for chunk in ("a", "bc", "def", "g"):
+            coalescer.add(chunk)
+        self.assertEqual(self.batches, ["a", "bcdef"])
+        coalescer.close()
+        self.assertEqual(self.batches, ["a", "bcdef", "g"])
+
+    def test_close_delivers_the_rest_and_ignores_later_chunks(self):
+        coalescer = ChunkCoalescer(self._deliver, interval_ms=10000)
+        for chunk in ("a", "", "b", "c"):
+            coalescer.add(chunk)
+        coalescer.close()
+        coalescer.add("late")
+        coalescer.close()
+        self.assertEqual(self.batches, ["a", "bc"])
+
+    def test_deliveries_keep_the_interval(self):
+        times = []
+        coalescer = ChunkCoalescer(lambda text: times.append(time.monotonic()), interval_ms=50)
+        for _ in range(20):
+            coalescer.add("x")
+            time.sleep(0.01)
+        coalescer.close()
+        gaps = [later - earlier for earlier, later in zip(times, times[1:-1])]
+        self.assertLess(len(times), 20)
+        self.assertTrue(all(gap >= 0.045 for gap in gaps), gaps)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import unittest
+from unittest import mock
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.clients import circuit_breaker
+from src.clients.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from src.utils.dataclasses import CircuitBreakerConfig
+
+KEY = "gemini:flash"
+
+
+class _Config:
+    def __init__(self, settings: CircuitBreakerConfig):
+        self.settings = settings
+
+    def get_instance(self):
+        return self
+
+    def get_value(self, key):
+        return self.settings
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    """
+    Circuits open on failures, refuse requests while open and close again after a successful probe.
+    """
+
+    def setUp(self):
+        self.settings = CircuitBreakerConfig(enabled=True, failure_threshold=3, error_rate_threshold=0.5,
+                                             min_requests=4, window_seconds=60, open_seconds=30)
+        self.clock = _Clock()
+        for name, value in (("ConfigManager", _Config(self.settings)), ("time", self.clock)):
+            patcher = mock.patch.object(circuit_breaker, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker()
+        self.changes = []
+        self.breaker.add_listener(lambda: self.changes.append(self._state()))
+
+    def _state(self) -> str:
+        return self.breaker.get_states()[KEY]["state"]
+
+    def _call(self, outcome: str, latency_ms: float = 100):
+        self.assertTrue(self.breaker.allow(KEY))
+        self.breaker.record(KEY, outcome, latency_ms)
+
+    def test_consecutive_failures_open_the_circuit(self):
+        for _ in range(3):
+            self._call("error")
+        self.assertEqual(self._state(), OPEN)
+        self.assertTrue(self.breaker.is_open(KEY))
+        self.assertFalse(self.breaker.allow(KEY))
+        self.assertEqual(self.breaker.get_stats(), {"opened": 1, "refused": 1, "probes": 0})
+        self.assertEqual(self.changes, [OPEN])
+
+    def test_error_rate_within_the_window_opens_the_circuit(self):
+        for outcome in ("ok", "error", "ok", "error"):
+            self._call(outcome)
+        self.assertEqual(self._state(), OPEN)
+
+    def test_old_failures_leave_the_window(self):
+        for outcome in ("error", "error", "ok"):
+            self._call(outcome)
+        self.clock.now += 61
+        # Counting the old calls, the second failure would reach the error rate threshold
+        for outcome in ("ok", "error", "ok", "ok", "error"):
+            self._call(outcome)
+        self.assertEqual(self._state(), CLOSED)
+
+    def test_slow_calls_count_as_failures(self):
+        self.settings.slow_call_ms = 1000
+        for _ in range(3):
+            self._call("ok", latency_ms=5000)
+        self.assertEqual(self._state(), OPEN)
+
+    def test_cancelled_requests_count_neither_way(self):
+        for _ in range(2):
+            self._call("error")
+        self._call("cancelled")
+        self._call("error")
+        self.assertEqual(self._state(), OPEN)
+
+    def test_successful_probe_closes_the_circuit(self):
+        for _ in range(3):
+            self._call("error")
+        self.clock.now += 30
+        self.assertFalse(self.breaker.is_open(KEY))
+        self.assertTrue(self.breaker.allow(KEY))
+        self.assertEqual(self._state(), HALF_OPEN)
+        # Only the configured number of probes is let through
+        self.assertFalse(self.breaker.allow(KEY))
+        self.breaker.record(KEY, "ok", 100)
+        self.assertEqual(self._state(), CLOSED)
+        self.assertEqual(self.changes, [OPEN, HALF_OPEN, CLOSED])
+        self._call("error")
+        self.assertEqual(self._state(), CLOSED)
+
+    def test_failed_probe_opens_the_circuit_again(self):
+        for _ in range(3):
+            self._call("error")
+        self.clock.now += 30
+        self._call("deadline")
+        self.assertEqual(self._state(), OPEN)
+        self.assertEqual(self.breaker.describe(), f"{KEY}: open (100% errors)")
+        self.assertFalse(self.breaker.allow(KEY))
+
+    def test_cancelled_probe_frees_the_probe_slot(self):
+        for _ in range(3):
+            self._call("error")
+        self.clock.now += 30
+        self._call("cancelled")
+        self.assertEqual(self._state(), HALF_OPEN)
+        self.assertTrue(self.breaker.allow(KEY))
+
+    def test_disabled_breaker_allows_everything(self):
+        self.settings.enabled = False
+        for _ in range(5):
+            self._call("error")
+        self.assertEqual(self.breaker.get_states(), {})
+        self.assertFalse(self.breaker.is_open(KEY))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+from unittest import mock
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.clients import context_cache
+from src.clients.async_transport import EventLoopThread
+from src.clients.context_cache import ContextCacheManager
+from src.utils.dataclasses import ContextCacheConfig
+
+PREFIX = "You are a careful proofreader. " * 20
+
+
+class _Config:
+    def __init__(self, settings: ContextCacheConfig):
+        self.settings = settings
+
+    def get_instance(self):
+        return self
+
+    def get_value(self, key):
+        return self.settings
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class _CacheClient:
+    """
+    Records the cached content calls, failing creation while `fail` is set.
+    """
+
+    def __init__(self):
+        self.fail = False
+        self.calls = []
+        self.futures = []
+
+    def submit_async(self, coro):
+        self.futures.append(EventLoopThread.get_instance().submit(coro))
+
+    def wait(self):
+        for future in self.futures:
+            future.result(5)
+        self.futures = []
+
+    async def create_cached_content_async(self, model, prefix, ttl_seconds):
+        self.calls.append(("create", model))
+        if self.fail:
+            raise RuntimeError("caching not supported")
+        return f"cachedContents/{len(self.calls)}"
+
+    async def refresh_cached_content_async(self, name, ttl_seconds):
+        self.calls.append(("refresh", name))
+
+    async def delete_cached_content_async(self, name):
+        self.calls.append(("delete", name))
+
+
+class ContextCacheManagerTest(unittest.TestCase):
+    """
+    Cached contents are created on a miss, refreshed shortly before they expire and evicted LRU.
+    """
+
+    def setUp(self):
+        self.settings = ContextCacheConfig(enabled=True, min_prefix_tokens=100, ttl_seconds=600,
+                                           refresh_margin_seconds=60, max_entries=2)
+        self.clock = _Clock()
+        for name, value in (("ConfigManager", _Config(self.settings)), ("time", self.clock)):
+            patcher = mock.patch.object(context_cache, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = _CacheClient()
+        self.cache = ContextCacheManager(self.client)
+
+    def _lookup(self, model="model", prefix=PREFIX):
+        name = self.cache.lookup(model, prefix)
+        self.client.wait()
+        return name
+
+    def test_only_long_prefixes_are_eligible(self):
+        self.assertTrue(self.cache.is_eligible(PREFIX))
+        self.assertFalse(self.cache.is_eligible("short"))
+        self.assertFalse(self.cache.is_eligible(None))
+        self.settings.enabled = False
+        self.assertFalse(self.cache.is_eligible(PREFIX))
+
+    def test_miss_creates_the_cached_content_for_later_requests(self):
+        self.assertIsNone(self._lookup())
+        self.assertEqual(self._lookup(), "cachedContents/1")
+        self.assertIsNone(self._lookup(model="other-model"))
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["created"]), (1, 2, 2))
+        self.assertEqual(stats["cached_tokens"], len(PREFIX) // 4)
+
+    def test_use_shortly_before_expiry_refreshes(self):
+        self._lookup()
+        self.clock.now += 560
+        self.assertEqual(self._lookup(), "cachedContents/1")
+        self.assertEqual(self.client.calls[-1], ("refresh", "cachedContents/1"))
+        self.clock.now += 560
+        self.assertEqual(self._lookup(), "cachedContents/1")
+
+    def test_expired_content_is_recreated(self):
+        self._lookup()
+        self.clock.now += 595
+        self.assertIsNone(self._lookup())
+        self.assertEqual(self._lookup(), "cachedContents/2")
+        self.assertEqual(self.cache.get_stats()["expired"], 1)
+
+    def test_least_recently_used_content_is_deleted(self):
+        for index in range(3):
+            self._lookup(prefix=f"{PREFIX}{index}")
+        self.assertEqual(self.client.calls[-1], ("delete", "cachedContents/1"))
+        self.assertEqual(self.cache.get_stats()["entries"], 2)
+
+    def test_failed_creation_is_not_retried_until_the_ttl_passed(self):
+        self.client.fail = True
+        self._lookup()
+        self._lookup()
+        self.assertEqual(len(self.client.calls), 1)
+        self.client.fail = False
+        self.clock.now += 601
+        self._lookup()
+        self.assertEqual(self._lookup(), "cachedContents/2")
+
+    def test_rejected_content_is_invalidated(self):
+        self._lookup()
+        self.cache.invalidate("model", PREFIX)
+        self.assertIsNone(self._lookup())
+        self.assertEqual(self.cache.get_stats()["expired"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import json
+import unittest
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.clients.async_transport import AsyncHTTPTransport, EventLoopThread
+from src.tools.gemini_stub_server import GeminiStubServer, StubServerConfig
+
+MODEL_URL = "/v1beta/models/gemini-2.0-flash"
+BODY = {"contents": [{"role": "user", "parts": [{"text": "hello"}]}]}
+
+
+def _run(coro):
+    return EventLoopThread.get_instance().run(coro, timeout=5)
+
+
+class GeminiStubServerTest(unittest.TestCase):
+    """
+    The stand-in answers the Gemini REST calls the client makes, over keep-alive connections.
+    """
+
+    def _serve(self, **config):
+        config = {"ttft_ms": 0, "tokens_per_second": 100000, "output_tokens": 20, "tokens_per_chunk": 8, **config}
+        self.server = GeminiStubServer(StubServerConfig(**config)).start_in_thread()
+        self.transport = AsyncHTTPTransport()
+        self.addCleanup(self.server.stop_in_thread)
+        self.addCleanup(self.transport.close_idle)
+
+    def _request(self, method: str, path: str, body=None):
+        return _run(self.transport.request(method, self.server.base_url + path, json_body=body))
+
+    def test_generate_content_caps_tokens_at_max_output_tokens(self):
+        self._serve()
+        response = self._request("POST", MODEL_URL + ":generateContent",
+                                 {**BODY, "generationConfig": {"maxOutputTokens": 5}})
+        self.assertEqual(response.status, 200)
+        payload = response.json()
+        self.assertEqual(len(payload["candidates"][0]["content"]["parts"][0]["text"].split()), 5)
+        self.assertEqual(payload["usageMetadata"]["candidatesTokenCount"], 5)
+
+    def test_stream_sends_chunks_as_server_sent_events(self):
+        self._serve()
+
+        async def scenario():
+            url = self.server.base_url + MODEL_URL + ":streamGenerateContent?alt=sse"
+            async with self.transport.stream("POST", url, json_body=BODY) as response:
+                return [json.loads(data) async for data in response.iter_sse()]
+
+        events = _run(scenario())
+        self.assertEqual(len(events), 3)
+        text = "".join(event["candidates"][0]["content"]["parts"][0]["text"] for event in events)
+        self.assertEqual(len(text.split()), 20)
+
+    def test_requests_share_one_keep_alive_connection(self):
+        self._serve()
+        for _ in range(3):
+            self._request("POST", MODEL_URL + ":generateContent", BODY)
+        self.assertEqual(self._request("GET", "/v1beta/models").json()["models"][0]["name"], "models/gemini-2.0-flash")
+        stats = self.server.get_stats()
+        self.assertEqual(stats["connections"], 1)
+        self.assertEqual(stats["requests"], 4)
+        self.assertEqual(stats["status"], {"200": 4})
+
+    def test_injected_errors(self):
+        self._serve(rate_limit_rate=1.0, retry_after_seconds=2)
+        response = self._request("POST", MODEL_URL + ":generateContent", BODY)
+        self.assertEqual(response.status, 429)
+        self.assertEqual(response.headers["retry-after"], "2")
+
+        self.server.config.rate_limit_rate, self.server.config.error_rate = 0.0, 1.0
+        self.assertEqual(self._request("POST", MODEL_URL + ":generateContent", BODY).status, 500)
+        # Metadata requests are never failed
+        self.assertEqual(self._request("GET", MODEL_URL).status, 200)
+        self.assertEqual(self._request("POST", MODEL_URL + ":countTokens", BODY).status, 404)
+
+    def test_cached_content_lifecycle(self):
+        self._serve()
+        name = self._request("POST", "/v1beta/cachedContents", {"model": "models/gemini-2.0-flash"}).json()["name"]
+        self.assertEqual(self._request("GET", f"/v1beta/{name}").status, 200)
+        self.assertEqual(self._request("POST", MODEL_URL + ":generateContent",
+                                       {**BODY, "cachedContent": name}).status, 200)
+        self.assertEqual(self._request("DELETE", f"/v1beta/{name}").status, 200)
+        self.assertEqual(self._request("POST", MODEL_URL + ":generateContent",
+                                       {**BODY, "cachedContent": name}).status, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import asyncio
+import unittest
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.clients.async_transport import EventLoopThread
+from src.clients.cancellation import CancellationToken
+from src.clients.circuit_breaker import CircuitOpenError
+from src.clients.gemini_api_client import DEFAULT_BASE_URL, GeminiClient
+from src.clients.hedging import RequestHedger
+from src.clients.model_router import ModelRouter
+from src.clients.rate_limiter import RateLimiter
+from src.clients.request_options import RequestOptions, RequestPriority
+from src.utils.config_manager import ConfigManager
+from src.utils.log_manager import LogManager
+
+
+def _run(coro):
+    return EventLoopThread.get_instance().run(coro, timeout=5)
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+class _Stream:
+    """
+    Chunk stream that waits before its first chunk and remembers whether it was closed.
+    """
+
+    def __init__(self, chunks, delay=0.0, error=None):
+        self.chunks = chunks
+        self.delay = delay
+        self.error = error
+        self.started = False
+        self.closed = False
+
+    async def __call__(self):
+        self.started = True
+        try:
+            await asyncio.sleep(self.delay)
+            if self.error:
+                raise self.error
+            for chunk in self.chunks:
+                yield chunk
+        finally:
+            self.closed = True
+
+
+class RequestHedgerTest(unittest.TestCase):
+
+    def test_fast_primary_is_not_hedged(self):
+        hedger, primary, secondary = RequestHedger(), _Stream(["a", "b"]), _Stream(["x"])
+        self.assertEqual(_run(_collect(hedger.stream(primary, secondary, 0.5))), ["a", "b"])
+        self.assertFalse(secondary.started)
+        self.assertEqual(hedger.get_stats()["hedges_fired"], 0)
+
+    def test_slow_primary_loses_to_secondary(self):
+        hedger, primary, secondary = RequestHedger(), _Stream(["a"], delay=1), _Stream(["x", "y"])
+        self.assertEqual(_run(_collect(hedger.stream(primary, secondary, 0.05))), ["x", "y"])
+        self.assertTrue(primary.closed)
+        self.assertEqual(hedger.get_stats(), {"requests": 1, "hedges_fired": 1, "hedges_won": 1})
+
+    def test_failed_secondary_falls_back_to_primary(self):
+        hedger = RequestHedger()
+        primary, secondary = _Stream(["a"], delay=0.1), _Stream([], error=RuntimeError("refused"))
+        self.assertEqual(_run(_collect(hedger.stream(primary, secondary, 0.05))), ["a"])
+        self.assertEqual(hedger.get_stats()["hedges_won"], 0)
+
+
+class _Breaker:
+    def __init__(self, allowed=True):
+        self.allowed = allowed
+        self.outcomes = []
+
+    def allow(self, key):
+        return self.allowed
+
+    def record(self, key, outcome, latency_ms):
+        self.outcomes.append((key, outcome))
+
+
+class _Telemetry:
+    def __init__(self):
+        self.records = []
+
+    def record(self, record):
+        self.records.append(record)
+
+
+class GeminiHedgeTest(unittest.TestCase):
+    """
+    The hedged secondary request is admitted and accounted for like the primary one,
+    and the Gemini API key never leaves the Gemini endpoint.
+    """
+
+    def setUp(self):
+        # The client is built without its singleton setup, which needs the credential store
+        self.client = GeminiClient.__new__(GeminiClient)
+        self.client.name = "gemini"
+        self.client._api_key = "secret"
+        self.client._log_manager = LogManager.get_instance()
+        self.client._config_manager = ConfigManager.get_instance()
+        self.client._rate_limiter = RateLimiter.get_instance()
+        self.client._router = ModelRouter(self.client)
+        self.client._request_stats = {"requests": 0, "cancelled": 0, "deadline_exceeded": 0}
+        self.client._active_records = {}
+        self.client._breaker = _Breaker()
+        self.client._telemetry = _Telemetry()
+        self.admitted = []
+        self.sent = []
+
+        async def acquire_rate_limit_async(model, prompt, priority=RequestPriority.INTERACTIVE):
+            self.admitted.append((model, priority))
+
+        async def stream_contents_async(model, body, base_url=None):
+            self.sent.append((model, base_url, self.client._rest_headers(base_url)))
+            yield "hedged"
+
+        self.client.acquire_rate_limit_async = acquire_rate_limit_async
+        self.client._stream_contents_async = stream_contents_async
+
+    def _hedge(self, base_url=None):
+        options = RequestOptions(
+            model="gemini-primary", priority=RequestPriority.BULK, cancellation=CancellationToken(timeout=5),
+        )
+        return _run(_collect(self.client._stream_hedge_async("prompt", "gemini-secondary", {}, options, base_url)))
+
+    def test_hedge_is_rate_limited_and_recorded(self):
+        self.assertEqual(self._hedge(), ["hedged"])
+        self.assertEqual(self.admitted, [("gemini-secondary", RequestPriority.BULK)])
+        self.assertEqual(self.client._breaker.outcomes, [("gemini:gemini-secondary", "ok")])
+        [record] = self.client._telemetry.records
+        self.assertEqual((record.model, record.outcome, record.output_chars), ("gemini-secondary", "ok", 6))
+
+    def test_open_circuit_refuses_hedge(self):
+        self.client._breaker.allowed = False
+        with self.assertRaises(CircuitOpenError):
+            self._hedge()
+        self.assertEqual(self.sent, [])
+        self.assertEqual(self.admitted, [])
+
+    def test_api_key_only_sent_to_gemini_endpoint(self):
+        self._hedge("http://127.0.0.1:8080")
+        self._hedge(DEFAULT_BASE_URL + "/")
+        self.assertEqual(self.sent[0][2], {})
+        self.assertEqual(self.sent[1][2], {"x-goog-api-key": "secret"})
+        self.assertEqual(self.client._rest_headers(), {"x-goog-api-key": "secret"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import threading
+import time
+import unittest
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.core.hotkey_job_pool import HotkeyJobPool
+
+
+class HotkeyJobPoolTest(unittest.TestCase):
+    """
+    Jobs of one window run in order, jobs of different windows run in parallel.
+    """
+
+    def setUp(self):
+        self.pool = HotkeyJobPool(max_workers=4, max_pending_jobs=4)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def _blocking_job(self, started: threading.Event):
+        def job():
+            started.set()
+            self.release.wait(5)
+        return job
+
+    def _wait_idle(self):
+        for _ in range(500):
+            if self.pool.get_stats()["pending"] == 0:
+                return
+            time.sleep(0.01)
+        self.fail("Jobs did not finish")
+
+    def test_jobs_of_one_key_run_in_submission_order(self):
+        started, order = threading.Event(), []
+        self.pool.submit("window", self._blocking_job(started))
+        self.assertTrue(started.wait(5))
+        for index in range(3):
+            self.pool.submit("window", lambda index=index: order.append(index))
+        self.assertEqual(self.pool.get_stats(), {"pending": 4, "active_keys": 1})
+        self.assertEqual(order, [])
+        self.release.set()
+        self._wait_idle()
+        self.assertEqual(order, [0, 1, 2])
+        self.assertEqual(self.pool.get_stats(), {"pending": 0, "active_keys": 0})
+
+    def test_jobs_of_different_keys_run_in_parallel(self):
+        first, second = threading.Event(), threading.Event()
+        self.pool.submit("window-a", self._blocking_job(first))
+        self.pool.submit("window-b", self._blocking_job(second))
+        self.assertTrue(first.wait(5))
+        self.assertTrue(second.wait(5))
+        self.assertEqual(self.pool.get_stats()["active_keys"], 2)
+
+    def test_jobs_beyond_the_pending_limit_are_dropped(self):
+        started = threading.Event()
+        self.assertTrue(self.pool.submit("window", self._blocking_job(started)))
+        for _ in range(3):
+            self.assertTrue(self.pool.submit("window", lambda: None))
+        self.assertFalse(self.pool.submit("other-window", lambda: None))
+        self.release.set()
+        self._wait_idle()
+        self.assertTrue(self.pool.submit("other-window", lambda: None))
+
+    def test_failing_job_does_not_stop_the_queue(self):
+        done = threading.Event()
+
+        def fail():
+            raise RuntimeError("paste failed")
+
+        self.pool.submit("window", fail)
+        self.pool.submit("window", done.set)
+        self.assertTrue(done.wait(5))
+        self._wait_idle()
+
+
+if __name__ == "__main__":
+    unittest.main()
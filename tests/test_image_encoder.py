@@ -0,0 +1,92 @@
+import base64
+import io
+import unittest
+from unittest import mock
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.utils import image_encoder
+from src.utils.dataclasses import ImageInputConfig
+from src.utils.image_encoder import Image, ImageEncoder
+
+
+class _Config:
+    def __init__(self, settings: ImageInputConfig):
+        self.settings = settings
+
+    def get_instance(self):
+        return self
+
+    def get_value(self, key):
+        return self.settings
+
+
+@unittest.skipIf(Image is None, "Pillow is not installed")
+class ImageEncoderTest(unittest.TestCase):
+    """
+    Images are downscaled, re-encoded off the calling thread and encoded once per source image.
+    """
+
+    def setUp(self):
+        self.settings = ImageInputConfig(max_dimension=256, format="WEBP", quality=80, cache_entries=2)
+        with mock.patch.object(image_encoder, "ConfigManager", _Config(self.settings)):
+            self.encoder = ImageEncoder()
+
+    def _encode(self, image):
+        return self.encoder.submit(image).result(5)
+
+    @staticmethod
+    def _decode(encoded):
+        return Image.open(io.BytesIO(base64.b64decode(encoded.data)))
+
+    def test_large_image_is_downscaled_keeping_the_aspect_ratio(self):
+        encoded = self._encode(Image.new("RGB", (1024, 512), "white"))
+        self.assertEqual((encoded.width, encoded.height), (256, 128))
+        self.assertEqual(encoded.mime_type, "image/webp")
+        decoded = self._decode(encoded)
+        self.assertEqual((decoded.format, decoded.size), ("WEBP", (256, 128)))
+
+    def test_small_image_is_not_upscaled(self):
+        encoded = self._encode(Image.new("RGB", (100, 50), "white"))
+        self.assertEqual((encoded.width, encoded.height), (100, 50))
+
+    def test_jpeg_drops_the_alpha_channel(self):
+        self.settings.format = "jpeg"
+        encoded = self._encode(Image.new("RGBA", (64, 64), (255, 0, 0, 128)))
+        self.assertEqual(encoded.mime_type, "image/jpeg")
+        self.assertEqual(self._decode(encoded).mode, "RGB")
+
+    def test_unsupported_format_falls_back_to_webp(self):
+        self.settings.format = "tiff"
+        self.assertEqual(self._encode(Image.new("RGB", (64, 64))).mime_type, "image/webp")
+
+    def test_same_image_is_encoded_once(self):
+        first = self._encode(Image.new("RGB", (64, 64), "red"))
+        second = self._encode(Image.new("RGB", (64, 64), "red"))
+        other = self._encode(Image.new("RGB", (64, 64), "blue"))
+        self.assertIs(second, first)
+        self.assertNotEqual(other.digest, first.digest)
+        stats = self.encoder.get_stats()
+        self.assertEqual((stats["encoded"], stats["cache_hits"], stats["cached"]), (2, 1, 2))
+
+    def test_changed_settings_encode_again(self):
+        image = Image.new("RGB", (512, 512), "red")
+        first = self._encode(image)
+        self.settings.max_dimension = 128
+        second = self._encode(image)
+        self.assertEqual((first.width, second.width), (256, 128))
+        self.assertEqual(second.digest, first.digest)
+
+    def test_least_recently_used_entries_are_dropped(self):
+        for color in ("red", "green", "blue"):
+            self._encode(Image.new("RGB", (32, 32), color))
+        self.assertEqual(self.encoder.get_stats()["cached"], 2)
+
+    def test_failed_encoding_resolves_to_none(self):
+        self.assertIsNone(self._encode(object()))
+
+
+if __name__ == "__main__":
+    unittest.main()
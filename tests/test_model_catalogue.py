@@ -0,0 +1,116 @@
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import sys
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.utils import model_catalogue
+from src.utils.model_catalogue import CATALOGUE_TTL_SECONDS, ModelCatalogue
+
+MODELS = [{"name": "model-a"}, {"name": "model-b"}]
+
+
+class _Client:
+    """
+    Provider whose model listing blocks until released.
+    """
+
+    def __init__(self, models=MODELS, error=None):
+        self.name = "provider"
+        self.models = models
+        self.error = error
+        self.release = threading.Event()
+        self.fetches = 0
+
+    def get_model_details(self):
+        self.fetches += 1
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        return self.models
+
+
+class ModelCatalogueTest(unittest.TestCase):
+    """
+    The stored catalogue is served at once, stale or not, and refreshed in the background.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.catalogue_file = Path(directory.name) / "model_catalogue.json"
+        self.refreshed = threading.Event()
+
+    def _open(self) -> ModelCatalogue:
+        with mock.patch.object(model_catalogue, "get_model_catalogue_file", return_value=self.catalogue_file):
+            catalogue = ModelCatalogue()
+        catalogue.add_listener(lambda provider, models: self.refreshed.set())
+        return catalogue
+
+    def _store(self, fetched_at: float):
+        self.catalogue_file.write_text(json.dumps(
+            {"provider": {"fetchedAt": fetched_at, "models": [{"name": "stored"}]}}
+        ))
+
+    def _wait_for_refresh(self, client: _Client):
+        client.release.set()
+        self.assertTrue(self.refreshed.wait(5))
+
+    def test_missing_catalogue_is_fetched_in_background(self):
+        catalogue, client = self._open(), _Client()
+        self.assertEqual(catalogue.get_models(client), [])
+        self._wait_for_refresh(client)
+        self.assertEqual(catalogue.get_model_names(client), ["model-a", "model-b"])
+        self.assertEqual(self._open().get_model_info("provider", "model-b"), {"name": "model-b"})
+        self.assertEqual(client.fetches, 1)
+
+    def test_concurrent_lookups_fetch_once(self):
+        catalogue, client = self._open(), _Client()
+        for _ in range(5):
+            catalogue.get_models(client)
+        self._wait_for_refresh(client)
+        self.assertEqual(client.fetches, 1)
+
+    def test_fresh_catalogue_is_not_refreshed(self):
+        self._store(time.time())
+        catalogue, client = self._open(), _Client()
+        self.assertEqual(catalogue.get_model_names(client), ["stored"])
+        self.assertEqual(client.fetches, 0)
+
+    def test_stale_catalogue_is_served_and_refreshed(self):
+        self._store(time.time() - CATALOGUE_TTL_SECONDS - 1)
+        catalogue, client = self._open(), _Client()
+        self.assertEqual(catalogue.get_model_names(client), ["stored"])
+        self._wait_for_refresh(client)
+        self.assertEqual(catalogue.get_model_names(client), ["model-a", "model-b"])
+
+    def test_failed_refresh_keeps_stored_models(self):
+        self._store(time.time() - CATALOGUE_TTL_SECONDS - 1)
+        catalogue, client = self._open(), _Client(error=RuntimeError("offline"))
+        catalogue.get_models(client)
+        client.release.set()
+        for _ in range(100):
+            if not catalogue._refreshing:
+                break
+            time.sleep(0.01)
+        self.assertFalse(self.refreshed.is_set())
+        self.assertEqual(catalogue.get_model_info("provider", "stored"), {"name": "stored"})
+
+    def test_removed_listener_is_not_called(self):
+        catalogue, client = self._open(), _Client()
+        calls = []
+        listener = lambda provider, models: calls.append(provider)
+        catalogue.add_listener(listener)
+        catalogue.remove_listener(listener)
+        catalogue.get_models(client)
+        self._wait_for_refresh(client)
+        self.assertEqual(calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.clients import model_router
+from src.clients.model_router import ModelRouter
+from src.clients.request_options import RequestOptions
+from src.utils.dataclasses import GenerationSettings, RoutingConfig, RoutingRule
+from src.utils.telemetry_store import RequestRecord
+
+
+class _Config:
+    def __init__(self, settings: RoutingConfig):
+        self.settings = settings
+
+    def get_instance(self):
+        return self
+
+    def get_value(self, key):
+        return self.settings
+
+
+class _Telemetry:
+    def __init__(self, records):
+        self.records = records
+
+    def get_instance(self):
+        return self
+
+    def iter_records(self, since=None):
+        return iter(self.records)
+
+
+def _options(prompt_id="proofread", latency_target_ms=None, model=None) -> RequestOptions:
+    return RequestOptions(prompt_id=prompt_id, model=model,
+                          generation=GenerationSettings(latency_target_ms=latency_target_ms))
+
+
+class ModelRouterTest(unittest.TestCase):
+    """
+    Rules pick the candidate models, learned latencies pick among them for prompts with a latency target.
+    """
+
+    def setUp(self):
+        self.settings = RoutingConfig(enabled=True, ewma_alpha=0.5, rules=[
+            RoutingRule(model="flash-lite", prompt_ids=["proofread"], max_input_tokens=100),
+            RoutingRule(model="pro", min_input_tokens=1000),
+        ])
+
+    def _router(self, records=()) -> ModelRouter:
+        with mock.patch.object(model_router, "ConfigManager", _Config(self.settings)), \
+                mock.patch.object(model_router, "TelemetryStore", _Telemetry(list(records))):
+            return ModelRouter(SimpleNamespace(name="gemini"))
+
+    @staticmethod
+    def _finished(model: str, duration_ms: float, outcome="ok") -> RequestRecord:
+        return RequestRecord("gemini", model, outcome=outcome, started=time.monotonic() - duration_ms / 1000)
+
+    def test_rules_match_prompt_id_and_input_size(self):
+        router = self._router()
+        self.assertEqual(router.route("short", _options(), "flash"), "flash-lite")
+        self.assertEqual(router.route("short", _options(prompt_id="translate"), "flash"), "flash")
+        self.assertEqual(router.route("x" * 4000, _options(), "flash"), "pro")
+        self.assertEqual(router.get_stats()["routed"], {"flash-lite": 1, "flash": 1, "pro": 1})
+
+    def test_explicit_model_and_disabled_routing_are_kept(self):
+        router = self._router()
+        self.assertEqual(router.route("short", _options(model="custom"), "flash"), "custom")
+        self.settings.enabled = False
+        self.assertEqual(router.route("short", _options(), "flash"), "flash")
+        self.assertEqual(router.get_stats()["routed"], {})
+
+    def test_latency_target_skips_slow_models(self):
+        router = self._router()
+        router.observe(self._finished("flash-lite", 3000))
+        router.observe(self._finished("flash", 500))
+        self.assertEqual(router.route("short", _options(latency_target_ms=1000), "flash"), "flash")
+        # Without a target the rules' order applies
+        self.assertEqual(router.route("short", _options(), "flash"), "flash-lite")
+
+    def test_fastest_model_is_used_when_none_meets_the_target(self):
+        router = self._router()
+        router.observe(self._finished("flash-lite", 3000))
+        router.observe(self._finished("flash", 2000))
+        self.assertEqual(router.route("short", _options(latency_target_ms=1000), "flash"), "flash")
+
+    def test_latency_is_a_moving_average_of_successful_requests(self):
+        router = self._router()
+        router.observe(self._finished("flash", 1000))
+        router.observe(self._finished("flash", 3000))
+        router.observe(self._finished("flash", 90000, outcome="error"))
+        self.assertAlmostEqual(router.get_stats()["latency_ms"]["flash"], 2000, delta=50)
+
+    def test_telemetry_of_the_own_provider_seeds_latencies(self):
+        router = self._router([
+            {"provider": "gemini", "model": "flash-lite", "outcome": "ok", "duration_ms": 4000},
+            {"provider": "openai", "model": "flash", "outcome": "ok", "duration_ms": 4000},
+            {"provider": "gemini", "model": "flash", "outcome": "error", "duration_ms": 4000},
+        ])
+        self.assertEqual(router.route("short", _options(latency_target_ms=1000), "flash"), "flash")
+        self.assertEqual(router.get_stats()["latency_ms"], {"flash-lite": 4000})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import unittest
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.clients.async_transport import AsyncHTTPTransport, EventLoopThread
+from src.clients.openai_api_client import OpenAIClient
+from src.clients.request_options import RequestOptions
+
+
+class _ChatCompletionsServer:
+    """
+    Answers every request with a chunked chat completion stream ending in [DONE].
+    """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.connections = 0
+        self.requests = 0
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self._server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        self._server.close()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = int(next(
+                    (line.split(b":")[1] for line in head.split(b"\r\n") if line.lower().startswith(b"content-length")),
+                    b"0",
+                ))
+                await reader.readexactly(length)
+                self.requests += 1
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                    b"Transfer-Encoding: chunked\r\nConnection: keep-alive\r\n\r\n"
+                )
+                events = [json.dumps({"choices": [{"delta": {"content": chunk}}]}) for chunk in self.chunks]
+                for data in events + ["[DONE]"]:
+                    event = f"data: {data}\n\n".encode()
+                    writer.write(b"%x\r\n%s\r\n" % (len(event), event))
+                writer.write(b"0\r\n\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class OpenAIStreamTest(unittest.TestCase):
+    """
+    Streamed chat completions are read to the end of the body, so their connection is pooled.
+    """
+
+    def setUp(self):
+        self.loop = EventLoopThread.get_instance()
+        self.server = _ChatCompletionsServer(["Hello", " world"])
+        base_url = self.loop.run(self.server.start(), timeout=5)
+        # The client is built without its singleton setup, which needs the credential store
+        self.client = OpenAIClient.__new__(OpenAIClient)
+        self.client._transport = AsyncHTTPTransport()
+        self.client._url = lambda path: f"{base_url}/{path}"
+        self.client._headers = lambda: {}
+        self.client._request_body = lambda prompt, model, options, stream: {"model": model, "stream": stream}
+
+    def tearDown(self):
+        self.client._transport.close_idle()
+        self.loop.run(self.server.stop(), timeout=5)
+
+    def _stream(self):
+        async def collect():
+            return [chunk async for chunk in self.client._stream_response_async(
+                "prompt", "model", RequestOptions(), None
+            )]
+        return self.loop.run(collect(), timeout=5)
+
+    def test_done_event_ends_the_text(self):
+        self.assertEqual(self._stream(), ["Hello", " world"])
+
+    def test_streams_reuse_the_pooled_connection(self):
+        for _ in range(3):
+            self.assertEqual("".join(self._stream()), "Hello world")
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(self.server.connections, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
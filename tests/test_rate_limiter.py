@@ -0,0 +1,177 @@
+import asyncio
+import unittest
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.clients.async_transport import EventLoopThread
+from src.clients.rate_limiter import (
+    BACKOFF_CAP_SECONDS, RateLimiter, TokenBucket, backoff_delay, estimate_tokens
+)
+from src.clients.request_options import RequestPriority
+
+
+def _run(coro):
+    return EventLoopThread.get_instance().run(coro, timeout=5)
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_bucket_starts_full_and_refills_per_minute(self):
+        bucket = TokenBucket(60)
+        now = bucket._updated
+        self.assertEqual(bucket.time_until(60, now), 0.0)
+        bucket.consume(60)
+        self.assertAlmostEqual(bucket.time_until(1, now), 1.0)
+        self.assertAlmostEqual(bucket.time_until(1, now + 0.5), 0.5)
+        self.assertEqual(bucket.time_until(1, now + 1), 0.0)
+
+    def test_request_larger_than_capacity_waits_for_a_full_bucket(self):
+        bucket = TokenBucket(60)
+        now = bucket._updated
+        self.assertEqual(bucket.time_until(1000, now), 0.0)
+        bucket.consume(1000)
+        self.assertAlmostEqual(bucket.time_until(1000, now), 60.0)
+
+    def test_backoff_is_capped_and_honours_retry_after(self):
+        for retry_count in range(10):
+            self.assertLessEqual(backoff_delay(retry_count), BACKOFF_CAP_SECONDS)
+        self.assertGreaterEqual(backoff_delay(0, retry_after=5), 5)
+        self.assertEqual(estimate_tokens(""), 1)
+        self.assertEqual(estimate_tokens("x" * 400), 100)
+
+
+class RateLimiterTest(unittest.TestCase):
+    """
+    Requests are admitted through their model's buckets in priority order.
+    """
+
+    def setUp(self):
+        self.limiter = RateLimiter()
+
+    def test_unlimited_model_is_admitted_at_once(self):
+        async def scenario():
+            for _ in range(100):
+                await self.limiter.acquire_async("p:unlimited", None, None)
+
+        _run(scenario())
+        self.assertEqual(self.limiter.get_stats(), {})
+
+    def test_interactive_requests_overtake_queued_bulk_requests(self):
+        admitted = []
+
+        async def acquire(name, priority):
+            await self.limiter.acquire_async("p:m", 600, None, priority=priority)
+            admitted.append(name)
+
+        async def scenario():
+            # Drain the bucket, refilling one request every 100 ms
+            for _ in range(600):
+                await self.limiter.acquire_async("p:m", 600, None)
+            bulk = [asyncio.ensure_future(acquire(f"bulk{index}", RequestPriority.BULK)) for index in range(2)]
+            await asyncio.sleep(0.01)
+            interactive = asyncio.ensure_future(acquire("interactive", RequestPriority.INTERACTIVE))
+            await asyncio.gather(*bulk, interactive)
+
+        _run(scenario())
+        self.assertEqual(admitted, ["interactive", "bulk0", "bulk1"])
+        self.assertEqual(self.limiter.get_stats()["p:m"]["granted"], 603)
+
+    def test_token_limit_holds_back_large_prompts(self):
+        async def scenario():
+            await self.limiter.acquire_async("p:m", None, 6000, tokens=6000)
+            waiting = asyncio.ensure_future(self.limiter.acquire_async("p:m", None, 6000, tokens=50))
+            await asyncio.sleep(0.2)
+            self.assertFalse(waiting.done())
+            await asyncio.wait_for(waiting, 1)
+
+        _run(scenario())
+
+    def test_cancelled_request_leaves_the_queue(self):
+        async def scenario():
+            for _ in range(60):
+                await self.limiter.acquire_async("p:m", 60, None)
+            waiting = asyncio.ensure_future(self.limiter.acquire_async("p:m", 60, None))
+            await asyncio.sleep(0.01)
+            self.assertEqual(self.limiter.get_stats()["p:m"]["queue_depth"], 1)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+            return self.limiter.get_stats()["p:m"]["queue_depth"]
+
+        self.assertEqual(_run(scenario()), 0)
+
+    def test_throttled_model_is_paused_even_without_limits(self):
+        delay = self.limiter.report_throttled("p:m", 0, retry_after=0.2)
+        self.assertGreaterEqual(delay, 0.2)
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            await self.limiter.acquire_async("p:m", None, None)
+            return loop.time() - started
+
+        self.assertGreaterEqual(_run(scenario()), delay - 0.05)
+        self.assertEqual(self.limiter.get_stats()["p:m"]["throttled"], 1)
+
+
+class LaneTest(unittest.TestCase):
+    """
+    Each lane caps its requests in flight and may only use its share of the buckets.
+    """
+
+    def setUp(self):
+        self.limiter = RateLimiter()
+
+    def test_lane_cap_queues_requests_until_a_slot_is_left(self):
+        async def scenario():
+            for _ in range(2):
+                await self.limiter.enter_lane_async(RequestPriority.BULK, 2)
+            waiting = asyncio.ensure_future(self.limiter.enter_lane_async(RequestPriority.BULK, 2))
+            await asyncio.sleep(0.01)
+            self.assertFalse(waiting.done())
+            self.assertEqual(self.limiter.get_lane_stats()["background"]["queued"], 1)
+            # Other lanes are not held up by a full one
+            await asyncio.wait_for(self.limiter.enter_lane_async(RequestPriority.INTERACTIVE, 1), 1)
+            self.limiter.leave_lane(RequestPriority.BULK)
+            await asyncio.wait_for(waiting, 1)
+
+        _run(scenario())
+        stats = self.limiter.get_lane_stats()
+        self.assertEqual(stats["background"]["in_flight"], 2)
+        self.assertEqual(stats["background"]["admitted"], 3)
+        self.assertEqual(stats["hotkey"]["in_flight"], 1)
+
+    def test_cancelled_lane_waiter_does_not_keep_a_slot(self):
+        async def scenario():
+            await self.limiter.enter_lane_async(RequestPriority.NORMAL, 1)
+            waiting = asyncio.ensure_future(self.limiter.enter_lane_async(RequestPriority.NORMAL, 1))
+            await asyncio.sleep(0.01)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+            self.limiter.leave_lane(RequestPriority.NORMAL)
+            await asyncio.wait_for(self.limiter.enter_lane_async(RequestPriority.NORMAL, 1), 1)
+
+        _run(scenario())
+        self.assertEqual(self.limiter.get_lane_stats()["chat"]["in_flight"], 1)
+        self.assertEqual(self.limiter.get_lane_stats()["chat"]["queued"], 0)
+
+    def test_lane_share_leaves_the_rest_of_the_bucket_to_higher_lanes(self):
+        async def scenario():
+            for _ in range(30):
+                await self.limiter.acquire_async("p:m", 60, None)
+            bulk = asyncio.ensure_future(
+                self.limiter.acquire_async("p:m", 60, None, priority=RequestPriority.BULK, share=0.5)
+            )
+            await asyncio.sleep(0.05)
+            self.assertFalse(bulk.done())
+            await asyncio.wait_for(self.limiter.acquire_async("p:m", 60, None), 1)
+            bulk.cancel()
+            await asyncio.gather(bulk, return_exceptions=True)
+
+        _run(scenario())
+        self.assertEqual(self.limiter.get_stats()["p:m"]["granted"], 31)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import sys
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.utils import response_cache
+from src.utils.dataclasses import ResponseCacheConfig
+from src.utils.response_cache import ResponseCache
+
+
+class _Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+class ResponseCacheTest(unittest.TestCase):
+    """
+    Disk entries expire a fixed time after they were stored, whether they are read or swept.
+    """
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.clock = _Clock(1_000_000.0)
+        patcher = mock.patch.object(response_cache, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._directory.cleanup)
+        self.cache = self._open(ResponseCacheConfig(max_memory_entries=0, ttl_seconds=100))
+
+    def _open(self, settings: ResponseCacheConfig) -> ResponseCache:
+        with mock.patch.object(response_cache, "get_response_cache_path", return_value=Path(self._directory.name)), \
+                mock.patch.object(ResponseCache, "_load_disk_index"):
+            cache = ResponseCache()
+        cache._settings = settings
+        cache._load_disk_index()
+        return cache
+
+    def _put(self, cache: ResponseCache, prompt: str) -> str:
+        key = cache.make_key("model", prompt)
+        cache.put(key, "model", f"answer to {prompt}")
+        return key
+
+    def test_reads_do_not_extend_lifetime(self):
+        key = self._put(self.cache, "a")
+        for _ in range(3):
+            self.clock.now += 40
+            self.cache.get(key)
+        self.assertIsNone(self.cache.get(key))
+        self.assertFalse((Path(self._directory.name) / f"{key}.json").exists())
+
+    def test_sweep_expires_recently_read_entries(self):
+        key = self._put(self.cache, "a")
+        self.clock.now += 90
+        self.assertEqual(self.cache.get(key), "answer to a")
+        self.clock.now += 20
+        self._put(self.cache, "b")
+        self.assertEqual(self.cache.get_stats()["disk_entries"], 1)
+        self.assertFalse((Path(self._directory.name) / f"{key}.json").exists())
+
+    def test_reloaded_index_keeps_creation_time(self):
+        key = self._put(self.cache, "a")
+        self.clock.now += 90
+        self.cache.get(key)
+        reopened = self._open(self.cache._settings)
+        self.assertEqual(reopened.get(key), "answer to a")
+        self.clock.now += 20
+        self.assertIsNone(reopened.get(key))
+
+    def test_least_recently_read_entry_is_evicted_first(self):
+        self.cache._settings.max_disk_entries = 2
+        first = self._put(self.cache, "a")
+        self.clock.now += 1
+        second = self._put(self.cache, "b")
+        self.clock.now += 1
+        self.cache.get(first)
+        self.clock.now += 1
+        self._put(self.cache, "c")
+        self.assertEqual(self.cache.get(first), "answer to a")
+        self.assertIsNone(self.cache.get(second))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.utils.dataclasses import SemanticCacheConfig
+from src.utils.semantic_cache import HashingEmbedder, SemanticCache, np
+
+TEMPLATE = "You are a careful assistant. Rewrite the following text in a polite business tone:\n\n{text}"
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class SemanticCacheTest(unittest.TestCase):
+    """
+    Only the user's text is compared, so a changed or negated input never gets the cached
+    answer of another input just because both were rendered into the same long template.
+    """
+
+    def setUp(self):
+        self.cache = SemanticCache()
+        self.cache._settings = SemanticCacheConfig(enabled=True)
+        self.cache.enabled = True
+        self.cache.set_embedder(HashingEmbedder(self.cache._settings.dimensions))
+        self.scope = SemanticCache.make_scope(TEMPLATE, "context")
+
+    def test_near_duplicate_input_hits(self):
+        self.cache.put("model", "Please send the invoice.", "cached", self.scope)
+        self.assertEqual(self.cache.get("model", "please send the invoice", self.scope), "cached")
+
+    def test_negated_input_misses(self):
+        self.cache.put("model", "Please send the invoice.", "cached", self.scope)
+        self.assertIsNone(self.cache.get("model", "Please do not send the invoice.", self.scope))
+
+    def test_changed_input_misses(self):
+        self.cache.put("model", "Monday at 3pm", "cached", self.scope)
+        self.assertIsNone(self.cache.get("model", "Tuesday at 4pm", self.scope))
+        self.cache.put("model", "Meet on Monday at 3pm", "cached", self.scope)
+        self.assertIsNone(self.cache.get("model", "Meet on Monday at 4pm", self.scope))
+
+    def test_single_word_change_in_long_input_misses(self):
+        text = "Summarize the quarterly report and highlight the revenue growth in Europe"
+        self.cache.put("model", text, "cached", self.scope)
+        self.assertIsNone(self.cache.get("model", text.replace("Europe", "Asia"), self.scope))
+
+    def test_other_template_or_model_misses(self):
+        self.cache.put("model", "Please send the invoice.", "cached", self.scope)
+        other_scope = SemanticCache.make_scope("Translate to French:\n\n{text}", "context")
+        self.assertIsNone(self.cache.get("model", "Please send the invoice.", other_scope))
+        self.assertIsNone(self.cache.get("other-model", "Please send the invoice.", self.scope))
+
+    def test_empty_input_is_not_cached(self):
+        self.cache.put("model", "", "cached", self.scope)
+        self.assertIsNone(self.cache.get("model", "", self.scope))
+        self.assertEqual(self.cache.get_stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
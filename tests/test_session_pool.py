@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.clients import chat_context, session_pool
+from src.clients.async_transport import EventLoopThread
+from src.clients.chat_context import SUMMARY_PREFIX
+from src.clients.session_pool import ChatSessionPool
+from src.utils.dataclasses import ChatContextConfig, SessionPoolConfig
+
+
+def _content(role: str, text: str):
+    return SimpleNamespace(role=role, parts=[SimpleNamespace(text=text)])
+
+
+class _Config:
+    def __init__(self):
+        self.values = {
+            "chat_context": ChatContextConfig(max_context_tokens=60, summarize=True),
+            "session_pool": SessionPoolConfig(max_sessions=2),
+        }
+
+    def get_instance(self):
+        return self
+
+    def get_value(self, key):
+        return self.values[key]
+
+
+class _SummaryClient:
+    """
+    Answers summary requests once released, so the session can change meanwhile.
+    """
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.futures = []
+
+    def submit_async(self, coro):
+        self.futures.append(EventLoopThread.get_instance().submit(coro))
+
+    async def send_request_non_stream_async(self, prompt, options=None):
+        await asyncio.get_running_loop().run_in_executor(None, self.release.wait, 5)
+        return "the user asked about invoices"
+
+    def wait(self):
+        self.release.set()
+        for future in self.futures:
+            future.result(5)
+
+
+class ChatSessionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        config = _Config()
+        for module in (chat_context, session_pool):
+            patcher = mock.patch.object(module, "ConfigManager", config)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = _SummaryClient()
+        self.pool = ChatSessionPool(self.client, lambda model, history: SimpleNamespace(history=history), _content)
+
+    def _add_turns(self, session, count: int):
+        for index in range(count):
+            session.history.extend([_content("user", f"question {index} " * 8), _content("model", "answer " * 8)])
+
+    def test_sessions_are_separate_and_reused(self):
+        first = self.pool.get("prompt:a", "model")
+        self.assertIs(self.pool.get("prompt:a", "model"), first)
+        self.assertIsNot(self.pool.get("prompt:b", "model"), first)
+        self.assertEqual(self.pool.get_stats(), {"sessions": 2, "created": 2, "reused": 1, "evicted": 0})
+
+    def test_least_recently_used_session_is_evicted(self):
+        self.pool.get("prompt:a", "model")
+        self.pool.get("prompt:b", "model")
+        self.pool.get("prompt:a", "model")
+        self.pool.get("prompt:c", "model")
+        self.assertIsNone(self.pool.peek("prompt:b"))
+        self.assertIsNotNone(self.pool.peek("prompt:a"))
+
+    def test_model_switch_keeps_the_history_list(self):
+        session = self.pool.get("prompt:a", "model-a")
+        history = session.history
+        self._add_turns(session, 1)
+        switched = self.pool.get("prompt:a", "model-b")
+        self.assertIs(switched.history, history)
+        self.assertIs(switched.chat.history, history)
+        self.assertEqual(switched.model, "model-b")
+
+    def test_summary_survives_model_switch(self):
+        session = self.pool.get("prompt:a", "model-a")
+        self._add_turns(session, 4)
+        session.context.fit(session.history)
+        # The model changes while the summary of the dropped turns is being generated
+        self.pool.get("prompt:a", "model-b")
+        self.client.wait()
+        self.assertTrue(session.history[0].parts[0].text.startswith(SUMMARY_PREFIX))
+
+        # Trimming after another switch keeps the summary as the first turn instead of dropping it
+        self.pool.get("prompt:a", "model-a")
+        self._add_turns(session, 2)
+        session.context.fit(session.history)
+        self.assertTrue(session.history[0].parts[0].text.startswith(SUMMARY_PREFIX))
+        self.client.wait()
+        self.assertTrue(session.history[0].parts[0].text.startswith(SUMMARY_PREFIX))
+        self.assertFalse(session.history[2].parts[0].text.startswith(SUMMARY_PREFIX))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import asyncio
+import unittest
+
+import sys
+from pathlib import Path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.clients.async_transport import EventLoopThread
+from src.clients.cancellation import (
+    CANCELLED, DEADLINE_EXCEEDED, CancellationToken, DeadlineExceededError, RequestCancelledError, cancel_scope
+)
+from src.clients.single_flight import SingleFlight
+
+
+class SingleFlightCancellationTest(unittest.TestCase):
+    """
+    The upstream request of a flight must end the way its last subscriber left it, since the
+    request telemetry and the circuit breaker tell deadlines and cancellations apart.
+    """
+
+    def setUp(self):
+        self.single_flight = SingleFlight()
+        self.upstream_tokens = []
+        self.upstream_errors = []
+
+    def _upstream(self, token: CancellationToken):
+        self.upstream_tokens.append(token)
+
+        async def items():
+            try:
+                async with cancel_scope(token):
+                    yield "first"
+                    await asyncio.sleep(10)
+                    yield "never"
+            except RequestCancelledError as e:
+                self.upstream_errors.append(e)
+                raise
+
+        return items()
+
+    async def _subscribe(self, token: CancellationToken):
+        received = []
+        try:
+            async for item in self.single_flight.stream("key", self._upstream, token):
+                received.append(item)
+        except RequestCancelledError as e:
+            return received, e
+        return received, None
+
+    def _run(self, coro):
+        return EventLoopThread.get_instance().run(coro, timeout=5)
+
+    async def _settle(self):
+        # Let the cancelled upstream task finish
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+
+    def test_deadline_of_only_subscriber_reaches_upstream(self):
+        async def scenario():
+            result = await self._subscribe(CancellationToken(timeout=0.05))
+            await self._settle()
+            return result
+
+        received, error = self._run(scenario())
+        self.assertEqual(received, ["first"])
+        self.assertIsInstance(error, DeadlineExceededError)
+        self.assertEqual(self.upstream_tokens[0].reason, DEADLINE_EXCEEDED)
+        self.assertIsInstance(self.upstream_errors[0], DeadlineExceededError)
+
+    def test_deadline_of_last_subscriber_reaches_upstream(self):
+        async def scenario():
+            first = CancellationToken()
+            originator = asyncio.ensure_future(self._subscribe(first))
+            await asyncio.sleep(0.01)
+            joined = asyncio.ensure_future(self._subscribe(CancellationToken(timeout=0.05)))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            results = await asyncio.gather(originator, joined)
+            await self._settle()
+            return results
+
+        (_, originator_error), (joined_received, joined_error) = self._run(scenario())
+        self.assertEqual(len(self.upstream_tokens), 1)
+        self.assertNotIsInstance(originator_error, DeadlineExceededError)
+        self.assertIsInstance(joined_error, DeadlineExceededError)
+        self.assertEqual(joined_received, ["first"])
+        self.assertEqual(self.upstream_tokens[0].reason, DEADLINE_EXCEEDED)
+        self.assertIsInstance(self.upstream_errors[0], DeadlineExceededError)
+
+    def test_cancellation_reaches_upstream_as_cancellation(self):
+        async def scenario():
+            token = CancellationToken()
+            subscriber = asyncio.ensure_future(self._subscribe(token))
+            await asyncio.sleep(0.01)
+            token.cancel()
+            result = await subscriber
+            await self._settle()
+            return result
+
+        _, error = self._run(scenario())
+        self.assertNotIsInstance(error, DeadlineExceededError)
+        self.assertEqual(self.upstream_tokens[0].reason, CANCELLED)
+        self.assertNotIsInstance(self.upstream_errors[0], DeadlineExceededError)
+
+
+if __name__ == "__main__":
+    unittest.main()
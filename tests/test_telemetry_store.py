@@ -0,0 +1,123 @@
+import json
+import tempfile
+import time
+import unittest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+import sys
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+from src.utils import telemetry_store
+from src.utils.dataclasses import TelemetryConfig
+from src.utils.telemetry_store import RequestRecord, TelemetryStore, percentile
+
+
+class _Config:
+    def __init__(self, settings: TelemetryConfig):
+        self.settings = settings
+
+    def get_instance(self):
+        return self
+
+    def get_value(self, key):
+        return self.settings
+
+
+class PercentileTest(unittest.TestCase):
+
+    def test_nearest_rank(self):
+        values = [5, 1, 4, 2, 3]
+        self.assertEqual(percentile(values, 50), 3)
+        self.assertEqual(percentile(values, 99), 5)
+        self.assertEqual(percentile(values, 0), 1)
+        self.assertIsNone(percentile([], 50))
+
+
+class RequestRecordTest(unittest.TestCase):
+
+    def test_streamed_speed_is_measured_after_the_first_chunk(self):
+        record = RequestRecord("gemini", "model", started=time.monotonic() - 2)
+        record.add_output("x" * 400)
+        record.first_chunk -= 1
+        record.add_output("x" * 400)
+        entry = record.to_entry()
+        self.assertEqual(entry["out"], 800)
+        self.assertAlmostEqual(entry["ttfc"], 1000, delta=50)
+        self.assertAlmostEqual(entry["tps"], 200, delta=10)
+        self.assertNotIn("p", entry)
+
+    def test_cached_response_has_no_speed(self):
+        record = RequestRecord("gemini", "model", outcome="cached")
+        record.add_output("answer")
+        self.assertNotIn("tps", record.to_entry())
+
+
+class TelemetryStoreTest(unittest.TestCase):
+    """
+    Records are appended to daily files, queried as percentiles and pruned after the retention period.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        # Disabled while constructing so no writer thread is started, the tests flush themselves
+        settings = TelemetryConfig(enabled=False, retention_days=7)
+        with mock.patch.object(telemetry_store, "ConfigManager", _Config(settings)), \
+                mock.patch.object(telemetry_store, "get_telemetry_path", return_value=self.directory):
+            self.store = TelemetryStore()
+        settings.enabled = True
+
+    def _record(self, prompt_id: str, output_chars: int, outcome: str = "ok"):
+        record = RequestRecord("gemini", "model", prompt_id=prompt_id, outcome=outcome,
+                               started=time.monotonic() - output_chars / 1000)
+        record.add_output("x" * output_chars)
+        self.store.record(record)
+
+    def test_disabled_store_records_nothing(self):
+        self.store._settings.enabled = False
+        self._record("a", 100)
+        self.assertEqual(list(self.store.iter_records()), [])
+
+    def test_records_are_written_to_the_file_of_the_day(self):
+        self._record("a", 100)
+        self.store.flush()
+        lines = (self.directory / f"{date.today().isoformat()}.jsonl").read_text().splitlines()
+        self.assertEqual(json.loads(lines[0])["p"], "a")
+        records = list(self.store.iter_records())
+        self.assertEqual(records[0]["prompt_id"], "a")
+        self.assertEqual(records[0]["output_chars"], 100)
+
+    def test_percentiles_per_group_skip_failed_requests(self):
+        for output_chars in (100, 200, 300):
+            self._record("a", output_chars)
+        self._record("a", 5000, outcome="error")
+        self._record("b", 100)
+        result = self.store.query_percentiles(percentiles=(50,))
+        self.assertEqual(result["a"]["count"], 4)
+        self.assertEqual(result["a"]["outcomes"], {"ok": 3, "error": 1})
+        self.assertAlmostEqual(result["a"]["duration_ms"]["p50"], 200, delta=50)
+        self.assertEqual(result["b"]["count"], 1)
+
+    def test_since_filters_old_records(self):
+        self._record("a", 100)
+        self.assertEqual(len(list(self.store.iter_records(datetime.now() + timedelta(minutes=1)))), 0)
+        self.assertEqual(len(list(self.store.iter_records(datetime.now() - timedelta(minutes=1)))), 1)
+
+    def test_files_past_retention_are_pruned(self):
+        old = self.directory / f"{(date.today() - timedelta(days=8)).isoformat()}.jsonl"
+        kept = self.directory / f"{(date.today() - timedelta(days=7)).isoformat()}.jsonl"
+        for day_file in (old, kept):
+            day_file.write_text('{"t":0}\n')
+        (self.directory / "notes.jsonl").write_text("not a record\n")
+        self._record("a", 100)
+        self.store.flush()
+        self.assertFalse(old.exists())
+        self.assertTrue(kept.exists())
+        self.assertEqual(len(list(self.store.iter_records())), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()